@@ -0,0 +1,177 @@
+"""修仙名称生成器性能基准
+
+测量每个生成方法在单个调用和大批量调用下的吞吐量与单次调用延迟、各类选项分支、
+生成器的构造时间以及峰值内存，结果以JSON输出，可与保存的基准结果比较以发现性能回退。
+
+    python benchmarks/bench_generators.py -o results.json
+    python benchmarks/bench_generators.py --baseline baseline.json --threshold 0.2
+"""
+import os
+import sys
+import json
+import time
+import timeit
+import platform
+import argparse
+import tempfile
+import tracemalloc
+from typing import Dict, List, Optional, Union, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xiuxian_names_generator import GENERATOR_KINDS, XiuXianNameGenerator, compile_bundle
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def option_cases(generator: XiuXianNameGenerator) -> List[Tuple[str, Union[Dict, str, None]]]:
+    """列出需要测量的 (类型, 选项) 组合，选项取值来自已加载的数据"""
+    cases = [(kind, None) for kind in GENERATOR_KINDS]
+    cases += [
+        ("name", {"familyName": generator.data["family"][0]}),
+        ("name", {"isFemale": True, "style": "double"}),
+        ("dao", {"isFemale": False, "title": generator.dao_titles[0]}),
+        ("skill", {"length": 4}),
+        ("book", {"postfix": generator.book_postfixes[0]}),
+        ("creature", {"category": "bird", "rarity": "epic"}),
+        ("material", {"rarity": "legendary"}),
+        ("material", {"kind": generator.material_kind[0]}),
+        ("material", {"postfix": generator.material_postfixes[0]}),
+        ("talisman", {"rarity": "mythic"}),
+        ("talisman", {"kind": generator.talisman_kind[0]}),
+        ("talisman", {"postfix": generator.talisman_postfixes[0]}),
+        ("clan", generator.data["clan"][0]),
+        ("zone", {"category": "water"}),
+    ]
+    return cases
+
+
+def case_name(kind: str, options: Union[Dict, str, None], number: int) -> str:
+    """基准项名称，例如 get_material(rarity=legendary) n=1000"""
+    if isinstance(options, dict):
+        arguments = ",".join(f"{key}={value}" for key, value in sorted(options.items()))
+    else:
+        arguments = options or ""
+    return f"get_{kind}({arguments}) n={number}"
+
+
+def measure(function, min_time: float, repeat: int) -> float:
+    """返回多轮测量中单次调用的最短耗时（秒）"""
+    timer = timeit.Timer(function)
+    loops, _ = timer.autorange()
+    loops = max(1, int(loops * min_time / 0.2))
+    return min(timer.repeat(repeat=repeat, number=loops)) / loops
+
+
+def bench_generators(generator: XiuXianNameGenerator, sizes: List[int],
+                     min_time: float, repeat: int) -> Dict[str, Dict]:
+    """测量每个 (类型, 选项) 组合在各批量大小下的耗时"""
+    results = {}
+    for kind, options in option_cases(generator):
+        for number in sizes:
+            seconds = measure(lambda: generator.generate(kind, number, options), min_time, repeat)
+            results[case_name(kind, options, number)] = {
+                "seconds_per_call": seconds,
+                "names_per_second": number / seconds,
+            }
+    return results
+
+
+def bench_construction(data_dir: str, bundle: str, repeat: int) -> Dict[str, Dict]:
+    """测量各种加载方式的构造时间与构造过程的峰值内存"""
+    results = {}
+    variants = {
+        "construct": lambda: XiuXianNameGenerator(data_dir),
+        "construct lazy": lambda: XiuXianNameGenerator(data_dir, lazy=True),
+        "construct bundle": lambda: XiuXianNameGenerator(bundle=bundle),
+    }
+    for name, construct in variants.items():
+        seconds = min(timeit.repeat(construct, repeat=repeat, number=1))
+        tracemalloc.start()
+        construct()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {"seconds_per_call": seconds, "peak_bytes": peak}
+    return results
+
+
+def bench_memory(generator: XiuXianNameGenerator, number: int) -> Dict[str, Dict]:
+    """测量一次生成大量结果时的峰值内存"""
+    results = {}
+    for kind in ("name", "talisman"):
+        tracemalloc.start()
+        items = generator.generate(kind, number)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del items
+        results[f"memory get_{kind} n={number}"] = {"peak_bytes": peak}
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """与基准结果比较，返回耗时或峰值内存超出阈值的基准项说明"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ("seconds_per_call", "peak_bytes"):
+            if metric in current and previous.get(metric):
+                ratio = current[metric] / previous[metric]
+                if ratio > 1 + threshold:
+                    regressions.append(f"{name}: {metric} {previous[metric]:.6g} -> {current[metric]:.6g} "
+                                       f"(+{(ratio - 1) * 100:.1f}%)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口，存在性能回退时返回1"""
+    parser = argparse.ArgumentParser(description="修仙名称生成器性能基准")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="数据文件目录路径")
+    parser.add_argument("--sizes", default="1,1000", help="逗号分隔的批量大小")
+    parser.add_argument("--min-time", type=float, default=0.2, help="每轮测量的最短时间（秒）")
+    parser.add_argument("--repeat", type=int, default=3, help="测量轮数，取最短耗时")
+    parser.add_argument("--memory-size", type=int, default=100000, help="测量峰值内存时生成的数量")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("-o", "--output", help="结果JSON文件路径，默认输出到标准输出")
+    parser.add_argument("--baseline", help="用于比较的基准结果JSON文件")
+    parser.add_argument("--threshold", type=float, default=0.2, help="允许的相对回退比例")
+    args = parser.parse_args(argv)
+
+    generator = XiuXianNameGenerator(args.data_dir, seed=args.seed)
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    with tempfile.TemporaryDirectory() as directory:
+        bundle = os.path.join(directory, "data.bundle")
+        compile_bundle(args.data_dir, bundle)
+        results = bench_construction(args.data_dir, bundle, args.repeat)
+    results.update(bench_generators(generator, sizes, args.min_time, args.repeat))
+    results.update(bench_memory(generator, args.memory_size))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"性能回退: {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"与基准相比没有超过 {args.threshold * 100:.0f}% 的回退", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""修仙名称生成器分布校验
+
+从各生成方法抽取大量样本，用卡方检验比较经验频率与生成逻辑给出的理论分布:
+
+- RARITY_VALUES 与 _get_rarity(max_value) 决定的稀有度分布
+- get_book、get_material、get_talisman 中两次掷骰决定的后缀分布
+- get_name 中三种命名风格各占三分之一的分布
+- get_creature 的种类均匀分布
+
+指定 --bulk 时对 generate_bulk 的结果做同样的检验，并用双样本卡方检验比较
+generate_bulk 与逐个生成在稀有度、名称长度、后缀和种类上的分布。
+
+    python benchmarks/verify_distribution.py -n 200000 --bulk
+"""
+import os
+import sys
+import math
+import argparse
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xiuxian_names_generator import (
+    CREATURE_CATEGORY, GENERATOR_KINDS, RARITY_VALUES, XiuXianNameGenerator,
+)
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# 期望频数低于此值的类别合并后再检验
+MIN_EXPECTED = 5.0
+
+
+def _gamma_series(a: float, x: float) -> float:
+    """正则化下不完全伽马函数 P(a, x) 的级数展开，适用于 x < a + 1"""
+    term = total = 1.0 / a
+    n = a
+    for _ in range(1000):
+        n += 1
+        term *= x / n
+        total += term
+        if abs(term) < abs(total) * 1e-15:
+            break
+    return total * math.exp(-x + a * math.log(x) - math.lgamma(a))
+
+
+def _gamma_continued_fraction(a: float, x: float) -> float:
+    """正则化上不完全伽马函数 Q(a, x) 的连分式展开，适用于 x >= a + 1"""
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return h * math.exp(-x + a * math.log(x) - math.lgamma(a))
+
+
+def chi_square_p_value(statistic: float, dof: int) -> float:
+    """卡方分布的上尾概率"""
+    if dof <= 0:
+        return 1.0
+    a, x = dof / 2, statistic / 2
+    if x <= 0:
+        return 1.0
+    if x < a + 1:
+        return 1 - _gamma_series(a, x)
+    return _gamma_continued_fraction(a, x)
+
+
+def rarity_distribution(max_value: float = 1.0) -> Dict[str, float]:
+    """_get_rarity(max_value) 的理论稀有度分布
+
+    随机值在 [0, max_value) 上均匀分布，落在 [更稀有一级的阈值, 本级阈值) 时得到本级稀有度。
+    """
+    probabilities = {}
+    lower = 0.0
+    for rarity, upper in sorted(RARITY_VALUES.items(), key=lambda item: item[1]):
+        probability = max(0.0, min(upper, max_value) - lower) / max_value
+        if probability > 0:
+            probabilities[rarity] = probability
+        lower = upper
+    return probabilities
+
+
+def postfix_distribution(high: str, low: str) -> Dict[str, float]:
+    """两次掷骰的后缀分布: 两次都低于rare阈值时取high，都低于uncommon阈值时取low"""
+    both_rare = RARITY_VALUES["rare"] ** 2
+    both_uncommon = RARITY_VALUES["uncommon"] ** 2
+    return {high: both_rare, low: both_uncommon - both_rare, "none": 1 - both_uncommon}
+
+
+def goodness_of_fit(observed: Dict[str, int], expected: Dict[str, float]) -> Tuple[float, int, float, str]:
+    """卡方拟合优度检验
+
+    Returns:
+        (卡方统计量, 自由度, p值, 相对偏差最大的类别说明)
+    """
+    total = sum(observed.values())
+    unexpected = [key for key in observed if expected.get(key, 0) == 0]
+    if unexpected:
+        return math.inf, 0, 0.0, f"出现了不应出现的类别 {unexpected[:3]}"
+    bins: List[Tuple[List[str], float, int]] = []
+    pooled_keys, pooled_expected, pooled_observed = [], 0.0, 0
+    for key, probability in sorted(expected.items(), key=lambda item: -item[1]):
+        count = total * probability
+        if count < MIN_EXPECTED:
+            pooled_keys.append(key)
+            pooled_expected += count
+            pooled_observed += observed.get(key, 0)
+        else:
+            bins.append(([key], count, observed.get(key, 0)))
+    if pooled_keys:
+        bins.append((pooled_keys, pooled_expected, pooled_observed))
+    statistic = sum((seen - count) ** 2 / count for _, count, seen in bins if count > 0)
+    dof = len(bins) - 1
+    keys, count, seen = max(bins, key=lambda b: abs(b[2] - b[1]) / math.sqrt(b[1]) if b[1] > 0 else 0)
+    detail = f"{'+'.join(keys)}: 观测 {seen / total:.5f}, 期望 {count / total:.5f}"
+    return statistic, dof, chi_square_p_value(statistic, dof), detail
+
+
+def homogeneity(first: Dict[str, int], second: Dict[str, int]) -> Tuple[float, int, float, str]:
+    """双样本卡方同质性检验，期望频数过小的类别合并"""
+    first_total, second_total = sum(first.values()), sum(second.values())
+    total = first_total + second_total
+    keys = sorted(set(first) | set(second), key=lambda key: -(first.get(key, 0) + second.get(key, 0)))
+    bins, pooled = [], [[], 0, 0]
+    for key in keys:
+        a, b = first.get(key, 0), second.get(key, 0)
+        if (a + b) * min(first_total, second_total) / total < MIN_EXPECTED:
+            pooled[0].append(key)
+            pooled[1] += a
+            pooled[2] += b
+        else:
+            bins.append(([key], a, b))
+    if pooled[0]:
+        bins.append(tuple(pooled))
+    statistic = 0.0
+    worst, worst_score = "", -1.0
+    for names, a, b in bins:
+        column = a + b
+        expected_a = column * first_total / total
+        expected_b = column * second_total / total
+        if expected_a > 0 and expected_b > 0:
+            score = (a - expected_a) ** 2 / expected_a + (b - expected_b) ** 2 / expected_b
+            statistic += score
+            if score > worst_score:
+                worst_score = score
+                worst = f"{'+'.join(map(str, names[:3]))}: {a / first_total:.5f} / {b / second_total:.5f}"
+    dof = len(bins) - 1
+    return statistic, dof, chi_square_p_value(statistic, dof), worst
+
+
+def count(items: List, feature: Callable) -> Dict[str, int]:
+    """统计各特征值的出现次数，特征为None的结果不计入"""
+    counts: Dict[str, int] = {}
+    for item in items:
+        key = feature(item)
+        if key is not None:
+            counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def _name(item) -> str:
+    return item if isinstance(item, str) else item["name"]
+
+
+def postfix_feature(postfixes: Dict[str, List[str]], closing: str) -> Callable:
+    """按名称末尾括号中的后缀判断其所属的后缀类别"""
+    lookup = {word: group for group, words in postfixes.items() for word in words}
+
+    def feature(item) -> str:
+        name = _name(item)
+        if not name.endswith(closing):
+            return "none"
+        start = name.rfind("（")
+        return lookup.get(name[start + 1:len(name) - len(closing)], "unknown")
+    return feature
+
+
+def name_style_check(generator: XiuXianNameGenerator) -> Tuple[Dict, Callable, Dict[str, float]]:
+    """人名风格检验
+
+    固定姓氏和性别后，single风格名为一个字；double风格的首字取自女名用字，
+    combine风格的首字取自中间字，二者按首字是否属于中间字区分。
+    """
+    female = generator.data["female"]
+    middle = set(generator.data["middle"])
+    overlap = sum(1 for word in female if word in middle) / len(female)
+    options = {"familyName": "林", "isFemale": True}
+
+    def feature(name: str) -> str:
+        given = name[1:]
+        if len(given) == 1:
+            return "single"
+        return "middle-first" if given[:len(given) - 1] in middle else "name-first"
+    expected = {
+        "single": 1 / 3,
+        "middle-first": 1 / 3 + 1 / 3 * overlap,
+        "name-first": 1 / 3 * (1 - overlap),
+    }
+    return options, feature, expected
+
+
+def analytic_checks(generator: XiuXianNameGenerator) -> List[Tuple[str, str, Optional[Dict], Callable, Dict[str, float]]]:
+    """列出 (检验名称, 生成类型, 选项, 特征函数, 理论分布)"""
+    rarity = lambda item: item["rarity"]
+    full = rarity_distribution(1.0)
+    capped = rarity_distribution(RARITY_VALUES["uncommon"])
+    place = {"rare": RARITY_VALUES["rare"],
+             "uncommon": RARITY_VALUES["uncommon"] - RARITY_VALUES["rare"],
+             "common": 1 - RARITY_VALUES["uncommon"]}
+    checks = [
+        ("道号稀有度", "dao", None, rarity, full),
+        ("功法稀有度", "skill", None, rarity, full),
+        ("秘籍稀有度", "book", None, rarity, full),
+        ("丹药稀有度", "alchemy", None, rarity, full),
+        ("生灵稀有度", "creature", None, rarity, capped),
+        ("生灵种类", "creature", None, lambda item: item["category"],
+         {category: 1 / len(CREATURE_CATEGORY) for category in CREATURE_CATEGORY}),
+        ("材料稀有度", "material", None, rarity, capped),
+        ("法宝稀有度", "talisman", None, rarity, capped),
+        ("国家稀有度", "nation", None, rarity, place),
+        ("据点稀有度", "location", None, rarity, place),
+        ("地域稀有度", "zone", None, rarity, place),
+        ("大陆稀有度", "continent", None, rarity, place),
+        ("秘籍后缀", "book", None,
+         postfix_feature(generator.data["book_postfix"], "）》"), postfix_distribution("rare", "uncommon")),
+        ("材料后缀", "material", None,
+         postfix_feature(generator.data["material_postfix"], "）"), postfix_distribution("broken", "handmade")),
+        ("法宝后缀", "talisman", None,
+         postfix_feature(generator.data["talisman_postfix"], "）"), postfix_distribution("broken", "handmade")),
+    ]
+    options, feature, expected = name_style_check(generator)
+    checks.append(("人名风格", "name", options, feature, expected))
+    return checks
+
+
+def comparison_features(generator: XiuXianNameGenerator, kind: str) -> Dict[str, Callable]:
+    """比较 generate_bulk 与逐个生成时使用的特征"""
+    features = {"名称长度": lambda item: len(_name(item))}
+    if kind not in ("name", "clan"):
+        features["稀有度"] = lambda item: item["rarity"]
+    if kind == "creature":
+        features["种类"] = lambda item: item["category"]
+    if kind in ("material", "talisman"):
+        features["后缀"] = postfix_feature(generator.data[kind + "_postfix"], "）")
+    if kind == "book":
+        features["后缀"] = postfix_feature(generator.data["book_postfix"], "）》")
+    return features
+
+
+def report(label: str, result: Tuple[float, int, float, str], alpha: float) -> bool:
+    """打印一行检验结果，返回是否通过"""
+    statistic, dof, p_value, detail = result
+    passed = p_value >= alpha
+    status = "通过" if passed else "偏离"
+    print(f"[{status}] {label}: chi2={statistic:.2f} dof={dof} p={p_value:.4g}  最大偏差 {detail}")
+    return passed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口，有检验未通过时返回1"""
+    parser = argparse.ArgumentParser(description="修仙名称生成器分布校验")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="数据文件目录路径")
+    parser.add_argument("-n", "--samples", type=int, default=100000, help="每项检验的样本数量")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--alpha", type=float, default=1e-3, help="显著性水平")
+    parser.add_argument("--bulk", action="store_true", help="同时检验 generate_bulk")
+    args = parser.parse_args(argv)
+
+    generator = XiuXianNameGenerator(args.data_dir, seed=args.seed)
+    paths = [("get", generator.generate)]
+    if args.bulk:
+        paths.append(("bulk", generator.generate_bulk))
+
+    passed = True
+    for path, generate in paths:
+        for label, kind, options, feature, expected in analytic_checks(generator):
+            observed = count(generate(kind, args.samples, options), feature)
+            passed &= report(f"{path} {label}", goodness_of_fit(observed, expected), args.alpha)
+
+    if args.bulk:
+        for kind in GENERATOR_KINDS:
+            reference = generator.generate(kind, args.samples)
+            bulk = generator.generate_bulk(kind, args.samples)
+            for label, feature in comparison_features(generator, kind).items():
+                result = homogeneity(count(reference, feature), count(bulk, feature))
+                passed &= report(f"bulk/get {kind} {label}", result, args.alpha)
+
+    print("全部检验通过" if passed else "存在偏离理论分布的结果", file=sys.stderr)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
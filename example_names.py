@@ -109,6 +109,12 @@ def main():
     zones = generator.get_zone(2, "山脉")
     for zone in zones:
         print(f"{zone['name']}")
+    
+    # 生成大陆
+    print("\n【大陆】")
+    continents = generator.get_continent(3)
+    for continent in continents:
+        print(f"{continent['name']}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
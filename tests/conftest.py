@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from xiuxian_names_generator import XiuXianNameGenerator, compile_bundle
+
+DATA_DIR = os.path.join(ROOT, "data")
+
+
+@pytest.fixture(scope="session")
+def data_dir():
+    return DATA_DIR
+
+
+@pytest.fixture(scope="session")
+def bundle_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("bundle") / "data.bundle")
+    compile_bundle(DATA_DIR, path)
+    return path
+
+
+@pytest.fixture
+def generator():
+    return XiuXianNameGenerator(DATA_DIR, seed=1)
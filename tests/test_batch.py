@@ -0,0 +1,16 @@
+import pytest
+
+from xiuxian_names_generator import NameBatch
+
+
+def test_name_accepts_negative_index(generator):
+    batch = generator.generate_batch("clan", 30, chunk_size=7)
+    for index in range(-len(batch), len(batch)):
+        assert batch.name(index) == batch[index].name
+    assert batch.name(-1) == batch.names[-1]
+    with pytest.raises(IndexError):
+        batch.name(len(batch))
+    with pytest.raises(IndexError):
+        batch.name(-len(batch) - 1)
+    with pytest.raises(IndexError):
+        NameBatch().name(0)
@@ -0,0 +1,32 @@
+import pytest
+
+from xiuxian_names_generator import XiuXianNameGenerator
+
+
+def _blocklist(tmp_path, *words):
+    path = tmp_path / "blocklist.txt"
+    path.write_text("# 测试\n" + "\n".join(words) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_blocked_words_never_appear(data_dir, tmp_path):
+    generator = XiuXianNameGenerator(data_dir, seed=3, blocklist=_blocklist(tmp_path, "血", "鱼"))
+    names = [item["name"] for item in generator.get_creature(500) + generator.get_talisman(500)]
+    assert not any("血" in name or "鱼" in name for name in names)
+    assert generator.blocked("赤血剑") == "血"
+    assert generator.get_creature(20, {"category": "fish"})
+
+
+def test_emptied_group_is_rejected_at_load(data_dir, tmp_path):
+    with pytest.raises(ValueError, match=r"creature/creature.json\[fish\]"):
+        XiuXianNameGenerator(data_dir, blocklist=_blocklist(tmp_path, "鱼", "鲸", "豚"))
+
+
+def test_emptied_group_is_rejected_in_bundle(bundle_path, tmp_path):
+    with pytest.raises(ValueError, match=r"zone\[water\]"):
+        XiuXianNameGenerator(bundle=bundle_path, blocklist=_blocklist(tmp_path, "海", "洋"))
+
+
+def test_pinyin_table_is_not_pruned(data_dir, tmp_path):
+    generator = XiuXianNameGenerator(data_dir, blocklist=_blocklist(tmp_path, "血"))
+    assert generator.pinyin("血") != "血"
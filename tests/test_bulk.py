@@ -0,0 +1,45 @@
+from collections import Counter
+
+import pytest
+
+from xiuxian_names_generator import GENERATOR_KINDS, XiuXianNameGenerator
+
+pytest.importorskip("numpy")
+
+SAMPLES = 20000
+
+
+def _name(result):
+    return result["name"] if isinstance(result, dict) else result
+
+
+def _distance(first, second, key):
+    """两组结果在key上的分布的总变差距离"""
+    first, second = Counter(map(key, first)), Counter(map(key, second))
+    return sum(abs(first[value] - second[value]) for value in first.keys() | second.keys()) / (2 * SAMPLES)
+
+
+@pytest.mark.parametrize("kind", GENERATOR_KINDS)
+def test_bulk_matches_generate(data_dir, kind):
+    generator = XiuXianNameGenerator(data_dir, seed=7)
+    single = generator.generate(kind, SAMPLES)
+    bulk = generator.generate_bulk(kind, SAMPLES)
+    assert len(bulk) == SAMPLES
+    assert type(bulk[0]) is type(single[0])
+    if isinstance(single[0], dict):
+        assert set(bulk[0]) == set(single[0])
+        assert _distance(single, bulk, lambda item: item.get("rarity")) < 0.03
+    assert _distance(single, bulk, lambda item: len(_name(item))) < 0.03
+    for item in bulk[:2000]:
+        assert generator.parse(kind, _name(item)) is not None, _name(item)
+
+
+def test_bulk_covers_the_same_names(data_dir):
+    generator = XiuXianNameGenerator(data_dir, seed=7)
+    size = generator.space_size("nation")
+    single = {_name(item) for item in generator.generate("nation", 5 * SAMPLES)}
+    bulk = {_name(item) for item in generator.generate_bulk("nation", 5 * SAMPLES)}
+    everything = {_name(generator.decode("nation", index)) for index in range(size)}
+    assert bulk <= everything
+    # 极少出现的名称可能只在其中一组样本中出现
+    assert len(single ^ bulk) < 0.02 * size
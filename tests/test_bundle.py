@@ -0,0 +1,15 @@
+from xiuxian_names_generator import GENERATOR_KINDS, XiuXianNameGenerator
+
+
+def test_bundle_matches_json(data_dir, bundle_path):
+    from_json = XiuXianNameGenerator(data_dir, seed=7)
+    from_bundle = XiuXianNameGenerator(bundle=bundle_path, seed=7)
+    for kind in GENERATOR_KINDS:
+        assert from_bundle.generate(kind, 50) == from_json.generate(kind, 50)
+
+
+def test_bundle_builds_pools_on_first_use(bundle_path):
+    generator = XiuXianNameGenerator(bundle=bundle_path, seed=1)
+    assert len(generator._pools) == 0
+    generator.get_skill(1)
+    assert "skill_common" in generator._pools
@@ -0,0 +1,18 @@
+import pytest
+
+
+def _name(result):
+    return result["name"] if isinstance(result, dict) else result
+
+
+def test_constraints_are_sampled_directly(generator):
+    names = generator.get_name(50, {"nameLength": 3, "forbiddenChars": "李"})
+    assert len(names) == 50
+    assert all(len(name) == 3 and "李" not in name for name in names)
+    zones = generator.get_zone(20, {"requiredChars": "山", "maxLength": 4})
+    assert all("山" in _name(zone) and len(_name(zone)) <= 4 for zone in zones)
+
+
+def test_unsatisfiable_constraints_raise(generator):
+    with pytest.raises(ValueError):
+        generator.get_clan(1, {"nameLength": 30})
@@ -0,0 +1,33 @@
+import os
+
+from xiuxian_names_generator import XiuXianNameGenerator
+
+
+def test_parallel_after_chdir(data_dir, tmp_path, monkeypatch):
+    monkeypatch.chdir(os.path.dirname(data_dir))
+    generator = XiuXianNameGenerator("data", lazy=True, seed=3)
+    monkeypatch.chdir(tmp_path)
+    names = list(generator.generate_parallel("name", 200, workers=2, chunk_size=50))
+    assert len(names) == 200
+    assert generator.get_clan(1)
+
+
+def test_parallel_is_reproducible(data_dir):
+    first = list(XiuXianNameGenerator(data_dir, seed=5).generate_parallel("dao", 300, workers=2, chunk_size=100))
+    second = list(XiuXianNameGenerator(data_dir, seed=5).generate_parallel("dao", 300, workers=1, chunk_size=100))
+    assert first == second
+
+
+def test_parallel_stats_do_not_depend_on_workers(data_dir):
+    snapshots = []
+    for workers in (1, 2):
+        generator = XiuXianNameGenerator(data_dir, seed=5, stats=True, unique=True)
+        list(generator.generate_parallel("dao", 300, workers=workers, chunk_size=100))
+        snapshot = generator.stats()
+        assert snapshot["dao"]["seconds"] > 0
+        for entry in snapshot.values():
+            del entry["seconds"]
+        snapshots.append(snapshot)
+    assert snapshots[0] == snapshots[1]
+    assert snapshots[0]["dao"]["calls"] == 3
+    assert snapshots[0]["dao"]["names"] == 300
@@ -0,0 +1,22 @@
+from xiuxian_names_generator import XiuXianNameGenerator
+
+
+def test_pinyin_index_built_on_first_use(data_dir):
+    generator = XiuXianNameGenerator(data_dir, seed=1)
+    assert "pinyin" not in generator._pools
+    assert generator.pinyin("林", tone=False) == "lin"
+    assert "pinyin" in generator._pools
+
+
+def test_unique_pinyin_rejects_homophones(data_dir):
+    generator = XiuXianNameGenerator(data_dir, seed=1, unique_pinyin=True)
+    names = generator.get_clan(300)
+    readings = [generator.pinyin(name, tone=False, separator="") for name in names]
+    assert len(set(readings)) == len(readings)
+
+
+def test_syllable_boundaries_are_not_homophones(data_dir):
+    generator = XiuXianNameGenerator(data_dir, unique_pinyin=True)
+    assert generator._admit("location", ["西安"]) == ["西安"]
+    assert generator._admit("location", ["先"]) == ["先"]
+    assert generator._admit("location", ["希安"]) == []
@@ -0,0 +1,25 @@
+import time
+
+import pytest
+
+from xiuxian_names_generator import PrefetchingGenerator
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_bad_options_do_not_stop_refilling(generator):
+    with PrefetchingGenerator(generator, capacity=64) as prefetch:
+        with pytest.raises(KeyError):
+            prefetch.get_creature(1, {"category": "dragon"})
+        prefetch.get_clan(1)
+        buffer = prefetch._buffer("clan", None)
+        _wait_for(lambda: len(buffer) == 64)
+        assert len(prefetch.get_clan(1)) == 1
+        assert len(buffer) == 63
+        assert prefetch._thread.is_alive()
+        assert all(key[0] != "creature" for key in prefetch._buffers)
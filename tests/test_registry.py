@@ -0,0 +1,23 @@
+import pytest
+
+from xiuxian_names_generator import NameSpaceExhaustedError, XiuXianNameGenerator
+
+
+def test_registry_shared_between_instances(data_dir, tmp_path):
+    path = str(tmp_path / "names.db")
+    first = XiuXianNameGenerator(data_dir, seed=1, registry=path)
+    second = XiuXianNameGenerator(data_dir, seed=1, registry=path)
+    names = first.get_clan(200) + second.get_clan(200)
+    assert len(set(names)) == 400
+    assert first.registered_count("clan") == 400
+
+
+def test_exhaustion_deletes_rows_of_failed_call(data_dir, tmp_path):
+    path = str(tmp_path / "names.db")
+    generator = XiuXianNameGenerator(data_dir, seed=1, registry=path)
+    generator.get_nation(100)
+    with pytest.raises(NameSpaceExhaustedError):
+        generator.get_nation(generator.space_size("nation"))
+    assert generator.registered_count("nation") == 100
+    other = XiuXianNameGenerator(data_dir, seed=2, registry=path)
+    assert len(other.get_nation(1000)) == 1000
@@ -0,0 +1,66 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from xiuxian_names_generator import XiuXianNameGenerator
+
+
+def _rewrite(path, value):
+    """改写数据文件并确保修改时间发生变化"""
+    stat = os.stat(path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def data_copy(data_dir, tmp_path):
+    path = str(tmp_path / "data")
+    shutil.copytree(data_dir, path)
+    return path
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_reload_reads_only_changed_files(data_copy, monkeypatch, lazy):
+    generator = XiuXianNameGenerator(data_copy, seed=1, lazy=lazy, unique=True, stats=True)
+    old_clans = generator.get_clan(20)
+    generator.get_material(20)
+    assert generator.reload() is generator
+
+    with open(os.path.join(data_copy, "material/material.json"), encoding="utf-8") as f:
+        material = json.load(f)
+    _rewrite(os.path.join(data_copy, "organization/clan.json"), ["宗"])
+    _rewrite(os.path.join(data_copy, "material/material.json"), material)
+    loaded = []
+    load = XiuXianNameGenerator._load_json_file
+
+    def record(self, file_path):
+        loaded.append(file_path)
+        return load(self, file_path)
+
+    monkeypatch.setattr(XiuXianNameGenerator, "_load_json_file", record)
+    reloaded = generator.reload()
+    assert reloaded is not generator
+    assert reloaded.reload() is reloaded
+    if lazy:
+        assert loaded == []
+    else:
+        assert sorted(loaded) == ["material/material.json", "organization/clan.json"]
+    for key in dict.keys(generator.data):
+        if key not in ("clan", "material"):
+            assert reloaded.data[key] is generator.data[key], key
+    assert dict.get(reloaded._pools, "common") is dict.get(generator._pools, "common")
+    assert dict.get(reloaded._pools, "material_tiers") is not dict.get(generator._pools, "material_tiers")
+    assert reloaded._pools["material_tiers"] == generator._pools["material_tiers"]
+
+    clans = reloaded.get_clan(50)
+    assert all(name.endswith("宗") for name in clans)
+    assert len(reloaded.get_material(20)) == 20
+    # 旧实例保持旧数据
+    assert generator.data["clan"] != ["宗"]
+    assert not all(name.endswith("宗") for name in old_clans + generator.get_clan(50))
+    # 新实例共享唯一性记录和统计
+    assert reloaded.seen_count("clan") == 120
+    assert generator.stats()["clan"]["calls"] == 3
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from xiuxian_names_generator import NameSpaceExhaustedError, XiuXianNameGenerator
+from xiuxian_server import NameServer
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_single_requests_are_coalesced(generator):
+    calls = []
+    generate = generator.generate
+
+    def counting(kind, number=1, options=None):
+        calls.append(number)
+        return generate(kind, number, options)
+
+    generator.generate = counting
+    server = NameServer(generator)
+
+    async def main():
+        return await asyncio.gather(*(server.generate("name") for _ in range(20)))
+
+    results = _run(main())
+    assert all(len(result) == 1 for result in results)
+    assert calls == [20]
+
+
+def test_single_requests_stay_fast_during_bulk(generator):
+    server = NameServer(generator)
+
+    async def main():
+        bulk = asyncio.ensure_future(server.generate("book", 50000))
+        await asyncio.sleep(0)
+        start = time.perf_counter()
+        single = await server.generate("name")
+        elapsed = time.perf_counter() - start
+        assert not bulk.done()
+        return single, await bulk, elapsed
+
+    single, bulk, elapsed = _run(main())
+    assert len(single) == 1 and len(bulk) == 50000
+    assert elapsed < 0.05
+
+
+def test_exhausted_bulk_request_releases_names(data_dir):
+    generator = XiuXianNameGenerator(data_dir, seed=1, unique=True)
+    server = NameServer(generator)
+    generator.get_nation(100)
+
+    async def main():
+        await server.generate("nation", generator.space_size("nation") - 100)
+
+    with pytest.raises(NameSpaceExhaustedError):
+        _run(main())
+    assert generator.seen_count("nation") == 100
+
+
+def test_oversized_line_gets_error(generator, tmp_path):
+    server = NameServer(generator)
+
+    async def main():
+        listener = await server.start(host="127.0.0.1", port=0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b'{"id": 1, "method": "get_name"}\n' + b"x" * (1 << 17) + b"\n")
+        await writer.drain()
+        lines = [json.loads(line) for line in (await reader.read()).splitlines()]
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return lines
+
+    lines = _run(main())
+    assert {"id": None, "error": "无效的请求: 单行请求过长"} in lines
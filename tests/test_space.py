@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from xiuxian_names_generator import GENERATOR_KINDS
+
+
+def _name(result):
+    return result["name"] if isinstance(result, dict) else result
+
+
+def test_decode_enumerates_distinct_names(generator):
+    for kind in ("nation", "zone"):
+        size = generator.space_size(kind)
+        names = {_name(generator.decode(kind, i)) for i in range(size)}
+        assert len(names) == size
+    # 男女道号共用的称号只计一次
+    assert generator.space_size("dao") < sum(generator.space("dao").values())
+
+
+def test_decode_is_injective_on_sampled_ranges(generator):
+    rng = random.Random(4)
+    for kind in GENERATOR_KINDS:
+        size = generator.space_size(kind)
+        start = rng.randrange(max(size - 2000, 1))
+        indexes = set(range(start, min(start + 2000, size)))
+        indexes.update(rng.randrange(size) for _ in range(2000))
+        names = {_name(generator.decode(kind, i)) for i in indexes}
+        assert len(names) == len(indexes), kind
+    with pytest.raises(IndexError):
+        generator.decode("nation", generator.space_size("nation"))
+
+
+def test_decoded_names_parse(generator):
+    size = generator.space_size("zone")
+    for index in range(0, size, 97):
+        name = _name(generator.decode("zone", index))
+        assert generator.parse("zone", name) is not None
+
+
+def test_parse_rejects_foreign_name(generator):
+    assert generator.parse("clan", "不存在的名字") is None
@@ -0,0 +1,72 @@
+import re
+from collections import Counter
+
+from xiuxian_names_generator import RARITY_LEVELS, XiuXianNameGenerator
+
+_SAMPLE = re.compile(r'^(xiuxian_generator_\w+)\{kind="(\w+)"(?:,rarity="(\w+)")?\} (\S+)$')
+
+
+def test_stats_count_calls_names_and_rarities(data_dir):
+    generator = XiuXianNameGenerator(data_dir, seed=1, stats=True)
+    dao = generator.get_dao(100) + generator.generate("dao", 50) + generator.generate_bulk("dao", 30)
+    generator.get_clan(20)
+    snapshot = generator.stats()
+    assert snapshot["dao"]["calls"] == 3
+    assert snapshot["dao"]["names"] == 180
+    assert snapshot["dao"]["rarity"] == dict(Counter(item["rarity"] for item in dao))
+    assert snapshot["dao"]["seconds"] > 0
+    assert snapshot["clan"]["calls"] == 1
+    assert snapshot["clan"]["names"] == 20
+    assert snapshot["clan"]["rarity"] == {}
+    # 快照是副本，派生实例计入同一份统计
+    snapshot["dao"]["calls"] = 0
+    generator.spawn("child").get_dao(5)
+    assert generator.stats()["dao"]["calls"] == 4
+
+
+def test_stats_disabled_and_reset(data_dir):
+    generator = XiuXianNameGenerator(data_dir, seed=1)
+    generator.get_dao(10)
+    assert generator.stats() == {}
+    assert generator.prometheus_metrics().count("\n") == 8
+    generator.enable_stats()
+    generator.get_dao(10)
+    generator.enable_stats()
+    assert generator.stats() == {}
+    generator.get_dao(10)
+    assert generator.stats()["dao"]["calls"] == 1
+    generator.enable_stats(False)
+    assert generator.stats() == {}
+
+
+def test_prometheus_text_format(data_dir):
+    generator = XiuXianNameGenerator(data_dir, seed=1, stats=True)
+    generator.get_dao(100)
+    generator.get_clan(20)
+    snapshot = generator.stats()
+    text = generator.prometheus_metrics()
+    assert text.endswith("\n")
+    samples = {}
+    declared = {}
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            continue
+        if line.startswith("# TYPE "):
+            _, _, metric, kind = line.split(" ")
+            declared[metric] = kind
+            continue
+        match = _SAMPLE.match(line)
+        assert match, line
+        metric, kind, rarity, value = match.groups()
+        assert metric in declared
+        samples[metric, kind, rarity] = float(value)
+    assert set(declared.values()) == {"counter"}
+    for kind, entry in snapshot.items():
+        assert samples["xiuxian_generator_calls_total", kind, None] == entry["calls"]
+        assert samples["xiuxian_generator_names_total", kind, None] == entry["names"]
+        assert samples["xiuxian_generator_seconds_total", kind, None] == entry["seconds"]
+        for rarity, count in entry["rarity"].items():
+            assert rarity in RARITY_LEVELS
+            assert samples["xiuxian_generator_rarity_total", kind, rarity] == count
+    assert sum(count for (metric, _, _), count in samples.items()
+               if metric == "xiuxian_generator_rarity_total") == 100
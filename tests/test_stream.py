@@ -0,0 +1,58 @@
+import itertools
+import tracemalloc
+
+from xiuxian_names_generator import XiuXianNameGenerator
+
+
+def _stream_peak(generator, number):
+    """逐个取出number个名称时的内存峰值"""
+    tracemalloc.start()
+    try:
+        total = sum(1 for _ in generator.stream("name", number=number, batch_size=1000))
+        return total, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_stream_memory_does_not_grow_with_number(generator):
+    generator.get_name(1)
+    small = _stream_peak(generator, 5000)
+    large = _stream_peak(generator, 50000)
+    assert small[0] == 5000 and large[0] == 50000
+    assert large[1] < small[1] * 1.5
+
+
+def test_stream_generates_in_batches(generator, monkeypatch):
+    sizes = []
+    generate = generator.generate
+
+    def record(kind, number, options=None):
+        sizes.append(number)
+        return generate(kind, number, options)
+
+    monkeypatch.setattr(generator, "generate", record)
+    assert len(list(generator.stream("clan", number=2500, batch_size=1000))) == 2500
+    assert sizes == [1000, 1000, 500]
+    chunks = list(generator.stream("clan", number=250, chunk_size=100))
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+    assert len(list(itertools.islice(generator.stream("clan", batch_size=10), 35))) == 35
+
+
+def test_stream_respects_unique_mode(data_dir):
+    generator = XiuXianNameGenerator(data_dir, seed=1, unique=True)
+    first = list(generator.stream("nation", number=3000, batch_size=256))
+    second = [item for chunk in generator.stream("nation", number=1000, chunk_size=300, bulk=True)
+              for item in chunk]
+    names = [item["name"] for item in first + second]
+    assert len(set(names)) == len(names) == 4000
+    assert generator.seen_count("nation") == 4000
+
+
+def test_closed_stream_releases_unused_names(data_dir):
+    generator = XiuXianNameGenerator(data_dir, seed=1, unique=True)
+    stream = generator.stream("nation", batch_size=256)
+    names = [item["name"] for item in itertools.islice(stream, 10)]
+    assert generator.seen_count("nation") == 256
+    stream.close()
+    assert generator.seen_count("nation") == 10
+    assert all(name in generator._seen["nation"] for name in names)
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from xiuxian_names_generator import NameSpaceExhaustedError, XiuXianNameGenerator, _SeenSet
+
+
+def test_seen_set_discard_keeps_probe_chains():
+    rng = random.Random(3)
+    seen = _SeenSet()
+    expected = set()
+    for _ in range(20000):
+        name = str(rng.randrange(3000))
+        if rng.random() < 0.4:
+            assert seen.discard(name) == (name in expected)
+            expected.discard(name)
+        else:
+            assert seen.add(name) == (name not in expected)
+            expected.add(name)
+    assert len(seen) == len(expected)
+    assert all(str(value) in seen for value in expected)
+
+
+def test_exhaustion_releases_names_of_failed_call(data_dir):
+    generator = XiuXianNameGenerator(data_dir, seed=2, unique=True)
+    generator.get_nation(100)
+    with pytest.raises(NameSpaceExhaustedError):
+        generator.get_nation(generator.space_size("nation") - 100)
+    assert generator.seen_count("nation") == 100
+    assert len(generator.get_nation(100)) == 100
+
+
+def test_precheck_uses_options(data_dir):
+    generator = XiuXianNameGenerator(data_dir, seed=2, unique=True)
+    size = generator.space_size("clan", {"kind": "宗"})
+    with pytest.raises(NameSpaceExhaustedError, match="最多还能生成"):
+        generator.get_clan(size + 1, {"kind": "宗"})
+    assert generator.seen_count("clan") == 0
@@ -0,0 +1,26 @@
+import itertools
+from collections import Counter
+
+from xiuxian_names_generator import XiuXianNameGenerator
+
+SPEC = {"continent": 2, "zone": [1, 4], "nation": [2, 5]}
+
+
+def _count_levels(nodes):
+    return Counter(node["level"] for node in nodes)
+
+
+def test_unique_world_keeps_only_emitted_names(generator):
+    generator.unique = True
+    counts = _count_levels(generator.generate_world(SPEC, batch_size=64))
+    for level, count in counts.items():
+        assert generator.seen_count(level) == count
+
+
+def test_closed_world_releases_registry_names(data_dir, tmp_path):
+    generator = XiuXianNameGenerator(data_dir, seed=1, registry=str(tmp_path / "names.db"))
+    world = generator.generate_world(SPEC, batch_size=64)
+    counts = _count_levels(itertools.islice(world, 5))
+    world.close()
+    for level in SPEC:
+        assert generator.registered_count(level) == counts[level]
@@ -1,7 +1,30 @@
+import io
+import csv
 import json
 import random
 import os
-from typing import Dict, List, Optional, Union, Any
+import sys
+import mmap
+import struct
+import argparse
+import threading
+import time
+import copy
+import bisect
+import hashlib
+import functools
+import sqlite3
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from array import array
+from typing import Dict, List, Optional, Union, Any, Iterable, Iterator, NamedTuple, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖，仅 generate_bulk 使用
+    np = None
+
 # 常量定义
 SEX_VALUES = [
     {"text": "随机", "value": None},
@@ -63,6 +86,18 @@ CREATURE_CATEGORY_NAMES = {
 
 ZONE_CATEGORIES = ["land", "water", "void"]
 
+# 可通过 generate/generate_bulk 按名称调用的生成类型，对应 get_<kind> 方法
+GENERATOR_KINDS = (
+    "name", "dao", "skill", "book", "creature", "material", "talisman",
+    "alchemy", "clan", "nation", "location", "zone", "continent",
+)
+
+# generate_world 生成的世界层级，由外到内排列
+WORLD_LEVELS = ("continent", "zone", "nation", "clan", "location")
+
+# export 方法和命令行支持的导出格式
+EXPORT_FORMATS = ("jsonl", "csv", "parquet")
+
 # 特殊符号常量
 _PARENTHESIS_LEFT = "（"
 _PARENTHESIS_RIGHT = "）"
@@ -76,80 +111,1315 @@ _AGE1 = "百年"
 _AGE10 = "千年"
 _AGE100 = "万年"
 
+# 各生成器使用的通用词类别
+_SKILL_COMMON_CATEGORIES = ("dao", "element", "creature", "thing", "color", "place",
+                            "adj", "number", "gesture", "action")
+_CREATURE_COMMON_CATEGORIES = ("dao", "element", "thing", "color", "number", "action")
+_ALCHEMY_COMMON_CATEGORIES = ("dao", "element", "color", "number", "action")
+
+# 稀有度阈值（升序）及落入各区间时对应的稀有度，与 _get_rarity 的判断顺序一致
+_RARITY_BY_THRESHOLD = ("exotic", "mythic", "legendary", "epic", "rare", "uncommon", "common")
+_RARITY_THRESHOLDS = tuple(RARITY_VALUES[rarity] for rarity in _RARITY_BY_THRESHOLD[:-1])
+
+# 稀有度在 NameBatch 中的单字节编码
+_RARITY_CODES = {rarity: code for code, rarity in enumerate(RARITY_LEVELS)}
+
+# 秘籍按稀有度添加前缀的稀有度
+_BOOK_PREFIX_RARITIES = ("exotic", "mythic", "legendary", "epic")
+
+
+def _flatten(groups: Dict[str, List[str]], keys: Iterable[str]) -> Tuple[str, ...]:
+    """按给定顺序合并分组词表
+    
+    Args:
+        groups: 分组词表
+        keys: 需要合并的分组名，缺失的分组会被跳过
+    
+    Returns:
+        合并后的不可变词表
+    """
+    words = []
+    for key in keys:
+        if key in groups:
+            words.extend(groups[key])
+    return tuple(words)
+
+
+def _rarity_tiers(groups: Dict[str, List[str]]) -> Dict[str, Tuple[str, ...]]:
+    """构建按稀有度累积的词表
+    
+    Args:
+        groups: 以稀有度为键的分组词表
+    
+    Returns:
+        每个稀有度对应其自身及以下所有稀有度的词
+    """
+    return {
+        rarity: _flatten(groups, RARITY_LEVELS[:index + 1])
+        for index, rarity in enumerate(RARITY_LEVELS)
+    }
+
+def _title_rarity_index(data: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """构建称号到稀有度的索引
+    
+    与逐级比较的规则一致: 称号出现在本性别或男性同一稀有度的分组中即属于该稀有度，
+    同时属于多个稀有度时取最高的一个。
+    
+    Returns:
+        称号分组数据键 -> {称号: 稀有度}
+    """
+    male = data.get("dao_title_male", {})
+    index = {}
+    for gender in ("dao_title_female", "dao_title_male"):
+        title_group = data.get(gender, {})
+        titles = {}
+        for rarity in RARITY_LEVELS[1:]:
+            for title in list(title_group.get(rarity, [])) + list(male.get(rarity, [])):
+                titles[title] = rarity
+        index[gender] = titles
+    return index
+
+
+# 拼音中表示声调的组合附加符号: 阴平、阳平、上声、去声
+_TONE_MARKS = frozenset("\u0304\u0301\u030c\u0300")
+
+
+def _strip_tones(syllable: str) -> str:
+    """去掉拼音音节的声调符号，保留ü"""
+    decomposed = unicodedata.normalize("NFD", syllable)
+    return unicodedata.normalize("NFC", "".join(c for c in decomposed if c not in _TONE_MARKS))
+
+
+def _pinyin_index(table: Dict[str, List[str]]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """把按音节分组的拼音表转换为汉字到拼音的映射
+    
+    Returns:
+        (汉字 -> 带声调的拼音, 汉字 -> 不带声调的拼音)
+    """
+    toned = {}
+    toneless = {}
+    for syllable, chars in table.items():
+        plain = _strip_tones(syllable)
+        for char in chars:
+            toned[char] = syllable
+            toneless[char] = plain
+    return toned, toneless
+
+
+# 数据键与数据文件（相对于data_dir）的对应关系
+_DATA_FILES = {
+    # 共享数据
+    "common": "shared/common.json",
+    "strange": "shared/strange.json",
+    "color": "shared/color.json",
+    "spirit": "shared/spirit.json",
+    "pinyin": "shared/pinyin.json",
+    
+    # 人名数据
+    "family": "name/family.json",
+    "female": "name/female.json",
+    "male": "name/male.json",
+    "middle": "name/middle.json",
+    
+    # 道号数据
+    "dao": "dao/dao.json",
+    "dao_title_male": "dao/title_male.json",
+    "dao_title_female": "dao/title_female.json",
+    
+    # 技能数据
+    "skill": "skill/skill.json",
+    "skill_prefix": "skill/prefix.json",
+    "skill_numfix": "skill/numfix.json",
+    
+    # 书籍数据
+    "book": "book/book.json",
+    "book_prefix": "book/prefix.json",
+    "book_postfix": "book/postfix.json",
+    
+    # 符箓数据
+    "talisman": "talisman/talisman.json",
+    "talisman_material": "talisman/material.json",
+    "talisman_postfix": "talisman/postfix.json",
+    
+    # 组织数据
+    "clan": "organization/clan.json",
+    "nation": "organization/nation.json",
+    
+    # 地点数据
+    "place": "place/place.json",
+    "place_prefix": "place/prefix.json",
+    "place_postfix": "place/postfix.json",
+    "location": "place/location.json",
+    "zone": "place/zone.json",
+    "continent": "place/continent.json",
+    
+    # 材料数据
+    "material": "material/material.json",
+    "material_postfix": "material/postfix.json",
+    
+    # 生物数据
+    "creature": "creature/creature.json",
+    "creature_prefix": "creature/prefix.json",
+    "strange_creature": "creature/strange.json",
+    
+    # 丹药数据
+    "alchemy": "alchemy/alchemy.json",
+}
+
+# 预编译词池及其构建方式
+_POOL_BUILDERS = {
+    "common": lambda data: _flatten(data.get("common", {}), data.get("common", {})),
+    "skill_common": lambda data: _flatten(data.get("common", {}), _SKILL_COMMON_CATEGORIES),
+    "creature_common": lambda data: _flatten(data.get("common", {}), _CREATURE_COMMON_CATEGORIES),
+    "alchemy_common": lambda data: _flatten(data.get("common", {}), _ALCHEMY_COMMON_CATEGORIES),
+    "material_tiers": lambda data: _rarity_tiers(data.get("material", {})),
+    "talisman_tiers": lambda data: _rarity_tiers(data.get("talisman", {})),
+    "dao_title_rarity": lambda data: _title_rarity_index(data),
+    "pinyin": lambda data: _pinyin_index(data.get("pinyin", {})),
+}
+
+# 各词池依赖的数据键，这些数据重新加载后对应的词池需要重建
+_POOL_SOURCES = {
+    "common": ("common",),
+    "skill_common": ("common",),
+    "creature_common": ("common",),
+    "alchemy_common": ("common",),
+    "material_tiers": ("material",),
+    "talisman_tiers": ("talisman",),
+    "dao_title_rarity": ("dao_title_female", "dao_title_male"),
+    "pinyin": ("pinyin",),
+}
+
+# 只有部分功能用到的词池，即使在非懒加载模式下也在首次使用时才构建
+_DEFERRED_POOLS = frozenset(("pinyin",))
+
+
+class _LazyData(dict):
+    """按需加载的数据字典
+    
+    首次访问某个数据键时才读取对应的JSON文件，之后缓存在字典中。
+    """
+    
+    def __init__(self, loader):
+        super().__init__()
+        self._loader = loader
+    
+    def __missing__(self, key):
+        if key not in _DATA_FILES:
+            raise KeyError(key)
+        value = self._loader(key)
+        self[key] = value
+        return value
+    
+    def __contains__(self, key):
+        return key in _DATA_FILES or dict.__contains__(self, key)
+    
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+
+class _PoolCache(dict):
+    """按需构建的词池缓存，词池只在首次使用时由 _POOL_BUILDERS 构建"""
+    
+    def __init__(self, data: Dict[str, Any]):
+        super().__init__()
+        self._data = data
+    
+    def __missing__(self, key):
+        pool = _POOL_BUILDERS[key](self._data)
+        self[key] = pool
+        return pool
+
+
+# 数据包格式: 文件头 + 索引JSON + 字符串偏移表 + 词ID表 + UTF-8字符串区
+_BUNDLE_MAGIC = b"XXNB"
+_BUNDLE_VERSION = 1
+_BUNDLE_BYTE_ORDER_MARK = 0x01020304
+_BUNDLE_HEADER = struct.Struct("<4sIIIIII")
+
+
+def compile_bundle(data_dir: str, output_path: str) -> Dict[str, int]:
+    """把data目录编译为单个二进制数据包
+    
+    所有词语去重后存入字符串区，每个数据项（及其中按稀有度、类别划分的分组）
+    在词ID表中占据一段连续区间，加载时可直接内存映射而无需解析JSON。
+    
+    Args:
+        data_dir: 数据文件目录路径
+        output_path: 输出的数据包路径
+    
+    Returns:
+        包含字符串数量、词数量和文件大小的统计信息
+    """
+    strings: Dict[str, int] = {}
+    ids = array("I")
+    
+    def add_words(words: List[str]) -> List[int]:
+        start = len(ids)
+        for word in words:
+            ids.append(strings.setdefault(word, len(strings)))
+        return [start, len(words)]
+    
+    index = {}
+    for key, file_path in _DATA_FILES.items():
+        with open(os.path.join(data_dir, file_path), 'r', encoding='utf-8') as f:
+            value = json.load(f)
+        if isinstance(value, dict):
+            index[key] = {group: add_words(words) for group, words in value.items()}
+        else:
+            index[key] = add_words(value)
+    
+    blob = bytearray()
+    offsets = array("I", [0])
+    for word in strings:
+        blob += word.encode("utf-8")
+        offsets.append(len(blob))
+    
+    index_bytes = json.dumps(index, ensure_ascii=False).encode("utf-8")
+    index_bytes += b" " * (-len(index_bytes) % 4)
+    header = _BUNDLE_HEADER.pack(_BUNDLE_MAGIC, _BUNDLE_VERSION, _BUNDLE_BYTE_ORDER_MARK,
+                                 len(index_bytes), len(strings), len(ids), len(blob))
+    
+    # 先写临时文件再替换，已映射旧数据包的进程不受影响
+    temp_path = output_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        f.write(index_bytes)
+        f.write(offsets.tobytes())
+        f.write(ids.tobytes())
+        f.write(blob)
+    os.replace(temp_path, output_path)
+    
+    return {"strings": len(strings), "words": len(ids), "size": os.path.getsize(output_path)}
+
+
+def compile_pinyin(data_dir: str, output_path: Optional[str] = None) -> Dict[str, int]:
+    """为数据目录中出现的所有汉字生成拼音表
+    
+    拼音表按带声调的音节分组保存，例如 {"qīng": ["清", "青"]}，加载时转换为汉字到拼音的映射。
+    每个词按词语整体注音，多音字取在数据中出现最多的读音。生成需要安装 pypinyin，
+    生成后的拼音表随数据文件一起发布，运行时不依赖 pypinyin。
+    
+    Args:
+        data_dir: 数据文件目录路径
+        output_path: 输出路径，默认为数据目录下的 shared/pinyin.json
+    
+    Returns:
+        包含汉字数量和音节数量的统计信息
+    """
+    try:
+        # pypinyin 为可选依赖，仅在生成拼音表时导入
+        from pypinyin import Style, pinyin
+    except ImportError:
+        raise RuntimeError("生成拼音表需要安装 pypinyin")
+    
+    output_path = output_path or os.path.join(data_dir, _DATA_FILES["pinyin"])
+    # 生成时加入的连接字等固定字符
+    words = [_COUNTRY, _LINK_WORD, _NUMBER_BEGIN_SUPPLEMENT, _NUMBER_END_SUPPLEMENT]
+    
+    def collect(value):
+        if isinstance(value, str):
+            words.append(value)
+        elif isinstance(value, dict):
+            for item in value.values():
+                collect(item)
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+    
+    for key, file_path in _DATA_FILES.items():
+        path = os.path.join(data_dir, file_path)
+        if key != "pinyin" and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                collect(json.load(f))
+    
+    # 汉字 -> {读音: 出现次数}
+    readings: Dict[str, Dict[str, int]] = {}
+    for word in words:
+        syllables = [item[0] for item in pinyin(word, style=Style.TONE)]
+        if len(syllables) != len(word):
+            syllables = [pinyin(char, style=Style.TONE)[0][0] for char in word]
+        for char, syllable in zip(word, syllables):
+            if syllable != char:
+                counts = readings.setdefault(char, {})
+                counts[syllable] = counts.get(syllable, 0) + 1
+    
+    table: Dict[str, List[str]] = {}
+    for char in sorted(readings):
+        counts = readings[char]
+        table.setdefault(max(counts, key=counts.get), []).append(char)
+    table = {syllable: table[syllable] for syllable in sorted(table, key=lambda s: (_strip_tones(s), s))}
+    
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    return {"chars": len(readings), "syllables": len(table)}
+
+
+class _BundleWords:
+    """数据包中的一段词表
+    
+    行为类似只读列表，词语在访问时才从内存映射中解码，
+    多个进程映射同一数据包时共享同一份页缓存。
+    """
+    
+    __slots__ = ("_offsets", "_ids", "_blob", "_start", "_count")
+    
+    def __init__(self, offsets: memoryview, ids: memoryview, blob: memoryview, start: int, count: int):
+        self._offsets = offsets
+        self._ids = ids
+        self._blob = blob
+        self._start = start
+        self._count = count
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("词表索引超出范围")
+        string_id = self._ids[self._start + index]
+        return str(self._blob[self._offsets[string_id]:self._offsets[string_id + 1]], "utf-8")
+    
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+    
+    def __contains__(self, word) -> bool:
+        return any(item == word for item in self)
+    
+    def __add__(self, other) -> List[str]:
+        return list(self) + list(other)
+    
+    def __radd__(self, other) -> List[str]:
+        return list(other) + list(self)
+    
+    def __repr__(self) -> str:
+        return f"_BundleWords({list(self)!r})"
+
+
+def _load_bundle(path: str):
+    """内存映射数据包并构建数据字典
+    
+    Args:
+        path: 数据包路径
+    
+    Returns:
+        (数据字典, 映射对象)
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    magic, version, byte_order, index_size, string_count, id_count, blob_size = \
+        _BUNDLE_HEADER.unpack_from(mapped, 0)
+    if magic != _BUNDLE_MAGIC or version != _BUNDLE_VERSION:
+        raise ValueError(f"不支持的数据包格式: {path}")
+    if byte_order != _BUNDLE_BYTE_ORDER_MARK or array("I").itemsize != 4:
+        raise ValueError(f"数据包与当前平台的字节序不一致，请重新编译: {path}")
+    
+    view = memoryview(mapped)
+    position = _BUNDLE_HEADER.size
+    index = json.loads(bytes(view[position:position + index_size]).decode("utf-8"))
+    position += index_size
+    offsets = view[position:position + (string_count + 1) * 4].cast("I")
+    position += (string_count + 1) * 4
+    ids = view[position:position + id_count * 4].cast("I")
+    position += id_count * 4
+    blob = view[position:position + blob_size]
+    
+    data = {}
+    for key, entry in index.items():
+        if isinstance(entry, dict):
+            data[key] = {group: _BundleWords(offsets, ids, blob, start, count)
+                         for group, (start, count) in entry.items()}
+        else:
+            data[key] = _BundleWords(offsets, ids, blob, entry[0], entry[1])
+    return data, mapped
+
+
+def _derive_seed(seed: int, *key) -> int:
+    """由根种子和分片键派生子随机流的种子
+    
+    Args:
+        seed: 根种子
+        key: 分片键，例如分片序号或工作进程名
+    
+    Returns:
+        128位整数种子，不同的键得到互不相关的种子
+    """
+    material = repr((seed,) + key).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(material, digest_size=16).digest(), "little")
+
+
+def _data_signature(data_dir: str, bundle: Optional[str] = None) -> Dict[str, Optional[Tuple[int, int]]]:
+    """记录每个数据文件（或数据包）的修改时间和大小，文件变化时对应的签名随之变化
+    
+    Returns:
+        数据键（数据包模式下为"bundle"） -> (修改时间, 大小)，文件不存在时为None
+    """
+    if bundle:
+        paths = {"bundle": bundle}
+    else:
+        paths = {key: os.path.join(data_dir, file_path) for key, file_path in _DATA_FILES.items()}
+    signature = {}
+    for key, path in paths.items():
+        try:
+            stat = os.stat(path)
+            signature[key] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature[key] = None
+    return signature
+
+
+class NameSpaceExhaustedError(RuntimeError):
+    """唯一性模式下可用的名称组合已接近耗尽"""
+
+
+class _SeenSet:
+    """紧凑的已生成名称集合
+    
+    只保存名称的64位哈希，以开放寻址方式存放在 array('Q') 中，
+    装载因子保持在0.375~0.75之间，每个条目约占11~21字节，可容纳数千万条目。两个不同名称哈希相同的概率极低
+    （千万级条目时约为十万分之一），发生时后者会被当作重复而重新生成。
+    """
+    
+    __slots__ = ("_table", "_mask", "_count")
+    
+    def __init__(self, capacity: int = 1024):
+        size = 1 << max(10, (capacity * 4 // 3).bit_length())
+        self._table = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __contains__(self, name: str) -> bool:
+        key = hash(name) & 0xFFFFFFFFFFFFFFFF or 1
+        table = self._table
+        mask = self._mask
+        index = key & mask
+        while True:
+            slot = table[index]
+            if slot == 0:
+                return False
+            if slot == key:
+                return True
+            index = (index + 1) & mask
+    
+    def add(self, name: str) -> bool:
+        """加入名称
+        
+        Returns:
+            名称此前未出现过时返回True
+        """
+        key = hash(name) & 0xFFFFFFFFFFFFFFFF or 1
+        table = self._table
+        mask = self._mask
+        index = key & mask
+        while True:
+            slot = table[index]
+            if slot == 0:
+                break
+            if slot == key:
+                return False
+            index = (index + 1) & mask
+        table[index] = key
+        self._count += 1
+        if self._count * 4 > len(table) * 3:
+            self._grow()
+        return True
+    
+    def discard(self, name: str) -> bool:
+        """移除名称，之后的条目依次前移填补空位，保持线性探测的查找路径完整
+        
+        Returns:
+            名称此前存在时返回True
+        """
+        key = hash(name) & 0xFFFFFFFFFFFFFFFF or 1
+        table = self._table
+        mask = self._mask
+        index = key & mask
+        while True:
+            slot = table[index]
+            if slot == 0:
+                return False
+            if slot == key:
+                break
+            index = (index + 1) & mask
+        hole = index
+        while True:
+            index = (index + 1) & mask
+            slot = table[index]
+            if slot == 0:
+                break
+            # 该条目的初始位置不在 (hole, index] 之间时，前移到空位不会切断它的查找路径
+            if (index - (slot & mask)) & mask >= (index - hole) & mask:
+                table[hole] = slot
+                hole = index
+        table[hole] = 0
+        self._count -= 1
+        return True
+    
+    def _grow(self):
+        """扩容为两倍大小并重新放置所有条目"""
+        old_table = self._table
+        size = len(old_table) * 2
+        table = array("Q", bytes(8 * size))
+        mask = size - 1
+        for key in old_table:
+            if key:
+                index = key & mask
+                while table[index]:
+                    index = (index + 1) & mask
+                table[index] = key
+        self._table = table
+        self._mask = mask
+
+
+class _Blocklist:
+    """屏蔽词自动机
+    
+    把全部屏蔽词一次编译为 Aho-Corasick 自动机，之后每个名称只需从头到尾扫描一遍，
+    耗时与屏蔽词数量无关。
+    """
+    
+    __slots__ = ("patterns", "_first", "_goto", "_fail", "_output")
+    
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = tuple(dict.fromkeys(pattern for pattern in patterns if pattern))
+        goto: List[Dict[str, int]] = [{}]
+        output: List[Optional[str]] = [None]
+        for pattern in self.patterns:
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = goto[state][char] = len(goto)
+                    goto.append({})
+                    output.append(None)
+                state = next_state
+            if output[state] is None:
+                output[state] = pattern
+        
+        # 按广度优先顺序计算失败指针，并把失败指针上的匹配合并到当前状态
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                target = fail[state]
+                while target and char not in goto[target]:
+                    target = fail[target]
+                fail[next_state] = goto[target].get(char, 0)
+                if output[next_state] is None:
+                    output[next_state] = output[fail[next_state]]
+        # 屏蔽词的首字集合，名称中不含任何首字时无需扫描
+        self._first = frozenset(goto[0])
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+    
+    @classmethod
+    def load(cls, blocklist: Union[str, Iterable[str]]) -> "_Blocklist":
+        """从文件路径或屏蔽词序列构造，文件每行一个屏蔽词，忽略空行和以#开头的行"""
+        if isinstance(blocklist, str):
+            with open(blocklist, "r", encoding="utf-8") as f:
+                blocklist = [line.strip() for line in f if not line.lstrip().startswith("#")]
+        return cls(blocklist)
+    
+    def __len__(self) -> int:
+        return len(self.patterns)
+    
+    def search(self, text: str) -> Optional[str]:
+        """返回text中出现的一个屏蔽词，没有时返回None"""
+        if self._first.isdisjoint(text):
+            return None
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for char in text:
+            next_state = goto[state].get(char)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(char)
+            state = next_state or 0
+            if output[state] is not None:
+                return output[state]
+        return None
+    
+    def prune(self, value: Any, source: str = "") -> Any:
+        """移除数据项中包含屏蔽词的词语
+        
+        Args:
+            value: JSON数据，列表或以分组为值的字典
+            source: 数据来源，用于错误信息
+        
+        Returns:
+            移除屏蔽词后的数据，保持原有结构
+        
+        Raises:
+            ValueError: 某个词表或分组的词语被全部移除，生成时将无词可选
+        """
+        if isinstance(value, dict):
+            return {key: self.prune(words, f"{source}[{key}]") for key, words in value.items()}
+        if isinstance(value, str):
+            return value
+        pruned = [word for word in value if not (isinstance(word, str) and self.search(word) is not None)]
+        if value and not pruned:
+            raise ValueError(f"屏蔽词移除了 {source} 中的全部词语，无法生成对应的名称")
+        return pruned
+
+
+class _NameRegistry:
+    """基于SQLite的跨进程名称登记表
+    
+    每个名称在 (类型, 名称) 主键上以 INSERT OR IGNORE 登记，插入成功即表示该名称
+    此前没有被任何进程发放过。一批名称在一个事务中登记，数据库使用WAL模式，
+    多个进程可以同时读写。已登记或已知冲突的名称记录在内存中，再次出现时无需访问数据库。
+    """
+    
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self._lock = threading.Lock()
+        self._known: Dict[str, _SeenSet] = {}
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None,
+                                           check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS names ("
+            "kind TEXT NOT NULL, name TEXT NOT NULL, PRIMARY KEY (kind, name)) WITHOUT ROWID")
+    
+    def reserve(self, kind: str, names: List[str]) -> List[bool]:
+        """登记一批名称
+        
+        Args:
+            kind: 生成类型
+            names: 待登记的名称
+        
+        Returns:
+            与names一一对应，名称登记成功（此前未被发放）时为True
+        """
+        with self._lock:
+            known = self._known.get(kind)
+            if known is None:
+                known = self._known[kind] = _SeenSet()
+            reserved = [False] * len(names)
+            execute = self._connection.execute
+            execute("BEGIN IMMEDIATE")
+            try:
+                for index, name in enumerate(names):
+                    # 先加入内存记录：无论插入是否成功，该名称之后都不可再用
+                    if known.add(name):
+                        cursor = execute("INSERT OR IGNORE INTO names (kind, name) VALUES (?, ?)", (kind, name))
+                        reserved[index] = cursor.rowcount == 1
+            except BaseException:
+                execute("ROLLBACK")
+                self._known.pop(kind, None)
+                raise
+            execute("COMMIT")
+            return reserved
+    
+    def release(self, kind: str, names: List[str]):
+        """删除本进程此前登记成功、但最终没有发放的名称
+        
+        Args:
+            kind: 生成类型
+            names: 由 reserve 登记成功的名称
+        """
+        with self._lock:
+            known = self._known.get(kind)
+            execute = self._connection.execute
+            execute("BEGIN IMMEDIATE")
+            try:
+                for name in names:
+                    execute("DELETE FROM names WHERE kind = ? AND name = ?", (kind, name))
+                    if known is not None:
+                        known.discard(name)
+            except BaseException:
+                execute("ROLLBACK")
+                self._known.pop(kind, None)
+                raise
+            execute("COMMIT")
+    
+    def count(self, kind: str) -> int:
+        """获取某类型在数据库中已登记的名称数量"""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM names WHERE kind = ?", (kind,)).fetchone()[0]
+    
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._connection.close()
+
+
+class _GeneratorStats:
+    """按生成类型累计调用次数、生成数量、耗时和稀有度分布"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 生成类型 -> [调用次数, 生成数量, 耗时（秒）, {稀有度: 数量}]
+        self._kinds: Dict[str, List] = {}
+    
+    def record(self, kind: str, results: List, seconds: float):
+        """记录一次生成调用"""
+        rarities = {}
+        for item in results:
+            if isinstance(item, dict):
+                rarity = item.get("rarity")
+                if rarity is not None:
+                    rarities[rarity] = rarities.get(rarity, 0) + 1
+        with self._lock:
+            entry = self._kinds.get(kind)
+            if entry is None:
+                entry = self._kinds[kind] = [0, 0, 0.0, {}]
+            entry[0] += 1
+            entry[1] += len(results)
+            entry[2] += seconds
+            histogram = entry[3]
+            for rarity, count in rarities.items():
+                histogram[rarity] = histogram.get(rarity, 0) + count
+    
+    def snapshot(self) -> Dict[str, Dict]:
+        """返回当前统计数据的副本"""
+        with self._lock:
+            return {
+                kind: {"calls": calls, "names": names, "seconds": seconds, "rarity": dict(histogram)}
+                for kind, (calls, names, seconds, histogram) in self._kinds.items()
+            }
+
+
+class NameRecord(NamedTuple):
+    """紧凑的生成结果，字段与 get_* 方法返回的字典相同"""
+    name: str
+    rarity: Optional[str] = None
+    category: Optional[str] = None
+
+
+def _to_records(items: List) -> List:
+    """把字典结果转换为 NameRecord，字符串结果和已转换的结果保持不变"""
+    return [NameRecord(item["name"], item.get("rarity"), item.get("category")) if isinstance(item, dict) else item
+            for item in items]
+
+
+def _result_fields(item) -> Tuple[str, Optional[str], Optional[str]]:
+    """取出生成结果（字符串、字典或NameRecord）的名称、稀有度和类别"""
+    if isinstance(item, str):
+        return item, None, None
+    if isinstance(item, dict):
+        return item["name"], item.get("rarity"), item.get("category")
+    return item.name, item.rarity, item.category
+
+
+# NameBatch 中表示没有稀有度或类别的编码
+_NO_CODE = 255
+
+
+class NameBatch:
+    """列式存储的生成结果
+    
+    每次追加的名称拼接为一个字符串并以 array('I') 记录各名称的起始偏移，稀有度和类别以单字节编码
+    分别保存在 array('B') 中。稀有度编码为其在 RARITY_LEVELS 中的序号，类别编码为其在
+    categories 中的序号，缺失时为255。按序号访问时返回 NameRecord。
+    """
+    __slots__ = ("rarity_codes", "category_codes", "categories", "_category_codes",
+                 "_texts", "_offsets", "_starts")
+    
+    def __init__(self, items: Iterable = ()):
+        self.rarity_codes = array("B")
+        self.category_codes = array("B")
+        self.categories: List[str] = list(CREATURE_CATEGORY)
+        self._category_codes = {category: code for code, category in enumerate(self.categories)}
+        # 每次追加的名称拼接成的字符串、其中各名称的起止偏移，以及该段第一个结果的序号
+        self._texts: List[str] = []
+        self._offsets: List[array] = []
+        self._starts: List[int] = []
+        self.extend(items)
+    
+    def __len__(self) -> int:
+        return len(self.rarity_codes)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return NameBatch(self[i] for i in range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("NameBatch index out of range")
+        return NameRecord(self.name(index), self.rarity(index), self.category(index))
+    
+    def __iter__(self) -> Iterator[NameRecord]:
+        for index in range(len(self)):
+            yield self[index]
+    
+    @property
+    def names(self) -> List[str]:
+        """全部名称的列表"""
+        names = []
+        for text, offsets in zip(self._texts, self._offsets):
+            names.extend(text[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1))
+        return names
+    
+    def name(self, index: int) -> str:
+        """第index个结果的名称"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("NameBatch index out of range")
+        segment = bisect.bisect_right(self._starts, index) - 1
+        offsets = self._offsets[segment]
+        position = index - self._starts[segment]
+        return self._texts[segment][offsets[position]:offsets[position + 1]]
+    
+    def rarity(self, index: int) -> Optional[str]:
+        """第index个结果的稀有度"""
+        code = self.rarity_codes[index]
+        return None if code == _NO_CODE else RARITY_LEVELS[code]
+    
+    def category(self, index: int) -> Optional[str]:
+        """第index个结果的类别"""
+        code = self.category_codes[index]
+        return None if code == _NO_CODE else self.categories[code]
+    
+    def extend(self, items: Iterable):
+        """追加生成结果，可以是字符串、字典或 NameRecord"""
+        rarity_codes = _RARITY_CODES
+        category_codes = self._category_codes
+        start = len(self)
+        names = []
+        offsets = array("I", [0])
+        position = 0
+        for item in items:
+            name, rarity, category = _result_fields(item)
+            names.append(name)
+            position += len(name)
+            offsets.append(position)
+            self.rarity_codes.append(_NO_CODE if rarity is None else rarity_codes[rarity])
+            if category is None:
+                self.category_codes.append(_NO_CODE)
+                continue
+            code = category_codes.get(category)
+            if code is None:
+                code = category_codes[category] = len(self.categories)
+                self.categories.append(category)
+            self.category_codes.append(code)
+        if names:
+            self._texts.append("".join(names))
+            self._offsets.append(offsets)
+            self._starts.append(start)
+
+
+class _Form(NamedTuple):
+    """名称的一种组成形态，对应生成逻辑中的一个稀有度或风格分支
+    
+    parts 中每一项为 (角色, 词表)，名称由各部分依次各取一个词拼接而成，
+    固定的连接字或由选项指定的值以单元素词表表示。weight 为生成逻辑选中该形态的概率；
+    结果的稀有度不由名称组成决定时，rarity_weights 给出各稀有度的相对概率。
+    """
+    label: str
+    rarity: Optional[str]
+    parts: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    extra: Dict[str, str] = {}
+    weight: float = 1.0
+    rarity_weights: Tuple[Tuple[str, float], ...] = ()
+    
+    @property
+    def size(self) -> int:
+        """该形态可组合出的名称数量"""
+        size = 1
+        for _, words in self.parts:
+            size *= len(words)
+        return size
+
+
+class _FormAutomaton:
+    """由全部名称形态合并而成的确定性自动机，用于精确统计不重复的名称并为其编号
+    
+    每个词表编译为前缀树，剩余部分的词表和输出（稀有度及附加字段）都相同的形态共用后缀，
+    再以子集构造把所有形态合并为按字符转移的确定性自动机。不同形态或不同词组合拼接出的
+    相同字符串在自动机中只有一条路径，因此从各状态出发可接受的字符串数量之和就是不重复名称的数量。
+    从同一状态转移到同一状态的字符归为一组，词尾的单字词通常合为一次转移，状态数只有数百到数千。
+    同一名称能由多个输出不同的形态生成时，取形态顺序中最先出现的输出。
+    """
+    
+    __slots__ = ("forms", "size", "_accept", "_groups", "_offsets", "_counts")
+    
+    def __init__(self, forms: List[_Form]):
+        self.forms = forms
+        tries: Dict[Tuple[str, ...], Tuple[int, List[Dict[str, int]], List[bool]]] = {}
+        # 各形态通常共用同一个词表对象，先按对象查找，省去重复排序
+        tries_by_id: Dict[int, Tuple[Tuple[str, ...], Tuple]] = {}
+        
+        def trie(words: Tuple[str, ...]):
+            cached = tries_by_id.get(id(words))
+            if cached is not None and cached[0] is words:
+                return cached[1]
+            key = tuple(sorted(set(words)))
+            built = tries.get(key)
+            if built is None:
+                children: List[Dict[str, int]] = [{}]
+                terminal = [False]
+                for word in key:
+                    node = 0
+                    for char in word:
+                        child = children[node].get(char)
+                        if child is None:
+                            child = children[node][char] = len(children)
+                            children.append({})
+                            terminal.append(False)
+                        node = child
+                    terminal[node] = True
+                built = tries[key] = (len(tries), children, terminal)
+            tries_by_id[id(words)] = (words, built)
+            return built
+        
+        # 后缀表: (词表前缀树, 下一个后缀) 或接受时的 (None, 输出形态序号)
+        suffixes: List[Tuple[Optional[Tuple], int]] = []
+        suffix_ids: Dict[Tuple, int] = {}
+        
+        def suffix(parts, output: int) -> int:
+            key = (tuple(trie(words)[0] for _, words in parts), output)
+            index = suffix_ids.get(key)
+            if index is None:
+                entry = (trie(parts[0][1]), suffix(parts[1:], output)) if parts else (None, output)
+                index = suffix_ids[key] = len(suffixes)
+                suffixes.append(entry)
+            return index
+        
+        outputs: Dict[Tuple, int] = {}
+        starts = []
+        for index, form in enumerate(forms):
+            output = outputs.setdefault((form.rarity, tuple(sorted(form.extra.items()))), index)
+            starts.append((suffix(form.parts, output), 0))
+        
+        def closure(items) -> frozenset:
+            """加入词尾之后的下一部分起点，去掉不再有转移的叶子节点"""
+            result = set()
+            stack = list(items)
+            while stack:
+                item = stack.pop()
+                if item in result:
+                    continue
+                tree, following = suffixes[item[0]]
+                if tree is not None:
+                    if tree[2][item[1]]:
+                        stack.append((following, 0))
+                    if not tree[1][item[1]]:
+                        continue
+                result.add(item)
+            return frozenset(result)
+        
+        start = closure(starts)
+        states = {start: 0}
+        order = [start]
+        accept: List[int] = []
+        groups: List[List[Tuple[str, int]]] = []
+        position = 0
+        while position < len(order):
+            accepted = -1
+            # 位于同一前缀树同一节点的后缀转移相同，按节点分组后每个字符只需查一次
+            nodes: Dict[Tuple[int, int], Tuple[Tuple, int, List[int]]] = {}
+            for suffix_index, node in order[position]:
+                tree, following = suffixes[suffix_index]
+                if tree is None:
+                    if accepted < 0 or following < accepted:
+                        accepted = following
+                    continue
+                entry = nodes.get((tree[0], node))
+                if entry is None:
+                    entry = nodes[(tree[0], node)] = (tree, node, [])
+                entry[2].append(suffix_index)
+            entries = list(nodes.values())
+            signatures: Dict[str, List[Tuple[int, int]]] = {}
+            for entry_index, (tree, node, _) in enumerate(entries):
+                children = tree[1]
+                for char, child in children[node].items():
+                    # 叶子节点之后只剩下一部分的起点，不同字符的叶子转移相同
+                    signatures.setdefault(char, []).append((entry_index, child if children[child] else -1))
+            classes: Dict[Tuple, List[str]] = {}
+            for char, signature in signatures.items():
+                classes.setdefault(tuple(signature), []).append(char)
+            transitions = []
+            for chars in classes.values():
+                char = chars[0]
+                target = closure((suffix_index, tree[1][node][char])
+                                 for tree, node, suffix_indexes in (entries[i] for i, _ in signatures[char])
+                                 for suffix_index in suffix_indexes)
+                target_index = states.get(target)
+                if target_index is None:
+                    target_index = states[target] = len(order)
+                    order.append(target)
+                transitions.append(("".join(sorted(chars)), target_index))
+            transitions.sort()
+            accept.append(accepted)
+            groups.append(transitions)
+            position += 1
+        
+        # 按后序计算每个状态之后可接受的字符串数量
+        counts = [0] * len(order)
+        done = [False] * len(order)
+        for root in range(len(order)):
+            stack = [(root, False)]
+            while stack:
+                state, expanded = stack.pop()
+                if done[state]:
+                    continue
+                if expanded:
+                    counts[state] = (accept[state] >= 0) + sum(
+                        len(chars) * counts[target] for chars, target in groups[state])
+                    done[state] = True
+                else:
+                    stack.append((state, True))
+                    stack.extend((target, False) for _, target in groups[state] if not done[target])
+        
+        offsets = []
+        for state, transitions in enumerate(groups):
+            total = int(accept[state] >= 0)
+            starts_at = []
+            for chars, target in transitions:
+                starts_at.append(total)
+                total += len(chars) * counts[target]
+            offsets.append(starts_at)
+        
+        self.size = counts[0]
+        self._accept = accept
+        self._groups = groups
+        self._offsets = offsets
+        self._counts = counts
+    
+    def decode(self, index: int) -> Tuple[str, _Form]:
+        """把 [0, size) 内的整数映射为名称及生成它的形态，不同整数得到不同的名称"""
+        chars = []
+        state = 0
+        while True:
+            if index == 0 and self._accept[state] >= 0:
+                return "".join(chars), self.forms[self._accept[state]]
+            # 序号0留给在此结束的名称，之后依次是各组字符开头的名称
+            offsets = self._offsets[state]
+            group = bisect.bisect_right(offsets, index) - 1
+            group_chars, target = self._groups[state][group]
+            digit, index = divmod(index - offsets[group], self._counts[target])
+            chars.append(group_chars[digit])
+            state = target
+
+def _options_key(options) -> str:
+    """把选项转换为可作为缓存键的字符串"""
+    return json.dumps(options, sort_keys=True, ensure_ascii=False, default=str)
+
+
+# 长度和字符约束选项，指定任一项时生成方法改为在满足约束的组合中直接抽样
+_CONSTRAINT_KEYS = frozenset(("nameLength", "maxLength", "requiredChars", "forbiddenChars"))
+
+
+def _rarity_probabilities(max_value: float = 1.0) -> Dict[str, float]:
+    """_get_rarity(max_value) 得到各稀有度的概率"""
+    probabilities = {}
+    lower = 0.0
+    for rarity in _RARITY_BY_THRESHOLD:
+        upper = RARITY_VALUES[rarity]
+        probabilities[rarity] = max(0.0, min(upper, max_value) - lower) / max_value
+        lower = upper
+    return probabilities
+
+
+def _generator_method(kind: str):
+    """标记 get_* 生成方法
+    
+    未启用唯一性模式、紧凑结果和统计时直接调用原方法；启用唯一性模式后过滤已生成过的名称并
+    自动补足数量，启用统计后记录调用次数、耗时和稀有度分布，启用紧凑结果后把字典转换为 NameRecord。
+    选项中包含长度或字符约束时改由 _generate_constrained 生成。
+    
+    Args:
+        kind: 生成类型，取值见 GENERATOR_KINDS
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, number: int = 1, *args, **kwargs):
+            options = None
+            if args or kwargs:
+                options = args[0] if args else next(iter(kwargs.values()))
+            if type(options) is dict and not _CONSTRAINT_KEYS.isdisjoint(options):
+                produce = functools.partial(self._generate_constrained, kind, options=options)
+            elif not (self.unique or self.records or self._stats or self._blocklist or self._registry
+                      or self.unique_pinyin):
+                return method(self, number, *args, **kwargs)
+            else:
+                produce = lambda count: method(self, count, *args, **kwargs)
+            started = time.perf_counter()
+            if self._filtering():
+                results = self._generate_admitted(kind, produce, number, options)
+            else:
+                results = produce(number)
+            if self._stats is not None:
+                self._stats.record(kind, results, time.perf_counter() - started)
+            if self.records:
+                results = _to_records(results)
+            return results
+        return wrapper
+    return decorate
+
+
+# 进程内共享的生成器实例: (类, 数据路径, 是否数据包) -> [实例, 上次检查时间]
+_SHARED_GENERATORS: Dict[Tuple, List] = {}
+_SHARED_LOCK = threading.Lock()
+
+
 class XiuXianNameGenerator:
-    def __init__(self, data_dir: str = ""):
+    def __init__(self, data_dir: str = "", lazy: bool = False, bundle: Optional[str] = None,
+                 seed: Optional[int] = None, rng: Optional[random.Random] = None,
+                 unique: bool = False, stats: bool = False, records: bool = False,
+                 blocklist: Union[str, Iterable[str], None] = None, registry: Optional[str] = None,
+                 unique_pinyin: bool = False):
         """初始化修仙名称生成器
         
         Args:
             data_dir: 数据文件目录路径
+            lazy: 是否懒加载，为True时各数据文件和词池在首次使用时才加载，
+                  适合只调用少数生成方法的短生命周期进程
+            bundle: 由 compile_bundle 编译的数据包路径，指定时通过内存映射读取数据包，
+                    不再读取data_dir下的JSON文件，词池在首次使用时才构建
+            seed: 随机种子，指定时使用独立的随机数生成器，结果可复现
+            rng: 自定义的随机数生成器（random.Random实例），优先于seed；
+                 两者都未指定时沿用全局random模块
+            unique: 是否启用唯一性模式，启用后同一类型的名称在本实例（及其派生实例）中不会重复
+            stats: 是否启用统计，启用后记录各生成方法的调用次数、生成数量、耗时和稀有度分布
+            records: 是否返回紧凑结果，启用后返回字典的生成方法改为返回 NameRecord
+            blocklist: 屏蔽词文件路径（每行一个）或屏蔽词序列，指定时加载数据时移除包含屏蔽词的词语，
+                       并丢弃由多个词拼接后才出现屏蔽词的名称
+            registry: SQLite名称登记库的路径，指定时每个名称在登记库中登记成功后才会返回，
+                      共用同一登记库的所有进程不会发放相同类型的同一个名称
+            unique_pinyin: 是否拒绝读音重复的名称，启用后同一类型中不带声调的拼音
+                           与此前生成过的名称相同的结果会被丢弃并补足
         """
-        self.data_dir = data_dir
+        self.seed = seed
+        self._root_seed = seed
+        if rng is not None:
+            self._rng = rng
+        elif seed is not None:
+            self._rng = random.Random(seed)
+        else:
+            self._rng = random
+        self.unique = unique
+        self.unique_pinyin = unique_pinyin
+        self.unique_retries = 1000
+        self.records = records
+        self._seen: Dict[str, _SeenSet] = {}
+        self._seen_pinyin: Dict[str, _SeenSet] = {}
+        self._seen_lock = threading.Lock()
+        self._stats: Optional[_GeneratorStats] = _GeneratorStats() if stats else None
+        self._blocklist = _Blocklist.load(blocklist) if blocklist else None
+        self._registry = _NameRegistry(registry) if registry else None
+        # 解析为绝对路径，之后切换工作目录不影响懒加载、reload 和并行工作进程读取数据
+        self.data_dir = os.path.abspath(data_dir)
+        self.lazy = lazy
+        self.bundle = os.path.abspath(bundle) if bundle else None
+        # 在读取之前记录签名，读取期间被修改的文件会在下次 reload 时重新加载
+        self._signature = _data_signature(data_dir, bundle)
         self.data = self._load_data()
-        self._validate_data()
+        if not lazy:
+            self._validate_data()
+        self.rebuild_pools()
+        
+    @classmethod
+    def shared(cls, data_dir: str = "", bundle: Optional[str] = None,
+               check_interval: float = 1.0) -> "XiuXianNameGenerator":
+        """获取进程内共享的生成器实例
+        
+        同一数据目录（或数据包）只加载一次，后续调用直接返回缓存的实例；
+        数据文件的修改时间或大小变化后通过 reload 换用只重新加载了变化文件的新实例。
+        可在多线程中安全调用。
+        
+        Args:
+            data_dir: 数据文件目录路径
+            bundle: 数据包路径，指定时以数据包为准
+            check_interval: 检查数据文件是否变化的最小间隔（秒），为0时每次调用都检查
+        
+        Returns:
+            共享的生成器实例
+        """
+        source = os.path.realpath(bundle or data_dir)
+        key = (cls, source, bool(bundle))
+        now = time.monotonic()
+        
+        with _SHARED_LOCK:
+            entry = _SHARED_GENERATORS.get(key)
+            if entry is None:
+                generator = cls(bundle=source) if bundle else cls(source)
+                entry = _SHARED_GENERATORS[key] = [generator, now]
+            elif now - entry[1] >= check_interval:
+                entry[0] = entry[0].reload()
+                entry[1] = now
+            return entry[0]
+    
+    def spawn(self, *key) -> "XiuXianNameGenerator":
+        """派生使用独立随机流的子生成器
+        
+        子生成器与当前实例共享已加载的数据和词池，随机流由根种子和分片键
+        经哈希派生，同一种子和键总是得到相同的结果，不同的键互不重叠。
+        适合为每个线程或工作分片分配可复现的随机流。
         
+        Args:
+            key: 分片键，例如分片序号
+        
+        Returns:
+            新的生成器实例
+        """
+        return self._with_seed(_derive_seed(self._stream_root(), *key))
+    
+    def _with_seed(self, seed: int) -> "XiuXianNameGenerator":
+        """复制当前实例并改用以seed初始化的随机流"""
+        child = copy.copy(self)
+        child.seed = child._root_seed = seed
+        child._rng = random.Random(seed)
+        return child
+    
+    def _stream_root(self) -> int:
+        """获取派生子随机流所用的根种子，未指定种子时从当前随机流抽取一次"""
+        if self._root_seed is None:
+            self._root_seed = self._rng.getrandbits(64)
+        return self._root_seed
+    
     def _load_data(self) -> Dict[str, Any]:
-        """加载所有JSON数据文件"""
+        """加载所有JSON数据文件，懒加载模式下返回按需加载的数据字典"""
+        if self.bundle:
+            data, self._bundle_map = _load_bundle(self.bundle)
+            if self._blocklist is not None:
+                data = {key: value if key == "pinyin" else self._blocklist.prune(value, key)
+                        for key, value in data.items()}
+            return data
+        if self.lazy:
+            return _LazyData(self._load_data_item)
+        
         data = {}
+        for key in _DATA_FILES:
+            data[key] = self._load_json_file(_DATA_FILES[key])
+        return data
+    
+    def _load_data_item(self, key: str) -> Any:
+        """按需加载单个数据项并检查其完整性
         
-        # 加载共享数据
-        data["common"] = self._load_json_file("shared/common.json")
-        data["strange"] = self._load_json_file("shared/strange.json")
-        data["color"] = self._load_json_file("shared/color.json")
-        data["spirit"] = self._load_json_file("shared/spirit.json")
-        
-        # 加载人名数据
-        data["family"] = self._load_json_file("name/family.json")
-        data["female"] = self._load_json_file("name/female.json")
-        data["male"] = self._load_json_file("name/male.json")
-        data["middle"] = self._load_json_file("name/middle.json")
-        
-        # 加载道号数据
-        data["dao"] = self._load_json_file("dao/dao.json")
-        data["dao_title_male"] = self._load_json_file("dao/title_male.json")
-        data["dao_title_female"] = self._load_json_file("dao/title_female.json")
-        
-        # 加载技能数据
-        data["skill"] = self._load_json_file("skill/skill.json")
-        data["skill_prefix"] = self._load_json_file("skill/prefix.json")
-        data["skill_numfix"] = self._load_json_file("skill/numfix.json")
-        
-        # 加载书籍数据
-        data["book"] = self._load_json_file("book/book.json")
-        data["book_prefix"] = self._load_json_file("book/prefix.json")
-        data["book_postfix"] = self._load_json_file("book/postfix.json")
-        
-        # 加载符箓数据
-        data["talisman"] = self._load_json_file("talisman/talisman.json")
-        data["talisman_material"] = self._load_json_file("talisman/material.json")
-        data["talisman_postfix"] = self._load_json_file("talisman/postfix.json")
-        
-        # 加载组织数据
-        data["clan"] = self._load_json_file("organization/clan.json")
-        data["nation"] = self._load_json_file("organization/nation.json")
-        
-        # 加载地点数据
-        data["place"] = self._load_json_file("place/place.json")
-        data["place_prefix"] = self._load_json_file("place/prefix.json")
-        data["place_postfix"] = self._load_json_file("place/postfix.json")
-        data["location"] = self._load_json_file("place/location.json")
-        data["zone"] = self._load_json_file("place/zone.json")
-        
-        # 加载材料数据
-        data["material"] = self._load_json_file("material/material.json")
-        data["material_postfix"] = self._load_json_file("material/postfix.json")
-        
-        # 加载生物数据
-        data["creature"] = self._load_json_file("creature/creature.json")
-        data["creature_prefix"] = self._load_json_file("creature/prefix.json")
-        data["strange_creature"] = self._load_json_file("creature/strange.json")
-        
-        # 加载丹药数据
-        data["alchemy"] = self._load_json_file("alchemy/alchemy.json")
+        Args:
+            key: 数据键，取值见 _DATA_FILES
         
-        return data
+        Returns:
+            加载的JSON数据
+        """
+        value = self._load_json_file(_DATA_FILES[key])
+        if not value:
+            print(f"警告: 以下数据不完整或缺失: {key}")
+        return value
     
     def _load_json_file(self, file_path: str) -> Any:
-        """加载单个JSON文件
+        """加载单个JSON文件，指定了屏蔽词时移除包含屏蔽词的词语
         
         Args:
             file_path: 相对于data_dir的文件路径
@@ -160,38 +1430,89 @@ class XiuXianNameGenerator:
         full_path = os.path.join(self.data_dir, file_path)
         try:
             with open(full_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                value = json.load(f)
         except Exception as e:
             print(f"无法加载 {full_path}: {e}")
             return {} if file_path.endswith(".json") else []
+        # 拼音表是查询表而不是词表，不移除屏蔽词
+        if self._blocklist is not None and file_path != _DATA_FILES["pinyin"]:
+            value = self._blocklist.prune(value, file_path)
+        return value
     
     def _validate_data(self):
         """验证加载的数据是否完整有效"""
-        required_data = [
-            "common", "strange", "color", "spirit", 
-            "family", "female", "male", "middle",
-            "dao", "dao_title_male", "dao_title_female",
-            "skill", "skill_prefix", "skill_numfix",
-            "book", "book_prefix", "book_postfix",
-            "talisman", "talisman_material", "talisman_postfix",
-            "clan", "nation",
-            "place", "place_prefix", "place_postfix", "location", "zone",
-            "material", "material_postfix",
-            "creature", "creature_prefix", "strange_creature",
-            "alchemy"
-        ]
         missing = []
-        for item in required_data:
+        for item in _DATA_FILES:
             if not self.data.get(item):
                 missing.append(item)
         
         if missing:
             print(f"警告: 以下数据不完整或缺失: {', '.join(missing)}")
     
-    @property
-    def dao_titles(self) -> List[str]:
-        """获取所有道号称号列表"""
-        titles = []
+    def rebuild_pools(self):
+        """根据当前数据重建预编译词池
+        
+        词池在初始化时构建一次（懒加载和数据包模式下在首次使用时构建，
+        数据包模式下构建词池需要逐个解码词语，预先构建反而拖慢启动；
+        拼音索引只在 pinyin 和拒绝同音名称时使用，总是在首次使用时构建），
+        直接修改 data 后需调用此方法使改动生效。
+        """
+        self._pools = _PoolCache(self.data)
+        if not (self.lazy or self.bundle):
+            for key in _POOL_BUILDERS.keys() - _DEFERRED_POOLS:
+                self._pools[key]
+        self._bulk_pools = {}
+        self._forms = {}
+    
+    def reload(self) -> "XiuXianNameGenerator":
+        """重新加载修改时间或大小发生变化的数据文件
+        
+        不修改当前实例，而是返回一个只重新读取了变化文件、只重建了依赖这些文件的词池的新实例，
+        其余数据和词池与当前实例共享。正在当前实例上执行的生成调用始终使用旧的数据，
+        调用方用新实例替换对旧实例的引用即可原子地切换。新实例共享随机流、唯一性记录和统计。
+        数据包模式下数据包变化时重新映射整个数据包。
+        
+        Returns:
+            数据没有变化时返回当前实例，否则返回新实例
+        """
+        signature = _data_signature(self.data_dir, self.bundle)
+        changed = {key for key, value in signature.items() if self._signature.get(key) != value}
+        if not changed:
+            return self
+        
+        child = copy.copy(self)
+        child._signature = signature
+        if self.bundle:
+            child.data = child._load_data()
+            child.rebuild_pools()
+            return child
+        
+        if self.lazy:
+            data = _LazyData(child._load_data_item)
+            data.update((key, value) for key, value in dict.items(self.data) if key not in changed)
+        else:
+            data = dict(self.data)
+            for key in changed:
+                data[key] = child._load_json_file(_DATA_FILES[key])
+        child.data = data
+        if not self.lazy:
+            child._validate_data()
+        
+        child._pools = _PoolCache(data)
+        for key, pool in dict.items(self._pools):
+            if changed.isdisjoint(_POOL_SOURCES[key]):
+                child._pools[key] = pool
+        if not self.lazy:
+            for key in _POOL_BUILDERS.keys() - _DEFERRED_POOLS:
+                child._pools[key]
+        child._bulk_pools = {}
+        child._forms = {}
+        return child
+    
+    @property
+    def dao_titles(self) -> List[str]:
+        """获取所有道号称号列表"""
+        titles = []
         for gender in ["dao_title_male", "dao_title_female"]:
             for rarity in RARITY_LEVELS:
                 if gender in self.data and rarity in self.data[gender]:
@@ -252,6 +1573,11 @@ class XiuXianNameGenerator:
                 kinds.extend(self.data["zone"][category])
         return kinds
     
+    @property
+    def continent_kind(self) -> List[str]:
+        """获取所有大陆类型列表"""
+        return list(self.data.get("continent") or [])
+    
     @property
     def book_postfixes(self) -> List[str]:
         """获取所有书籍后缀列表"""
@@ -270,23 +1596,11 @@ class XiuXianNameGenerator:
         Returns:
             包含稀有度和随机值的字典
         """
-        value = random.random() * (max_value or 1.0)
-        if value < RARITY_VALUES["exotic"]:
-            rarity = "exotic"
-        elif value < RARITY_VALUES["mythic"]:
-            rarity = "mythic"
-        elif value < RARITY_VALUES["legendary"]:
-            rarity = "legendary"
-        elif value < RARITY_VALUES["epic"]:
-            rarity = "epic"
-        elif value < RARITY_VALUES["rare"]:
-            rarity = "rare"
-        elif value < RARITY_VALUES["uncommon"]:
-            rarity = "uncommon"
-        else:
-            rarity = "common"
+        value = self._rng.random() * (max_value or 1.0)
+        rarity = _RARITY_BY_THRESHOLD[bisect.bisect_right(_RARITY_THRESHOLDS, value)]
         return {"rarity": rarity, "value": value}
     
+    @_generator_method("name")
     def get_name(self, number: int = 1, options: Dict = None) -> List[str]:
         """生成人名
         
@@ -308,13 +1622,13 @@ class XiuXianNameGenerator:
             if options.get("familyName"):
                 the_family_name = options["familyName"]
             else:
-                family_index = random.randint(0, len(self.data["family"]) - 1)
+                family_index = self._rng.randint(0, len(self.data["family"]) - 1)
                 the_family_name = self.data["family"][family_index]
             
-            is_female = options.get("isFemale", random.randint(0, 1) == 0)
+            is_female = options.get("isFemale", self._rng.randint(0, 1) == 0)
             names_of_a_sex = self.data["female"] if is_female else self.data["male"]
             
-            r = random.random()
+            r = self._rng.random()
             style = options.get("style")
             if not style:
                 if r < 0.33333333:
@@ -329,26 +1643,26 @@ class XiuXianNameGenerator:
                 if options.get("middleCharacter"):
                     name = options["middleCharacter"]
                 else:
-                    name_index = random.randint(0, len(names_of_a_sex) - 1)
+                    name_index = self._rng.randint(0, len(names_of_a_sex) - 1)
                     name = names_of_a_sex[name_index]
             elif style == "double":
                 if options.get("middleCharacter"):
                     the_middle_character = options["middleCharacter"]
                 else:
-                    name_index = random.randint(0, len(names_of_a_sex) - 1)
+                    name_index = self._rng.randint(0, len(names_of_a_sex) - 1)
                     the_middle_character = names_of_a_sex[name_index]
                 
-                name_index = random.randint(0, len(names_of_a_sex) - 1)
+                name_index = self._rng.randint(0, len(names_of_a_sex) - 1)
                 the_last_character = names_of_a_sex[name_index]
                 name = the_middle_character + the_last_character
             else:
                 if options.get("middleCharacter"):
                     the_middle_character = options["middleCharacter"]
                 else:
-                    name_index = random.randint(0, len(self.data["middle"]) - 1)
+                    name_index = self._rng.randint(0, len(self.data["middle"]) - 1)
                     the_middle_character = self.data["middle"][name_index]
                 
-                name_index = random.randint(0, len(names_of_a_sex) - 1)
+                name_index = self._rng.randint(0, len(names_of_a_sex) - 1)
                 the_last_character = names_of_a_sex[name_index]
                 name = the_middle_character + the_last_character
             
@@ -356,6 +1670,7 @@ class XiuXianNameGenerator:
         
         return names
     
+    @_generator_method("dao")
     def get_dao(self, number: int = 1, options: Dict = None) -> List[Dict]:
         """生成道号
         
@@ -376,14 +1691,14 @@ class XiuXianNameGenerator:
             if options.get("firstCharacter"):
                 the_first_character = options["firstCharacter"]
             else:
-                name_index1 = random.randint(0, len(self.data["dao"]) - 1)
+                name_index1 = self._rng.randint(0, len(self.data["dao"]) - 1)
                 the_first_character = self.data["dao"][name_index1]
             
-            name_index2 = random.randint(0, len(self.data["dao"]) - 1)
+            name_index2 = self._rng.randint(0, len(self.data["dao"]) - 1)
             name = the_first_character + self.data["dao"][name_index2]
             
-            is_female = options.get("isFemale", random.randint(0, 1) == 0)
-            title_group = self.data["dao_title_female"] if is_female else self.data["dao_title_male"]
+            is_female = options.get("isFemale", self._rng.randint(0, 1) == 0)
+            gender = "dao_title_female" if is_female else "dao_title_male"
             
             t = options.get("title", "")
             rarity = "common"
@@ -392,36 +1707,28 @@ class XiuXianNameGenerator:
                 rarity_info = self._get_rarity()
                 rarity = rarity_info["rarity"]
                 
-                if rarity == "exotic" and title_group.get("exotic"):
-                    t = random.choice(title_group["exotic"])
-                elif rarity == "mythic" and title_group.get("mythic"):
-                    t = random.choice(title_group["mythic"])
-                elif rarity == "legendary" and title_group.get("legendary"):
-                    t = random.choice(title_group["legendary"])
-                elif rarity == "epic" and title_group.get("epic"):
-                    t = random.choice(title_group["epic"])
-                elif rarity == "rare" and title_group.get("rare"):
-                    t = random.choice(title_group["rare"])
-                elif rarity == "uncommon" and title_group.get("uncommon"):
-                    t = random.choice(title_group["uncommon"])
+                titles = self.data[gender].get(rarity) if rarity != "common" else None
+                if titles:
+                    t = self._rng.choice(titles)
             else:
-                if t in (title_group.get("exotic", []) + self.data["dao_title_male"].get("exotic", [])):
-                    rarity = "exotic"
-                elif t in (title_group.get("mythic", []) + self.data["dao_title_male"].get("mythic", [])):
-                    rarity = "mythic"
-                elif t in (title_group.get("legendary", []) + self.data["dao_title_male"].get("legendary", [])):
-                    rarity = "legendary"
-                elif t in (title_group.get("epic", []) + self.data["dao_title_male"].get("epic", [])):
-                    rarity = "epic"
-                elif t in (title_group.get("rare", []) + self.data["dao_title_male"].get("rare", [])):
-                    rarity = "rare"
-                elif t in (title_group.get("uncommon", []) + self.data["dao_title_male"].get("uncommon", [])):
-                    rarity = "uncommon"
+                rarity = self._dao_title_rarity(t, gender)
             
             names.append({"name": name + t, "rarity": rarity})
         
         return names
     
+    def _dao_title_rarity(self, title: str, gender: str) -> str:
+        """推断指定称号的稀有度
+        
+        Args:
+            title: 称号
+            gender: 称号分组的数据键，dao_title_female 或 dao_title_male
+        
+        Returns:
+            称号所属的稀有度，未找到时为common
+        """
+        return self._pools["dao_title_rarity"][gender].get(title, "common")
+    
     def _get_skill_name(self, length: Optional[int] = None, kind: Optional[str] = None, 
                        prefix: Optional[str] = None, numfix: Optional[str] = None) -> Dict:
         """生成单个技能名称
@@ -451,27 +1758,22 @@ class XiuXianNameGenerator:
             elif length > 1:
                 rarity = "uncommon"
 
-        common = []
-        for category in ["dao", "element", "creature", "thing", "color", "place", 
-                         "adj", "number", "gesture", "action"]:
-            if category in self.data.get("common", {}):
-                common.extend(self.data["common"][category])
-        
+        common = self._pools["skill_common"]
         name = ""
         for _ in range(l):
-            name += random.choice(common)
+            name += self._rng.choice(common)
         
         pre = prefix or ""
-        if not pre and random.random() < RARITY_VALUES["epic"]:
-            pre = random.choice(self.data["skill_prefix"])
+        if not pre and self._rng.random() < RARITY_VALUES["epic"]:
+            pre = self._rng.choice(self.data["skill_prefix"])
         
         n = numfix or ""
-        if not n and random.random() < RARITY_VALUES["epic"]:
-            n = random.choice(self.data["skill_numfix"])
+        if not n and self._rng.random() < RARITY_VALUES["epic"]:
+            n = self._rng.choice(self.data["skill_numfix"])
         
-        k = kind or random.choice(self.data["skill"])
+        k = kind or self._rng.choice(self.data["skill"])
         
-        if random.random() < 0.5:
+        if self._rng.random() < 0.5:
             name = (n + _NUMBER_BEGIN_SUPPLEMENT if n else "") + pre + name + k
         else:
             if len(k) > 1:
@@ -481,6 +1783,7 @@ class XiuXianNameGenerator:
         
         return {"name": name, "rarity": rarity}
     
+    @_generator_method("skill")
     def get_skill(self, number: int = 1, options: Dict = None) -> List[Dict]:
         """生成功法名称
         
@@ -509,6 +1812,7 @@ class XiuXianNameGenerator:
         
         return names
     
+    @_generator_method("book")
     def get_book(self, number: int = 1, options: Dict = None) -> List[Dict]:
         """生成秘籍名称
         
@@ -532,28 +1836,21 @@ class XiuXianNameGenerator:
             rarity = skillname["rarity"]
             
             pre = options.get("prefix", "")
-            if not pre:
-                if rarity == "exotic" and "exotic" in self.data["book_prefix"]:
-                    pre = random.choice(self.data["book_prefix"]["exotic"])
-                elif rarity == "mythic" and "mythic" in self.data["book_prefix"]:
-                    pre = random.choice(self.data["book_prefix"]["mythic"])
-                elif rarity == "legendary" and "legendary" in self.data["book_prefix"]:
-                    pre = random.choice(self.data["book_prefix"]["legendary"])
-                elif rarity == "epic" and "epic" in self.data["book_prefix"]:
-                    pre = random.choice(self.data["book_prefix"]["epic"])
+            if not pre and rarity in _BOOK_PREFIX_RARITIES and rarity in self.data["book_prefix"]:
+                pre = self._rng.choice(self.data["book_prefix"][rarity])
             
             pk = options.get("postkind", "")
             if pre and not pk:
-                pk = random.choice(self.data["book"])
+                pk = self._rng.choice(self.data["book"])
             
             post = options.get("postfix", "")
             if not post:
-                r1 = random.random()
-                r2 = random.random()
+                r1 = self._rng.random()
+                r2 = self._rng.random()
                 if r1 < RARITY_VALUES["rare"] and r2 < RARITY_VALUES["rare"] and "rare" in self.data["book_postfix"]:
-                    post = _PARENTHESIS_LEFT + random.choice(self.data["book_postfix"]["rare"]) + _PARENTHESIS_RIGHT
+                    post = _PARENTHESIS_LEFT + self._rng.choice(self.data["book_postfix"]["rare"]) + _PARENTHESIS_RIGHT
                 elif r1 < RARITY_VALUES["uncommon"] and r2 < RARITY_VALUES["uncommon"] and "uncommon" in self.data["book_postfix"]:
-                    post = _PARENTHESIS_LEFT + random.choice(self.data["book_postfix"]["uncommon"]) + _PARENTHESIS_RIGHT
+                    post = _PARENTHESIS_LEFT + self._rng.choice(self.data["book_postfix"]["uncommon"]) + _PARENTHESIS_RIGHT
             else:
                 post = _PARENTHESIS_LEFT + post + _PARENTHESIS_RIGHT
             
@@ -564,6 +1861,7 @@ class XiuXianNameGenerator:
         
         return names
     
+    @_generator_method("creature")
     def get_creature(self, number: int = 1, options: Dict = None) -> List[Dict]:
         """生成生灵名称
         
@@ -578,26 +1876,23 @@ class XiuXianNameGenerator:
         """
         options = options or {}
         names = []
-        common_creature_names = []
-        for category in ["dao", "element", "thing", "color", "number", "action"]:
-            if category in self.data.get("common", {}):
-                common_creature_names.extend(self.data["common"][category])
+        common_creature_names = self._pools["creature_common"]
         
         for _ in range(number):
             name = ""
-            pre = random.choice(common_creature_names)
-            c = random.choice(self.data["color"])
-            s = random.choice(self.data["creature_prefix"])
+            pre = self._rng.choice(common_creature_names)
+            c = self._rng.choice(self.data["color"])
+            s = self._rng.choice(self.data["creature_prefix"])
             
             cat = options.get("category")
             if not cat:
-                cat = random.choice(CREATURE_CATEGORY)
+                cat = self._rng.choice(CREATURE_CATEGORY)
             
-            k = random.choice(self.data["creature"][cat])
+            k = self._rng.choice(self.data["creature"][cat])
             r = options.get("rarity") or self._get_rarity(RARITY_VALUES["uncommon"])["rarity"]
             
             if r == "exotic":
-                name = random.choice(self.data["strange_creature"])
+                name = self._rng.choice(self.data["strange_creature"])
             elif r == "mythic":
                 name = pre + c + s + k
             elif r == "legendary":
@@ -615,6 +1910,7 @@ class XiuXianNameGenerator:
         
         return names
     
+    @_generator_method("material")
     def get_material(self, number: int = 1, options: Dict = None) -> List[Dict]:
         """生成材料名称
         
@@ -630,88 +1926,58 @@ class XiuXianNameGenerator:
         """
         options = options or {}
         names = []
-        common = []
-        for category in self.data.get("common", {}):
-            common.extend(self.data["common"][category])
+        common = self._pools["common"]
+        tiers = self._pools["material_tiers"]
         
         for _ in range(number):
             name = ""
             age = ""
-            pre = random.choice(common)
-            c = random.choice(self.data["color"])
-            s = random.choice(self.data["spirit"])
+            pre = self._rng.choice(common)
+            c = self._rng.choice(self.data["color"])
+            s = self._rng.choice(self.data["spirit"])
             
             k = options.get("kind")
             r = options.get("rarity") or self._get_rarity(RARITY_VALUES["uncommon"])["rarity"]
             
             if r == "exotic":
-                all_materials = []
-                for rarity_level in RARITY_LEVELS:
-                    if rarity_level in self.data["material"]:
-                        all_materials.extend(self.data["material"][rarity_level])
-                k = k or random.choice(all_materials)
+                k = k or self._rng.choice(tiers["exotic"])
                 age = _AGE100
                 name = age + pre + c + s + k
             elif r == "mythic":
-                materials = []
-                for rarity_level in RARITY_LEVELS:
-                    if rarity_level in ["mythic", "legendary", "epic", "rare", "uncommon", "common"]:
-                        if rarity_level in self.data["material"]:
-                            materials.extend(self.data["material"][rarity_level])
-                k = k or random.choice(materials)
+                k = k or self._rng.choice(tiers["mythic"])
                 age = _AGE10
                 name = age + pre + c + s + k
             elif r == "legendary":
-                materials = []
-                for rarity_level in RARITY_LEVELS:
-                    if rarity_level in ["legendary", "epic", "rare", "uncommon", "common"]:
-                        if rarity_level in self.data["material"]:
-                            materials.extend(self.data["material"][rarity_level])
-                k = k or random.choice(materials)
+                k = k or self._rng.choice(tiers["legendary"])
                 age = _AGE1
                 name = age + pre + c + s + k
             elif r == "epic":
-                materials = []
-                for rarity_level in RARITY_LEVELS:
-                    if rarity_level in ["epic", "rare", "uncommon", "common"]:
-                        if rarity_level in self.data["material"]:
-                            materials.extend(self.data["material"][rarity_level])
-                k = k or random.choice(materials)
+                k = k or self._rng.choice(tiers["epic"])
                 name = pre + c + s + k
             elif r == "rare":
-                materials = []
-                for rarity_level in RARITY_LEVELS:
-                    if rarity_level in ["rare", "uncommon", "common"]:
-                        if rarity_level in self.data["material"]:
-                            materials.extend(self.data["material"][rarity_level])
-                k = k or random.choice(materials)
+                k = k or self._rng.choice(tiers["rare"])
                 name = pre + s + k
             elif r == "uncommon":
-                materials = []
-                for rarity_level in RARITY_LEVELS:
-                    if rarity_level in ["uncommon", "common"]:
-                        if rarity_level in self.data["material"]:
-                            materials.extend(self.data["material"][rarity_level])
-                k = k or random.choice(materials)
+                k = k or self._rng.choice(tiers["uncommon"])
                 name = c + s + k
             elif r == "common":
-                if "common" in self.data["material"]:
-                    k = k or random.choice(self.data["material"]["common"])
+                if tiers["common"]:
+                    k = k or self._rng.choice(tiers["common"])
                 name = c + k
             
             post = options.get("postfix", "")
             if not post:
-                r1 = random.random()
-                r2 = random.random()
+                r1 = self._rng.random()
+                r2 = self._rng.random()
                 if (r1 < RARITY_VALUES["rare"] and r2 < RARITY_VALUES["rare"] and 
                     "broken" in self.data["material_postfix"]):
                     post = (_PARENTHESIS_LEFT + 
-                           random.choice(self.data["material_postfix"]["broken"]) + 
+                           self._rng.choice(self.data["material_postfix"]["broken"]) + 
                            _PARENTHESIS_RIGHT)
                 elif (r1 < RARITY_VALUES["uncommon"] and r2 < RARITY_VALUES["uncommon"] and 
                       "handmade" in self.data["material_postfix"]):
                     post = (_PARENTHESIS_LEFT + 
-                           random.choice(self.data["material_postfix"]["handmade"]) + 
+                           self._rng.choice(self.data["material_postfix"]["handmade"]) + 
                            _PARENTHESIS_RIGHT)
             else:
                 post = _PARENTHESIS_LEFT + post + _PARENTHESIS_RIGHT
@@ -720,6 +1986,7 @@ class XiuXianNameGenerator:
         
         return names
     
+    @_generator_method("talisman")
     def get_talisman(self, number: int = 1, options: Dict = None) -> List[Dict]:
         """生成法宝名称
         
@@ -735,85 +2002,55 @@ class XiuXianNameGenerator:
         """
         options = options or {}
         names = []
-        common = []
-        for category in self.data.get("common", {}):
-            common.extend(self.data["common"][category])
+        common = self._pools["common"]
+        tiers = self._pools["talisman_tiers"]
         
         for _ in range(number):
             name = ""
-            prefix = random.choice(common)
-            c = random.choice(self.data["color"])
-            m = random.choice(self.data["talisman_material"])
-            s = random.choice(self.data["spirit"])
+            prefix = self._rng.choice(common)
+            c = self._rng.choice(self.data["color"])
+            m = self._rng.choice(self.data["talisman_material"])
+            s = self._rng.choice(self.data["spirit"])
             
             k = options.get("kind")
             r = options.get("rarity") or self._get_rarity(RARITY_VALUES["uncommon"])["rarity"]
             
             if r == "exotic":
-                all_talismans = []
-                for rarity_level in RARITY_LEVELS:
-                    if rarity_level in self.data["talisman"]:
-                        all_talismans.extend(self.data["talisman"][rarity_level])
-                k = k or random.choice(all_talismans)
+                k = k or self._rng.choice(tiers["exotic"])
                 name = prefix + s + k
             elif r == "mythic":
-                talismans = []
-                for rarity_level in RARITY_LEVELS:
-                    if rarity_level in ["mythic", "legendary", "epic", "rare", "uncommon", "common"]:
-                        if rarity_level in self.data["talisman"]:
-                            talismans.extend(self.data["talisman"][rarity_level])
-                k = k or random.choice(talismans)
+                k = k or self._rng.choice(tiers["mythic"])
                 name = prefix + s + k
             elif r == "legendary":
-                talismans = []
-                for rarity_level in RARITY_LEVELS:
-                    if rarity_level in ["legendary", "epic", "rare", "uncommon", "common"]:
-                        if rarity_level in self.data["talisman"]:
-                            talismans.extend(self.data["talisman"][rarity_level])
-                k = k or random.choice(talismans)
+                k = k or self._rng.choice(tiers["legendary"])
                 name = prefix + c + m + k
             elif r == "epic":
-                talismans = []
-                for rarity_level in RARITY_LEVELS:
-                    if rarity_level in ["epic", "rare", "uncommon", "common"]:
-                        if rarity_level in self.data["talisman"]:
-                            talismans.extend(self.data["talisman"][rarity_level])
-                k = k or random.choice(talismans)
+                k = k or self._rng.choice(tiers["epic"])
                 name = prefix + m + k
             elif r == "rare":
-                talismans = []
-                for rarity_level in RARITY_LEVELS:
-                    if rarity_level in ["rare", "uncommon", "common"]:
-                        if rarity_level in self.data["talisman"]:
-                            talismans.extend(self.data["talisman"][rarity_level])
-                k = k or random.choice(talismans)
+                k = k or self._rng.choice(tiers["rare"])
                 name = prefix + k
             elif r == "uncommon":
-                talismans = []
-                for rarity_level in RARITY_LEVELS:
-                    if rarity_level in ["uncommon", "common"]:
-                        if rarity_level in self.data["talisman"]:
-                            talismans.extend(self.data["talisman"][rarity_level])
-                k = k or random.choice(talismans)
+                k = k or self._rng.choice(tiers["uncommon"])
                 name = c + m + k
             elif r == "common":
-                if "common" in self.data["talisman"]:
-                    k = k or random.choice(self.data["talisman"]["common"])
+                if tiers["common"]:
+                    k = k or self._rng.choice(tiers["common"])
                 name = m + k
             
             post = options.get("postfix", "")
             if not post:
-                r1 = random.random()
-                r2 = random.random()
+                r1 = self._rng.random()
+                r2 = self._rng.random()
                 if (r1 < RARITY_VALUES["rare"] and r2 < RARITY_VALUES["rare"] and 
                     "broken" in self.data["talisman_postfix"]):
                     post = (_PARENTHESIS_LEFT + 
-                           random.choice(self.data["talisman_postfix"]["broken"]) + 
+                           self._rng.choice(self.data["talisman_postfix"]["broken"]) + 
                            _PARENTHESIS_RIGHT)
                 elif (r1 < RARITY_VALUES["uncommon"] and r2 < RARITY_VALUES["uncommon"] and 
                       "handmade" in self.data["talisman_postfix"]):
                     post = (_PARENTHESIS_LEFT + 
-                           random.choice(self.data["talisman_postfix"]["handmade"]) + 
+                           self._rng.choice(self.data["talisman_postfix"]["handmade"]) + 
                            _PARENTHESIS_RIGHT)
             else:
                 post = _PARENTHESIS_LEFT + post + _PARENTHESIS_RIGHT
@@ -822,108 +2059,110 @@ class XiuXianNameGenerator:
         
         return names
     
-    def get_alchemy(self, number: int = 1, kind: Optional[str] = None) -> List[Dict]:
+    @_generator_method("alchemy")
+    def get_alchemy(self, number: int = 1, kind: Union[str, Dict, None] = None) -> List[Dict]:
         """生成丹药名称
         
         Args:
             number: 生成名称的数量
-            kind: 丹药类型
+            kind: 丹药类型，也可以是包含kind键以及长度、字符约束的选项字典
         
         Returns:
             生成的丹药名称列表，每个元素包含name和rarity
         """
+        if isinstance(kind, dict):
+            kind = kind.get("kind")
         names = []
-        common_alchemy_names = []
-        for category in ["dao", "element", "color", "number", "action"]:
-            if category in self.data.get("common", {}):
-                common_alchemy_names.extend(self.data["common"][category])
+        common_alchemy_names = self._pools["alchemy_common"]
         
         for _ in range(number):
             rarity = "common"
-            pre = random.choice(common_alchemy_names)
+            pre = self._rng.choice(common_alchemy_names)
             s = ""
             
             r = self._get_rarity()
             if r["value"] < RARITY_VALUES["rare"]:
-                s = random.choice(self.data["spirit"])
+                s = self._rng.choice(self.data["spirit"])
             
             rarity = r["rarity"]
             k = kind or ""
             if not kind:
-                k = random.choice(self.data["alchemy"])
+                k = self._rng.choice(self.data["alchemy"])
             
             names.append({"name": pre + s + k, "rarity": rarity})
         
         return names
     
-    def get_clan(self, number: int = 1, kind: Optional[str] = None) -> List[str]:
+    @_generator_method("clan")
+    def get_clan(self, number: int = 1, kind: Union[str, Dict, None] = None) -> List[str]:
         """生成门派名称
         
         Args:
             number: 生成名称的数量
-            kind: 门派类型
+            kind: 门派类型，也可以是包含kind键以及长度、字符约束的选项字典
         
         Returns:
             生成的门派名称列表
         """
+        if isinstance(kind, dict):
+            kind = kind.get("kind")
         names = []
-        common = []
-        for category in self.data.get("common", {}):
-            common.extend(self.data["common"][category])
+        common = self._pools["common"]
         
         for _ in range(number):
-            name = random.choice(common)
+            name = self._rng.choice(common)
             k = kind
             if not k:
-                k = random.choice(self.data["clan"])
+                k = self._rng.choice(self.data["clan"])
             
             names.append(name + k)
         
         return names
     
-    def get_nation(self, number: int = 1, kind: Optional[str] = None) -> List[Dict]:
+    @_generator_method("nation")
+    def get_nation(self, number: int = 1, kind: Union[str, Dict, None] = None) -> List[Dict]:
         """生成国家名称
         
         Args:
             number: 生成名称的数量
-            kind: 国家类型
+            kind: 国家类型，也可以是包含kind键以及长度、字符约束的选项字典
         
         Returns:
             生成的国家名称列表，每个元素包含name和rarity
         """
+        if isinstance(kind, dict):
+            kind = kind.get("kind")
         names = []
-        common = []
-        for category in self.data.get("common", {}):
-            common.extend(self.data["common"][category])
+        common = self._pools["common"]
         
         for _ in range(number):
             name = ""
             k = kind or ""
             rarity = "common"
             
-            r = random.random()
+            r = self._rng.random()
             if r < RARITY_VALUES["rare"]:
-                name = random.choice(self.data["strange"])
+                name = self._rng.choice(self.data["strange"])
                 rarity = "rare"
                 if not kind:
                     if len(name) == 1:
                         k = _COUNTRY
                     else:
-                        k = random.choice(self.data["nation"])
+                        k = self._rng.choice(self.data["nation"])
             elif r < RARITY_VALUES["uncommon"]:
-                name = random.choice(common)
+                name = self._rng.choice(common)
                 rarity = "uncommon"
                 if not kind:
                     if len(name) == 1:
                         k = _COUNTRY
                     else:
-                        k = random.choice(self.data["nation"])
+                        k = self._rng.choice(self.data["nation"])
             else:
                 prefix = ""
-                if random.random() < RARITY_VALUES["rare"]:
-                    prefix = random.choice(self.data["place_prefix"])
+                if self._rng.random() < RARITY_VALUES["rare"]:
+                    prefix = self._rng.choice(self.data["place_prefix"])
                 
-                name = prefix + random.choice(self.data["place"])
+                name = prefix + self._rng.choice(self.data["place"])
                 if not kind:
                     k = _COUNTRY
             
@@ -931,44 +2170,45 @@ class XiuXianNameGenerator:
         
         return names
     
-    def get_location(self, number: int = 1, kind: Optional[str] = None) -> List[Dict]:
+    @_generator_method("location")
+    def get_location(self, number: int = 1, kind: Union[str, Dict, None] = None) -> List[Dict]:
         """生成据点名称
         
         Args:
             number: 生成名称的数量
-            kind: 地点类型
+            kind: 地点类型，也可以是包含kind键以及长度、字符约束的选项字典
         
         Returns:
             生成的据点名称列表，每个元素包含name和rarity
         """
+        if isinstance(kind, dict):
+            kind = kind.get("kind")
         names = []
-        common = []
-        for category in self.data.get("common", {}):
-            common.extend(self.data["common"][category])
+        common = self._pools["common"]
         
         for _ in range(number):
             name = ""
             k = kind or ""
             rarity = "common"
             
-            r = random.random()
+            r = self._rng.random()
             if r < RARITY_VALUES["rare"]:
-                name = random.choice(self.data["strange"])
+                name = self._rng.choice(self.data["strange"])
                 rarity = "rare"
             elif r < RARITY_VALUES["uncommon"]:
-                name = random.choice(common)
+                name = self._rng.choice(common)
                 rarity = "uncommon"
             else:
-                place_index = random.randint(0, len(self.data["place"]) - 1)
+                place_index = self._rng.randint(0, len(self.data["place"]) - 1)
                 postfix = ""
-                if random.random() < RARITY_VALUES["uncommon"]:
-                    postfix_index = random.randint(0, len(self.data["place_postfix"]) - 1)
+                if self._rng.random() < RARITY_VALUES["uncommon"]:
+                    postfix_index = self._rng.randint(0, len(self.data["place_postfix"]) - 1)
                     postfix = self.data["place_postfix"][postfix_index]
                 
                 name = self.data["place"][place_index] + postfix
             
             if not kind:
-                k = random.choice(self.data["location"])
+                k = self._rng.choice(self.data["location"])
             
             names.append({"name": name + k, "rarity": rarity})
         
@@ -983,10 +2223,11 @@ class XiuXianNameGenerator:
         Returns:
             地域类型字符串
         """
-        category = category or random.choice(ZONE_CATEGORIES)
+        category = category or self._rng.choice(ZONE_CATEGORIES)
         group = self.data["zone"][category]
-        return random.choice(group)
+        return self._rng.choice(group)
     
+    @_generator_method("zone")
     def get_zone(self, number: int = 1, options_or_kind=None) -> List[Dict]:
         """生成地域名称
         
@@ -1006,35 +2247,2040 @@ class XiuXianNameGenerator:
             options = options_or_kind
         
         names = []
-        common = []
-        for category in self.data.get("common", {}):
-            common.extend(self.data["common"][category])
+        common = self._pools["common"]
         
         for _ in range(number):
             name = ""
             k = options.get("kind") or self._get_zone_kind(options.get("category"))
             rarity = "common"
             
-            r = random.random()
+            r = self._rng.random()
             if r < RARITY_VALUES["rare"]:
-                name = random.choice(self.data["strange"])
+                name = self._rng.choice(self.data["strange"])
                 rarity = "rare"
             elif r < RARITY_VALUES["uncommon"]:
-                name = random.choice(common)
+                name = self._rng.choice(common)
                 rarity = "uncommon"
             else:
                 prefix = ""
-                if random.random() < RARITY_VALUES["rare"]:
-                    prefix = random.choice(self.data["place_prefix"])
+                if self._rng.random() < RARITY_VALUES["rare"]:
+                    prefix = self._rng.choice(self.data["place_prefix"])
                 
-                name = prefix + random.choice(self.data["place"])
+                name = prefix + self._rng.choice(self.data["place"])
                 if len(name) == 1:
                     if len(k) > 1:
                         name += _LINK_WORD
                     else:
-                        if random.random() < RARITY_VALUES["rare"]:
+                        if self._rng.random() < RARITY_VALUES["rare"]:
                             name += _LINK_WORD
             
             names.append({"name": name + k, "rarity": rarity})
         
-        return names
\ No newline at end of file
+        return names
+    
+    @_generator_method("continent")
+    def get_continent(self, number: int = 1, kind: Union[str, Dict, None] = None) -> List[Dict]:
+        """生成大陆名称
+        
+        Args:
+            number: 生成名称的数量
+            kind: 大陆类型，也可以是包含kind键以及长度、字符约束的选项字典
+        
+        Returns:
+            生成的大陆名称列表，每个元素包含name和rarity
+        """
+        if isinstance(kind, dict):
+            kind = kind.get("kind")
+        names = []
+        common = self._pools["common"]
+        
+        for _ in range(number):
+            rarity = "common"
+            
+            r = self._rng.random()
+            if r < RARITY_VALUES["rare"]:
+                name = self._rng.choice(self.data["strange"])
+                rarity = "rare"
+            elif r < RARITY_VALUES["uncommon"]:
+                name = self._rng.choice(common)
+                rarity = "uncommon"
+            else:
+                name = self._rng.choice(self.data["place_prefix"]) + self._rng.choice(self.data["place"])
+            
+            k = kind or self._rng.choice(self.data["continent"])
+            names.append({"name": name + k, "rarity": rarity})
+        
+        return names
+    
+    def clear_seen(self, kind: Optional[str] = None):
+        """清空唯一性模式下记录的已生成名称
+        
+        Args:
+            kind: 只清空该类型的记录，默认清空全部
+        """
+        with self._seen_lock:
+            if kind is None:
+                self._seen.clear()
+                self._seen_pinyin.clear()
+            else:
+                self._seen.pop(kind, None)
+                self._seen_pinyin.pop(kind, None)
+    
+    def seen_count(self, kind: str) -> int:
+        """获取唯一性模式下某类型已生成的名称数量"""
+        seen = self._seen.get(kind)
+        return len(seen) if seen is not None else 0
+    
+    def pinyin(self, name: str, tone: bool = True, separator: str = " ") -> str:
+        """把名称转换为拼音
+        
+        使用首次调用时构建的汉字到拼音映射逐字转换，耗时与名称长度成正比。
+        拼音表中没有的字符（如括号）原样保留。
+        
+        Args:
+            name: 名称
+            tone: 是否带声调
+            separator: 音节之间的分隔符
+        
+        Returns:
+            名称的拼音
+        """
+        table = self._pools["pinyin"][0 if tone else 1]
+        return separator.join([table.get(char, char) for char in name])
+    
+    def registered_count(self, kind: str) -> int:
+        """获取登记库中某类型已登记的名称数量（包括其他进程登记的），未指定登记库时返回0"""
+        if self._registry is None:
+            return 0
+        return self._registry.count(kind)
+    
+    def blocked(self, name: str) -> Optional[str]:
+        """检查名称是否包含屏蔽词
+        
+        Args:
+            name: 待检查的名称
+        
+        Returns:
+            名称中出现的一个屏蔽词，没有或未指定屏蔽词时返回None
+        """
+        if self._blocklist is None:
+            return None
+        return self._blocklist.search(name)
+    
+    def enable_stats(self, enabled: bool = True):
+        """开启或关闭统计，开启时清空之前的统计数据
+        
+        Args:
+            enabled: 是否开启
+        """
+        self._stats = _GeneratorStats() if enabled else None
+    
+    def stats(self) -> Dict[str, Dict]:
+        """获取统计数据快照
+        
+        Returns:
+            生成类型到统计数据的映射，每项包含calls（调用次数）、names（生成数量）、
+            seconds（累计耗时）和rarity（稀有度到数量的映射）；未启用统计时返回空字典
+        """
+        if self._stats is None:
+            return {}
+        return self._stats.snapshot()
+    
+    def prometheus_metrics(self) -> str:
+        """以Prometheus文本格式导出统计数据
+        
+        Returns:
+            可直接作为 /metrics 响应内容的文本
+        """
+        snapshot = self.stats()
+        metrics = (
+            ("xiuxian_generator_calls_total", "生成方法调用次数", "calls"),
+            ("xiuxian_generator_names_total", "生成的名称数量", "names"),
+            ("xiuxian_generator_seconds_total", "生成方法累计耗时（秒）", "seconds"),
+        )
+        lines = []
+        for metric, help_text, field in metrics:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for kind, entry in sorted(snapshot.items()):
+                lines.append(f'{metric}{{kind="{kind}"}} {entry[field]}')
+        lines.append("# HELP xiuxian_generator_rarity_total 按稀有度统计的生成数量")
+        lines.append("# TYPE xiuxian_generator_rarity_total counter")
+        for kind, entry in sorted(snapshot.items()):
+            for rarity in RARITY_LEVELS:
+                if rarity in entry["rarity"]:
+                    lines.append(f'xiuxian_generator_rarity_total{{kind="{kind}",rarity="{rarity}"}} '
+                                 f'{entry["rarity"][rarity]}')
+        return "\n".join(lines) + "\n"
+    
+    def _filtering(self) -> bool:
+        """生成结果是否需要经过 _admit 过滤"""
+        return self.unique or self.unique_pinyin or self._blocklist is not None or self._registry is not None
+    
+    def _admit(self, kind: str, items: List) -> List:
+        """过滤掉包含屏蔽词的结果，唯一性模式下过滤掉此前生成过的结果，
+        拒绝同音名称时过滤掉读音与此前结果相同的结果，指定了登记库时过滤掉未能登记的结果
+        
+        Args:
+            kind: 生成类型
+            items: 生成结果列表
+        
+        Returns:
+            通过过滤的结果，保持原有顺序
+        """
+        blocklist = self._blocklist
+        if blocklist is not None:
+            items = [item for item in items if blocklist.search(_result_fields(item)[0]) is None]
+        if self.unique:
+            with self._seen_lock:
+                seen = self._seen.get(kind)
+                if seen is None:
+                    seen = self._seen[kind] = _SeenSet()
+                items = [item for item in items if seen.add(_result_fields(item)[0])]
+        if self.unique_pinyin:
+            toneless = self._pools["pinyin"][1]
+            with self._seen_lock:
+                seen = self._seen_pinyin.get(kind)
+                if seen is None:
+                    seen = self._seen_pinyin[kind] = _SeenSet()
+                # 音节之间以空格分隔，"西安"（xi an）与"先"（xian）不算同音
+                admitted = [seen.add(" ".join([toneless.get(char, char) for char in _result_fields(item)[0]]))
+                            for item in items]
+            if self.unique and not all(admitted):
+                # 同音被拒的名称没有返回，不应继续占用唯一性记录
+                with self._seen_lock:
+                    seen = self._seen[kind]
+                    for item, ok in zip(items, admitted):
+                        if not ok:
+                            seen.discard(_result_fields(item)[0])
+            items = [item for item, ok in zip(items, admitted) if ok]
+        if self._registry is not None and items:
+            reserved = self._registry.reserve(kind, [_result_fields(item)[0] for item in items])
+            rejected = [item for item, ok in zip(items, reserved) if not ok]
+            if rejected:
+                self._release(kind, rejected, registry=False)
+            items = [item for item, ok in zip(items, reserved) if ok]
+        return items
+    
+    def _release(self, kind: str, items: List, registry: bool = True):
+        """撤销 _admit 对这些结果所做的记录，使它们之后可以再次生成
+        
+        Args:
+            kind: 生成类型
+            items: 此前通过 _admit 的结果
+            registry: 是否同时删除登记库中的记录；登记失败的名称属于其他进程，不能删除
+        """
+        names = [_result_fields(item)[0] for item in items]
+        if registry and self._registry is not None and names:
+            self._registry.release(kind, names)
+        with self._seen_lock:
+            if self.unique and kind in self._seen:
+                seen = self._seen[kind]
+                for name in names:
+                    seen.discard(name)
+            if self.unique_pinyin and kind in self._seen_pinyin:
+                toneless = self._pools["pinyin"][1]
+                seen = self._seen_pinyin[kind]
+                for name in names:
+                    seen.discard(" ".join([toneless.get(char, char) for char in name]))
+    
+    def _generate_admitted(self, kind: str, produce, number: int,
+                           options: Union[Dict, str, None] = None) -> List:
+        """生成指定数量的通过 _admit 过滤的结果
+        
+        Args:
+            kind: 生成类型
+            produce: 接受数量参数并返回生成结果列表的函数
+            number: 需要的结果数量
+            options: 生成选项，唯一性模式下先按对应的名称空间大小检查剩余数量是否足够
+        
+        Returns:
+            不重复且不含屏蔽词的生成结果列表
+        
+        Raises:
+            NameSpaceExhaustedError: 可用名称不足；此次调用中已通过过滤的结果会先被撤销
+        """
+        if self.unique:
+            # 指定选项时已生成的名称未必落在该选项的名称空间内，只能按名称空间本身判断
+            remaining = self.space_size(kind, options)
+            if not options:
+                remaining -= self.seen_count(kind)
+            if number > remaining:
+                raise NameSpaceExhaustedError(
+                    f"{kind} 最多还能生成 {max(remaining, 0)} 个不重复名称，无法满足 {number} 个")
+        
+        results = []
+        rejected = 0
+        while len(results) < number:
+            batch = produce(number - len(results))
+            accepted = self._admit(kind, batch)
+            if accepted:
+                rejected = 0
+                results.extend(accepted)
+                continue
+            rejected += len(batch)
+            if rejected >= self.unique_retries:
+                self._release(kind, results)
+                reasons = []
+                detail = ""
+                if self.unique:
+                    reasons.append("已出现过")
+                    detail += f"，已生成 {self.seen_count(kind)} 个不重复名称"
+                if self.unique_pinyin:
+                    reasons.append("与已生成的名称同音")
+                if self._registry is not None:
+                    reasons.append("已被登记")
+                    detail += f"，登记库中已有 {self._registry.count(kind)} 个名称"
+                if self._blocklist is not None:
+                    reasons.append("包含屏蔽词")
+                raise NameSpaceExhaustedError(
+                    f"{kind} 的可用名称已接近耗尽: 连续 {rejected} 个生成结果均{'或'.join(reasons)}{detail}")
+        return results
+    
+    def generate(self, kind: str, number: int = 1, options: Union[Dict, str, None] = None) -> List:
+        """按类型名调用对应的 get_* 方法
+        
+        Args:
+            kind: 生成类型，取值见 GENERATOR_KINDS
+            number: 生成名称的数量
+            options: 传给对应方法的选项字典；对只接受kind参数的类型，
+                    也可以直接传入kind字符串
+        
+        Returns:
+            与对应 get_* 方法相同的结果列表
+        """
+        if kind not in GENERATOR_KINDS:
+            raise ValueError(f"未知的生成类型: {kind}")
+        return getattr(self, "get_" + kind)(number, options)
+    
+    def generate_bulk(self, kind: str, number: int, options: Union[Dict, str, None] = None) -> List:
+        """批量生成名称
+        
+        一次性为全部名称抽取稀有度、层级和词索引，再用NumPy数组完成拼接，
+        输出分布与对应的 get_* 方法一致。未安装numpy时退回逐个生成。
+        
+        Args:
+            kind: 生成类型，取值见 GENERATOR_KINDS
+            number: 生成名称的数量
+            options: 与 generate 相同的选项
+        
+        Returns:
+            与对应 get_* 方法相同的结果列表
+        """
+        if kind not in GENERATOR_KINDS:
+            raise ValueError(f"未知的生成类型: {kind}")
+        if np is None or number <= 0 or (isinstance(options, dict) and not _CONSTRAINT_KEYS.isdisjoint(options)):
+            return self.generate(kind, number, options)
+        if isinstance(options, str):
+            options = {"kind": options}
+        rng = np.random.default_rng(self._rng.getrandbits(64))
+        produce = functools.partial(getattr(self, "_bulk_" + kind), rng, options=options or {})
+        started = time.perf_counter()
+        if self._filtering():
+            results = self._generate_admitted(kind, produce, number, options)
+        else:
+            results = produce(number)
+        if self._stats is not None:
+            self._stats.record(kind, results, time.perf_counter() - started)
+        if self.records:
+            results = _to_records(results)
+        return results
+    
+    def stream(self, kind: str, options: Union[Dict, str, None] = None, number: Optional[int] = None,
+               chunk_size: Optional[int] = None, batch_size: int = 1024, bulk: bool = False) -> Iterator:
+        """以迭代器形式持续产出生成结果
+        
+        每次只生成一小批结果，内存占用与总数量无关，适合把大量名称直接写入文件或队列。
+        逐个产出时提前关闭迭代器，唯一性模式和登记库中已记录但未产出的名称会被撤销。
+        
+        Args:
+            kind: 生成类型，取值见 GENERATOR_KINDS
+            options: 与 generate 相同的选项
+            number: 生成名称的总数量，默认不限数量
+            chunk_size: 指定时按此大小分块产出结果列表，否则逐个产出
+            batch_size: 逐个产出时每批内部生成的数量
+            bulk: 是否使用 generate_bulk 生成每一批
+        
+        Returns:
+            生成结果（或结果列表）的迭代器
+        """
+        if kind not in GENERATOR_KINDS:
+            raise ValueError(f"未知的生成类型: {kind}")
+        size = chunk_size or batch_size
+        remaining = number
+        while remaining is None or remaining > 0:
+            count = size if remaining is None else min(size, remaining)
+            if bulk:
+                batch = self.generate_bulk(kind, count, options)
+            else:
+                batch = self.generate(kind, count, options)
+            if remaining is not None:
+                remaining -= count
+            if chunk_size:
+                yield batch
+                continue
+            pending = iter(batch)
+            try:
+                yield from pending
+            finally:
+                # 提前关闭时撤销本批中未产出的结果，使它们之后可以再次生成
+                if self._filtering():
+                    self._release(kind, list(pending))
+    
+    def generate_world(self, spec: Dict[str, Any], scope: str = "parent", bulk: bool = False,
+                       batch_size: int = 4096) -> Iterator[Dict]:
+        """按 大陆 → 地域 → 国家 → 门派 → 据点 的层级流式生成整个世界
+        
+        节点按先序逐个产出，父节点总在其子节点之前。每个节点是包含id、parent（父节点id，
+        最外层为None）、level、name以及rarity（门派没有）的字典。各层级的名称从按批生成的
+        结果中依次取出，内存占用只与层级深度和每个节点的子节点数量有关，与节点总数无关。
+        迭代结束或提前关闭时，唯一性模式和登记库中已记录但未产出的名称会被撤销。
+        
+        Args:
+            spec: 层级到数量的映射，层级取值见 WORLD_LEVELS，未列出的层级被跳过。
+                  数量可以是整数、[最小值, 最大值]，或 {"count": 数量, "options": 该层级的生成选项}；
+                  最外层为节点总数，其余层级为每个父节点下的子节点数量
+            scope: 名称不重复的范围，"parent" 为同一父节点下的子节点之间，"world" 为整个世界的同一层级
+            bulk: 是否使用 generate_bulk 生成各层级的名称
+            batch_size: 每次为一个层级生成的名称数量
+        
+        Returns:
+            世界节点的迭代器
+        """
+        if scope not in ("parent", "world"):
+            raise ValueError(f"未知的唯一性范围: {scope}")
+        unknown = set(spec) - set(WORLD_LEVELS)
+        if unknown:
+            raise ValueError(f"未知的世界层级: {', '.join(sorted(unknown))}")
+        
+        generate = self.generate_bulk if bulk else self.generate
+        levels = []
+        # 各层级已生成但尚未取用的结果
+        pending = []
+        # 各层级节点总数的上限，节点较少的层级只生成需要的数量，
+        # 避免唯一性模式或登记库把用不到的名称也记为已发放
+        bound = 1
+        for level in WORLD_LEVELS:
+            if level not in spec:
+                continue
+            count, options = spec[level], None
+            if isinstance(count, dict):
+                count, options = count.get("count", 1), count.get("options")
+            low, high = (count, count) if isinstance(count, int) else count
+            bound *= high
+            buffer = deque()
+            pending.append((level, buffer))
+            source = self._world_source(generate, level, options, max(1, min(batch_size, bound)), buffer)
+            seen = _SeenSet() if scope == "world" else None
+            levels.append((level, low, high, source, seen))
+        if not levels:
+            return
+        
+        next_id = 0
+        stack = [(0, None, iter(self._world_children(*levels[0])))]
+        try:
+            while stack:
+                depth, parent, children = stack[-1]
+                item = next(children, None)
+                if item is None:
+                    stack.pop()
+                    continue
+                name, rarity, _ = _result_fields(item)
+                node = {"id": next_id, "parent": parent, "level": levels[depth][0], "name": name}
+                if rarity is not None:
+                    node["rarity"] = rarity
+                yield node
+                if depth + 1 < len(levels):
+                    stack.append((depth + 1, next_id, iter(self._world_children(*levels[depth + 1]))))
+                next_id += 1
+        finally:
+            # 迭代结束或提前关闭时撤销已取出但未产出的子节点和各层级尚未取用的结果，使它们之后可以再次生成
+            if self._filtering():
+                for depth, _, children in stack:
+                    self._release(levels[depth][0], list(children))
+                for level, buffer in pending:
+                    self._release(level, list(buffer))
+    
+    def _world_source(self, generate, kind: str, options: Union[Dict, str, None],
+                      batch_size: int, buffer: deque) -> Iterator:
+        """持续产出某层级生成结果的迭代器，每次生成batch_size个放入buffer后依次取出"""
+        while True:
+            buffer.extend(generate(kind, batch_size, options))
+            while buffer:
+                yield buffer.popleft()
+    
+    def _world_children(self, level: str, low: int, high: int, source: Iterator,
+                        seen: Optional[_SeenSet] = None) -> List:
+        """为一个父节点取出名称不重复的子节点
+        
+        Args:
+            level: 层级
+            low: 子节点数量的最小值
+            high: 子节点数量的最大值
+            source: 该层级生成结果的迭代器
+            seen: 整个世界范围内已使用的名称，未指定时只在本组子节点之间去重
+        
+        Returns:
+            子节点的生成结果列表
+        """
+        count = low if low == high else self._rng.randint(low, high)
+        if seen is None:
+            seen = set()
+        children = []
+        rejected = 0
+        while len(children) < count:
+            item = next(source)
+            name = _result_fields(item)[0]
+            if name in seen:
+                rejected += 1
+                if rejected >= self.unique_retries:
+                    raise NameSpaceExhaustedError(
+                        f"{level} 的可用名称已接近耗尽: 连续 {rejected} 个生成结果在同一范围内均已出现过")
+                continue
+            seen.add(name)
+            children.append(item)
+            rejected = 0
+        return children
+    
+    def export(self, kind: str, number: int, output, options: Union[Dict, str, None] = None,
+               format: str = "jsonl", chunk_size: int = 10000, bulk: bool = False) -> int:
+        """生成名称并写入二进制文件对象
+        
+        按chunk_size分块生成，每块编码后一次性写入，内存占用与总数量无关。
+        人名和门派等只有名称的结果以name列输出。
+        
+        Args:
+            kind: 生成类型，取值见 GENERATOR_KINDS
+            number: 生成名称的数量
+            output: 以二进制模式打开的文件对象
+            options: 与 generate 相同的选项
+            format: 输出格式，取值见 EXPORT_FORMATS；parquet需要安装pyarrow
+            chunk_size: 每块的名称数量
+            bulk: 是否使用 generate_bulk 生成每一块
+        
+        Returns:
+            写入的记录数量
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"未知的导出格式: {format}")
+        chunks = (_export_records(chunk)
+                  for chunk in self.stream(kind, options, number, chunk_size=chunk_size, bulk=bulk))
+        if format == "parquet":
+            return _write_parquet(chunks, output)
+        
+        written = 0
+        columns = None
+        for records in chunks:
+            if format == "jsonl":
+                text = "\n".join(json.dumps(record, ensure_ascii=False) for record in records) + "\n"
+            else:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer, lineterminator="\n")
+                if columns is None:
+                    columns = list(records[0])
+                    writer.writerow(columns)
+                writer.writerows([record.get(column, "") for column in columns] for record in records)
+                text = buffer.getvalue()
+            output.write(text.encode("utf-8"))
+            written += len(records)
+        return written
+    
+    def generate_batch(self, kind: str, number: int, options: Union[Dict, str, None] = None,
+                       chunk_size: int = 10000, bulk: bool = False) -> NameBatch:
+        """生成名称并以列式的 NameBatch 保存
+        
+        按chunk_size分块生成并追加到批次中，生成过程中的字典只在当前块内存在，
+        保存大量结果时比字典列表节省数倍内存。
+        
+        Args:
+            kind: 生成类型，取值见 GENERATOR_KINDS
+            number: 生成名称的数量
+            options: 与 generate 相同的选项
+            chunk_size: 每块的名称数量
+            bulk: 是否使用 generate_bulk 生成每一块
+        
+        Returns:
+            包含全部结果的 NameBatch
+        """
+        batch = NameBatch()
+        for chunk in self.stream(kind, options, number, chunk_size=chunk_size, bulk=bulk):
+            batch.extend(chunk)
+        return batch
+    
+    def generate_parallel(self, kind: str, number: int, options: Union[Dict, str, None] = None,
+                          workers: Optional[int] = None, chunk_size: int = 10000,
+                          bulk: bool = False) -> Iterator:
+        """多进程并行生成名称
+        
+        把任务按chunk_size切分为分片，分发到进程池中生成，结果按分片顺序逐个产出。
+        第i个分片使用 spawn("parallel", kind, i) 的随机流，因此同一根种子下的输出
+        与工作进程数量无关，且可以复现。工作进程从data_dir或bundle重新加载数据，
+        对当前实例data的直接修改不会传递给工作进程。
+        
+        Args:
+            kind: 生成类型，取值见 GENERATOR_KINDS
+            number: 生成名称的数量
+            options: 与 generate 相同的选项
+            workers: 工作进程数量，默认为CPU核数；为1时在当前进程中生成
+            chunk_size: 每个分片的名称数量
+            bulk: 是否在工作进程中使用 generate_bulk
+        
+        Returns:
+            按顺序产出生成结果的迭代器
+        """
+        if kind not in GENERATOR_KINDS:
+            raise ValueError(f"未知的生成类型: {kind}")
+        root = self._stream_root()
+        tasks = [
+            (kind, min(chunk_size, number - start), options,
+             _derive_seed(root, "parallel", kind, index), bulk)
+            for index, start in enumerate(range(0, number, chunk_size))
+        ]
+        return self._run_parallel(tasks, workers or os.cpu_count() or 1)
+    
+    def _run_parallel(self, tasks: List[Tuple], workers: int) -> Iterator:
+        """执行并行分片任务并按顺序产出结果"""
+        if workers == 1:
+            for task in tasks:
+                kind, number, options, seed, bulk = task
+                generator = self._with_seed(seed)
+                generator.unique = generator.unique_pinyin = generator.records = False
+                generator._registry = generator._stats = None
+                started = time.perf_counter()
+                results = _generate_chunk(generator, kind, number, options, bulk)
+                yield from self._admit_chunk(task, results, time.perf_counter() - started)
+            return
+        
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_parallel_worker,
+            initargs=(type(self), self.data_dir, self.lazy, self.bundle,
+                      self._blocklist.patterns if self._blocklist is not None else None),
+        )
+        try:
+            # 最多保留两倍于进程数的未完成分片，避免结果堆积在内存中
+            pending = deque()
+            queued = deque(tasks)
+            while queued and len(pending) < workers * 2:
+                task = queued.popleft()
+                pending.append((task, executor.submit(_parallel_chunk, *task)))
+            while pending:
+                task, future = pending.popleft()
+                results, seconds = future.result()
+                if queued:
+                    next_task = queued.popleft()
+                    pending.append((next_task, executor.submit(_parallel_chunk, *next_task)))
+                yield from self._admit_chunk(task, results, seconds)
+        finally:
+            executor.shutdown(cancel_futures=True)
+    
+    def _admit_chunk(self, task: Tuple, results: List, seconds: float) -> List:
+        """唯一性模式、拒绝同音名称或指定了登记库时过滤并行分片中的重复结果，
+        并用该分片派生的随机流补足数量；启用统计时把每个分片记为一次调用，
+        耗时为分片的生成时间，与工作进程数量无关；紧凑结果模式下转换为 NameRecord"""
+        started = time.perf_counter()
+        kind = task[0]
+        if self.unique or self.unique_pinyin or self._registry is not None:
+            _, number, options, seed, bulk = task
+            accepted = self._admit(kind, results)
+            if len(accepted) < len(results):
+                refill = self._with_seed(_derive_seed(seed, "refill"))
+                refill._stats = None
+                accepted.extend(_generate_chunk(refill, kind, len(results) - len(accepted), options, bulk))
+            results = accepted
+        if self._stats is not None:
+            self._stats.record(kind, results, seconds + time.perf_counter() - started)
+        if self.records:
+            results = _to_records(results)
+        return results
+    
+    # ---------- 名称空间 ----------
+    
+    def space(self, kind: str, options: Union[Dict, str, None] = None) -> Dict[str, int]:
+        """统计各形态可生成的名称数量
+        
+        形态对应生成逻辑中的稀有度、风格或类别分支，例如人名的 "female/double"、
+        生灵的 "bird/mythic"、材料的 "epic/broken"。数量按去重后的词表组合计算，
+        同一名称可能由多个形态生成（如男女道号共用的称号），因此各形态数量之和可能大于 space_size。
+        
+        Args:
+            kind: 生成类型，取值见 GENERATOR_KINDS
+            options: 与对应 get_* 方法相同的选项，指定的固定值会缩小名称空间
+        
+        Returns:
+            形态标签到名称数量的字典
+        """
+        return {form.label: form.size for form in self._get_forms(kind, options)}
+    
+    def space_size(self, kind: str, options: Union[Dict, str, None] = None) -> int:
+        """统计可生成的不重复名称总数
+        
+        Args:
+            kind: 生成类型，取值见 GENERATOR_KINDS
+            options: 与 space 相同的选项
+        
+        Returns:
+            不同形态或不同词组合拼接出的相同名称只计一次的名称数量
+        """
+        return self._space_automaton(kind, options).size
+    
+    def decode(self, kind: str, index: int, options: Union[Dict, str, None] = None) -> Union[str, Dict]:
+        """把整数直接映射为名称
+        
+        所有形态合并为按字符转移的确定性自动机，按各状态之后的名称数量做混合进制分解，
+        [0, space_size) 内不同的整数对应不同的名称。配合计数器或随机排列即可在O(1)时间内
+        分配不重复的名称。同一名称能由多个形态生成时，稀有度等字段取形态顺序中最先出现的形态。
+        
+        Args:
+            kind: 生成类型，取值见 GENERATOR_KINDS
+            index: 名称序号，取值范围为 [0, space_size(kind, options))
+            options: 与 space 相同的选项
+        
+        Returns:
+            与对应 get_* 方法单个结果相同的名称字符串或字典
+        """
+        if index < 0:
+            raise IndexError("名称序号不能为负数")
+        automaton = self._space_automaton(kind, options)
+        if index >= automaton.size:
+            raise IndexError(f"名称序号超出 {kind} 的名称空间")
+        name, form = automaton.decode(index)
+        if form.rarity is None:
+            return name
+        return dict({"name": name, "rarity": form.rarity}, **form.extra)
+    
+    def _space_automaton(self, kind: str, options: Union[Dict, str, None] = None) -> _FormAutomaton:
+        """获取缓存的名称空间自动机"""
+        key = ("automaton", kind, _options_key(options))
+        automaton = self._forms.get(key)
+        if automaton is None:
+            automaton = self._forms[key] = _FormAutomaton(self._get_forms(kind, options))
+        return automaton
+    
+    def parse(self, kind: str, name: str, options: Union[Dict, str, None] = None) -> Optional[Dict]:
+        """把名称拆解回生成它的各个组成部分
+        
+        依次尝试各名称形态，用每个部分词表的前缀树在名称上逐段匹配。
+        多个形态都能匹配时返回稀有度最高的一个。
+        
+        Args:
+            kind: 生成类型，取值见 GENERATOR_KINDS
+            name: 待拆解的名称
+            options: 与 space 相同的选项
+        
+        Returns:
+            包含rarity（推断的稀有度）、form（形态标签）和components（角色到词的映射）的字典，
+            生灵还包含category；名称不符合该类型的生成规则时返回None
+        """
+        for form, min_length, max_length in self._parse_forms(kind, options):
+            if not min_length <= len(name) <= max_length:
+                continue
+            words = self._match_parts(form.parts, name, 0)
+            if words is None:
+                continue
+            components = {}
+            for (role, _), word in zip(form.parts, words):
+                if role:
+                    components[role] = components.get(role, "") + word
+            return dict({"rarity": form.rarity, "form": form.label, "components": components}, **form.extra)
+        return None
+    
+    def _parse_forms(self, kind: str, options: Union[Dict, str, None] = None) -> List[Tuple[_Form, int, int]]:
+        """获取按稀有度从高到低排列的形态及其名称长度范围"""
+        key = ("parse", kind, _options_key(options))
+        forms = self._forms.get(key)
+        if forms is None:
+            order = {rarity: index for index, rarity in enumerate(reversed(RARITY_LEVELS))}
+            forms = []
+            for form in sorted(self._get_forms(kind, options), key=lambda f: order.get(f.rarity, len(order))):
+                min_length = sum(min(len(word) for word in words) for _, words in form.parts)
+                max_length = sum(max(len(word) for word in words) for _, words in form.parts)
+                forms.append((form, min_length, max_length))
+            self._forms[key] = forms
+        return forms
+    
+    def _word_trie(self, words: Tuple[str, ...]) -> Dict:
+        """获取缓存的词表前缀树，词尾节点以空字符串为键保存完整的词"""
+        cache_key = ("trie", id(words))
+        cached = self._bulk_pools.get(cache_key)
+        if cached is not None and cached[0] is words:
+            return cached[1]
+        trie = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[""] = word
+        self._bulk_pools[cache_key] = (words, trie)
+        return trie
+    
+    def _match_parts(self, parts, name: str, position: int) -> Optional[List[str]]:
+        """从position开始按顺序匹配各部分，返回各部分匹配到的词"""
+        if not parts:
+            return [] if position == len(name) else None
+        node = self._word_trie(parts[0][1])
+        for index in range(position, len(name)):
+            node = node.get(name[index])
+            if node is None:
+                return None
+            if "" in node:
+                rest = self._match_parts(parts[1:], name, index + 1)
+                if rest is not None:
+                    return [node[""]] + rest
+        return None
+    
+    def _get_forms(self, kind: str, options: Union[Dict, str, None] = None) -> List[_Form]:
+        """获取缓存的名称形态列表"""
+        if kind not in GENERATOR_KINDS:
+            raise ValueError(f"未知的生成类型: {kind}")
+        if isinstance(options, str):
+            options = {"kind": options}
+        options = options or {}
+        key = (kind, _options_key(options))
+        forms = self._forms.get(key)
+        if forms is None:
+            forms = [form for form in getattr(self, "_forms_" + kind)(options) if form.size]
+            self._forms[key] = forms
+        return forms
+    
+    def _space_words(self, key: str, words: Iterable[str]) -> Tuple[str, ...]:
+        """获取缓存的去重词表"""
+        cache_key = "space:" + key
+        pool = self._bulk_pools.get(cache_key)
+        if pool is None:
+            pool = tuple(dict.fromkeys(word for word in words if word))
+            self._bulk_pools[cache_key] = pool
+        return pool
+    
+    def _space_part(self, role: str, key: str, words: Iterable[str], fixed: Optional[str] = None):
+        """构造形态的一个部分，指定了固定值时词表只包含该值"""
+        if fixed:
+            return (role, (fixed,))
+        return (role, self._space_words(key, words))
+    
+    def _postfix_parts(self, postfix: str, groups: Dict[str, List[str]], keys: Tuple[str, ...], pool_key: str):
+        """构造括号后缀的各种可能: (标签, 部分列表, 概率)
+        
+        keys 依次对应两次掷骰都低于rare、都低于uncommon阈值时使用的后缀分组。
+        """
+        if postfix:
+            return [("postfix", [("", (_PARENTHESIS_LEFT,)), ("postfix", (postfix,)),
+                                 ("", (_PARENTHESIS_RIGHT,))], 1.0)]
+        variants = []
+        covered = 0.0
+        for key, threshold in zip(keys, (RARITY_VALUES["rare"], RARITY_VALUES["uncommon"])):
+            if key in groups:
+                variants.append((key, [("", (_PARENTHESIS_LEFT,)),
+                                       self._space_part("postfix", pool_key + ":" + key, groups[key]),
+                                       ("", (_PARENTHESIS_RIGHT,))], threshold ** 2 - covered))
+                covered = threshold ** 2
+        return [("", [], 1.0 - covered)] + variants
+    
+    def _forms_name(self, options: Dict) -> List[_Form]:
+        """人名的名称形态，对应 get_name"""
+        family = self._space_part("family", "family", self.data["family"], options.get("familyName"))
+        if "isFemale" in options:
+            sexes = [bool(options["isFemale"])]
+        else:
+            sexes = [True, False]
+        style = options.get("style")
+        if style:
+            styles = {style if style in ("single", "double") else "combine": 1.0}
+        else:
+            styles = {"single": 0.33333333, "double": 0.33333333, "combine": 1 - 0.66666666}
+        middle = options.get("middleCharacter")
+        
+        forms = []
+        for is_female in sexes:
+            sex = "female" if is_female else "male"
+            given = self._space_part("given", sex, self.data[sex])
+            for style, weight in styles.items():
+                if style == "single":
+                    parts = (family, self._space_part("given", sex, self.data[sex], middle))
+                elif style == "double":
+                    parts = (family, self._space_part("given", sex, self.data[sex], middle), given)
+                else:
+                    parts = (family, self._space_part("middle", "middle", self.data["middle"], middle), given)
+                forms.append(_Form(f"{sex}/{style}", None, parts, weight=weight / len(sexes)))
+        return forms
+    
+    def _forms_dao(self, options: Dict) -> List[_Form]:
+        """道号的名称形态，对应 get_dao"""
+        first = self._space_part("first", "dao", self.data["dao"], options.get("firstCharacter"))
+        second = self._space_part("second", "dao", self.data["dao"])
+        if "isFemale" in options:
+            genders = ["dao_title_female" if options["isFemale"] else "dao_title_male"]
+        else:
+            genders = ["dao_title_female", "dao_title_male"]
+        
+        title = options.get("title", "")
+        if title:
+            return [
+                _Form(gender[len("dao_title_"):], self._dao_title_rarity(title, gender),
+                      (first, second, ("title", (title,))), weight=1 / len(genders))
+                for gender in genders
+            ]
+        
+        # 抽到的稀有度没有对应称号时不加称号，这部分概率归入无称号的形态
+        probabilities = _rarity_probabilities()
+        untitled = {"common": probabilities["common"]}
+        forms = []
+        for gender in genders:
+            title_group = self.data[gender]
+            for rarity in RARITY_LEVELS[1:]:
+                weight = probabilities[rarity] / len(genders)
+                if title_group.get(rarity):
+                    title_part = self._space_part("title", gender + ":" + rarity, title_group[rarity])
+                    forms.append(_Form(f"{gender[len('dao_title_'):]}/{rarity}", rarity,
+                                       (first, second, title_part), weight=weight))
+                else:
+                    untitled[rarity] = untitled.get(rarity, 0.0) + weight
+        common = _Form("common", "common", (first, second), weight=sum(untitled.values()),
+                       rarity_weights=tuple(untitled.items()))
+        return [common] + forms
+    
+    def _skill_forms(self, length: Optional[int] = None, kind: Optional[str] = None,
+                     prefix: Optional[str] = None, numfix: Optional[str] = None,
+                     high_rarities: Tuple[str, ...] = ("rare",)) -> List[_Form]:
+        """功法名称的名称形态，对应 _get_skill_name
+        
+        Args:
+            high_rarities: 未指定长度时三字词形态对应的稀有度，
+                          秘籍名称按稀有度选择前缀，需要展开为各个稀有度
+        """
+        if length:
+            rarity = "common"
+            if length > 2:
+                rarity = "rare"
+            elif length > 1:
+                rarity = "uncommon"
+            lengths = [(length, ((rarity, 1.0),))]
+        else:
+            probabilities = _rarity_probabilities()
+            lengths = [(1, (("common", probabilities["common"]),)),
+                       (2, (("uncommon", probabilities["uncommon"]),)),
+                       (3, tuple((rarity, probabilities[rarity]) for rarity in high_rarities))]
+        # 三字词形态只展开为一个稀有度时，其余高稀有度的概率由 rarity_weights 表示
+        high_weights = ()
+        if not length and len(high_rarities) == 1:
+            high_weights = tuple((rarity, probabilities[rarity]) for rarity in _RARITY_BY_THRESHOLD[:5])
+            lengths[2] = (3, ((high_rarities[0], sum(weight for _, weight in high_weights)),))
+        
+        word = self._space_part("word", "skill_common", self._pools["skill_common"])
+        prefix_weight = RARITY_VALUES["epic"]
+        prefixes = [(None, 1 - prefix_weight),
+                    (self._space_part("prefix", "skill_prefix", self.data["skill_prefix"]), prefix_weight)]
+        if prefix:
+            prefixes = [(("prefix", (prefix,)), 1.0)]
+        numfixes = [(None, 1 - prefix_weight),
+                    (self._space_part("numfix", "skill_numfix", self.data["skill_numfix"]), prefix_weight)]
+        if numfix:
+            numfixes = [(("numfix", (numfix,)), 1.0)]
+        if kind:
+            kinds = ("kind", (kind,))
+        else:
+            kinds = self._space_part("kind", "skill", self.data["skill"])
+        long_kinds = ("kind", tuple(k for k in kinds[1] if len(k) > 1))
+        short_kinds = ("kind", tuple(k for k in kinds[1] if len(k) <= 1))
+        long_fraction = len(long_kinds[1]) / len(kinds[1]) if kinds[1] else 0.0
+        
+        forms = []
+        for l, rarities in lengths:
+            name = (word,) * l
+            for pre, pre_weight in prefixes:
+                pre_parts = (pre,) if pre else ()
+                pre_label = "/prefix" if pre else ""
+                for n, numfix_weight in numfixes:
+                    if n is None:
+                        variants = [("", pre_parts + name + (kinds,), 1.0)]
+                    else:
+                        variants = [
+                            ("/numfix-begin", (n, ("", (_NUMBER_BEGIN_SUPPLEMENT,))) + pre_parts + name + (kinds,), 0.5),
+                            ("/numfix-end", pre_parts + name + (long_kinds, n, ("", (_NUMBER_END_SUPPLEMENT,))),
+                             0.5 * long_fraction),
+                            ("/numfix-inner", pre_parts + name + (n, short_kinds), 0.5 * (1 - long_fraction)),
+                        ]
+                    for label, parts, variant_weight in variants:
+                        for rarity, rarity_weight in rarities:
+                            rarity_label = f"/{rarity}" if len(rarities) > 1 else ""
+                            forms.append(_Form(f"length{l}{rarity_label}{pre_label}{label}", rarity, parts,
+                                               weight=rarity_weight * pre_weight * numfix_weight * variant_weight,
+                                               rarity_weights=high_weights if l == 3 else ()))
+        return forms
+    
+    def _forms_skill(self, options: Dict) -> List[_Form]:
+        """功法名称的名称形态，对应 get_skill"""
+        return self._skill_forms(options.get("length"), options.get("kind"),
+                                 options.get("prefix"), options.get("numfix"))
+    
+    def _forms_book(self, options: Dict) -> List[_Form]:
+        """秘籍名称的名称形态，对应 get_book"""
+        skill_forms = self._skill_forms(options.get("length"), options.get("mainkind"),
+                                        high_rarities=("rare", "epic", "legendary", "mythic", "exotic"))
+        postfixes = self._postfix_parts(options.get("postfix", ""), self.data["book_postfix"],
+                                        ("rare", "uncommon"), "book_postfix")
+        
+        forms = []
+        for skill in skill_forms:
+            if options.get("prefix"):
+                pre = [("prefix", (options["prefix"],))]
+            elif skill.rarity in _BOOK_PREFIX_RARITIES and skill.rarity in self.data["book_prefix"]:
+                pre = [self._space_part("prefix", "book_prefix:" + skill.rarity,
+                                        self.data["book_prefix"][skill.rarity])]
+            else:
+                pre = []
+            if options.get("postkind"):
+                pk = [("postkind", (options["postkind"],))]
+            elif pre:
+                pk = [self._space_part("postkind", "book", self.data["book"])]
+            else:
+                pk = []
+            for post_label, post, post_weight in postfixes:
+                parts = ((("", (_BOOK_LEFT,)),) + skill.parts + tuple(pre) + tuple(pk)
+                         + tuple(post) + (("", (_BOOK_RIGHT,)),))
+                label = skill.label + (f"/{post_label}" if post_label else "")
+                forms.append(_Form(label, skill.rarity, parts, weight=skill.weight * post_weight))
+        return forms
+    
+    def _forms_creature(self, options: Dict) -> List[_Form]:
+        """生灵名称的名称形态，对应 get_creature"""
+        pre = self._space_part("prefix", "creature_common", self._pools["creature_common"])
+        c = self._space_part("color", "color", self.data["color"])
+        s = self._space_part("spirit", "creature_prefix", self.data["creature_prefix"])
+        strange = self._space_part("strange", "strange_creature", self.data["strange_creature"])
+        categories = [options["category"]] if options.get("category") else CREATURE_CATEGORY
+        rarities = [options["rarity"]] if options.get("rarity") else RARITY_LEVELS
+        probabilities = _rarity_probabilities(RARITY_VALUES["uncommon"])
+        
+        forms = []
+        for category in categories:
+            k = self._space_part("kind", "creature:" + category, self.data["creature"][category])
+            layouts = {
+                "exotic": (strange,),
+                "mythic": (pre, c, s, k),
+                "legendary": (pre, s, k),
+                "epic": (pre, c, k),
+                "rare": (pre, k),
+                "uncommon": (c, s, k),
+                "common": (c, k),
+            }
+            for rarity in rarities:
+                if rarity in layouts:
+                    weight = (1.0 if options.get("rarity") else probabilities[rarity]) / len(categories)
+                    forms.append(_Form(f"{category}/{rarity}", rarity, layouts[rarity], {"category": category},
+                                       weight=weight))
+        return forms
+    
+    def _forms_material(self, options: Dict) -> List[_Form]:
+        """材料名称的名称形态，对应 get_material"""
+        pre = self._space_part("prefix", "common", self._pools["common"])
+        c = self._space_part("color", "color", self.data["color"])
+        s = self._space_part("spirit", "spirit", self.data["spirit"])
+        tiers = self._pools["material_tiers"]
+        rarities = [options["rarity"]] if options.get("rarity") else RARITY_LEVELS
+        probabilities = _rarity_probabilities(RARITY_VALUES["uncommon"])
+        postfixes = self._postfix_parts(options.get("postfix", ""), self.data["material_postfix"],
+                                        ("broken", "handmade"), "material_postfix")
+        
+        forms = []
+        for rarity in rarities:
+            if rarity not in tiers:
+                continue
+            k = self._space_part("kind", "material_tiers:" + rarity, tiers[rarity], options.get("kind"))
+            layouts = {
+                "exotic": (("age", (_AGE100,)), pre, c, s, k),
+                "mythic": (("age", (_AGE10,)), pre, c, s, k),
+                "legendary": (("age", (_AGE1,)), pre, c, s, k),
+                "epic": (pre, c, s, k),
+                "rare": (pre, s, k),
+                "uncommon": (c, s, k),
+                "common": (c, k),
+            }
+            rarity_weight = 1.0 if options.get("rarity") else probabilities[rarity]
+            for post_label, post, post_weight in postfixes:
+                label = rarity + (f"/{post_label}" if post_label else "")
+                forms.append(_Form(label, rarity, layouts[rarity] + tuple(post), weight=rarity_weight * post_weight))
+        return forms
+    
+    def _forms_talisman(self, options: Dict) -> List[_Form]:
+        """法宝名称的名称形态，对应 get_talisman"""
+        prefix = self._space_part("prefix", "common", self._pools["common"])
+        c = self._space_part("color", "color", self.data["color"])
+        m = self._space_part("material", "talisman_material", self.data["talisman_material"])
+        s = self._space_part("spirit", "spirit", self.data["spirit"])
+        tiers = self._pools["talisman_tiers"]
+        rarities = [options["rarity"]] if options.get("rarity") else RARITY_LEVELS
+        probabilities = _rarity_probabilities(RARITY_VALUES["uncommon"])
+        postfixes = self._postfix_parts(options.get("postfix", ""), self.data["talisman_postfix"],
+                                        ("broken", "handmade"), "talisman_postfix")
+        
+        forms = []
+        for rarity in rarities:
+            if rarity not in tiers:
+                continue
+            k = self._space_part("kind", "talisman_tiers:" + rarity, tiers[rarity], options.get("kind"))
+            layouts = {
+                "exotic": (prefix, s, k),
+                "mythic": (prefix, s, k),
+                "legendary": (prefix, c, m, k),
+                "epic": (prefix, m, k),
+                "rare": (prefix, k),
+                "uncommon": (c, m, k),
+                "common": (m, k),
+            }
+            rarity_weight = 1.0 if options.get("rarity") else probabilities[rarity]
+            for post_label, post, post_weight in postfixes:
+                label = rarity + (f"/{post_label}" if post_label else "")
+                forms.append(_Form(label, rarity, layouts[rarity] + tuple(post), weight=rarity_weight * post_weight))
+        return forms
+    
+    def _forms_alchemy(self, options: Dict) -> List[_Form]:
+        """丹药名称的名称形态，对应 get_alchemy
+        
+        是否带灵字前缀由稀有度决定，不带时稀有度为common或uncommon，
+        带时为rare及以上，形态中记录的是最低的稀有度。
+        """
+        pre = self._space_part("prefix", "alchemy_common", self._pools["alchemy_common"])
+        s = self._space_part("spirit", "spirit", self.data["spirit"])
+        k = self._space_part("kind", "alchemy", self.data["alchemy"], options.get("kind"))
+        probabilities = _rarity_probabilities()
+        plain = tuple((rarity, probabilities[rarity]) for rarity in ("common", "uncommon"))
+        spirit = tuple((rarity, probabilities[rarity]) for rarity in _RARITY_BY_THRESHOLD[:5])
+        return [
+            _Form("plain", "common", (pre, k), weight=sum(w for _, w in plain), rarity_weights=plain),
+            _Form("spirit", "rare", (pre, s, k), weight=sum(w for _, w in spirit), rarity_weights=spirit),
+        ]
+    
+    def _forms_clan(self, options: Dict) -> List[_Form]:
+        """门派名称的名称形态，对应 get_clan"""
+        name = self._space_part("prefix", "common", self._pools["common"])
+        k = self._space_part("kind", "clan", self.data["clan"], options.get("kind"))
+        return [_Form("clan", None, (name, k))]
+    
+    def _split_by_length(self, part):
+        """把词表按是否为单字拆分为两个部分"""
+        role, words = part
+        return (role, tuple(w for w in words if len(w) == 1)), (role, tuple(w for w in words if len(w) > 1))
+    
+    def _forms_nation(self, options: Dict) -> List[_Form]:
+        """国家名称的名称形态，对应 get_nation"""
+        kind = options.get("kind")
+        country = ("kind", (kind or _COUNTRY,))
+        nation = self._space_part("kind", "nation", self.data["nation"], kind)
+        rare, uncommon = RARITY_VALUES["rare"], RARITY_VALUES["uncommon"]
+        forms = []
+        for rarity, weight, role, key, words in (("rare", rare, "strange", "strange", self.data["strange"]),
+                                                 ("uncommon", uncommon - rare, "prefix", "common",
+                                                  self._pools["common"])):
+            name = self._space_part(role, key, words)
+            if kind:
+                forms.append(_Form(rarity, rarity, (name, country), weight=weight))
+            else:
+                single, multiple = self._split_by_length(name)
+                single_fraction = len(single[1]) / len(name[1]) if name[1] else 0.0
+                forms.append(_Form(rarity + "/single", rarity, (single, country), weight=weight * single_fraction))
+                forms.append(_Form(rarity + "/multiple", rarity, (multiple, nation),
+                                   weight=weight * (1 - single_fraction)))
+        place = self._space_part("place", "place", self.data["place"])
+        prefix = self._space_part("prefix", "place_prefix", self.data["place_prefix"])
+        forms.append(_Form("common", "common", (place, country), weight=(1 - uncommon) * (1 - rare)))
+        forms.append(_Form("common/prefix", "common", (prefix, place, country), weight=(1 - uncommon) * rare))
+        return forms
+    
+    def _forms_location(self, options: Dict) -> List[_Form]:
+        """据点名称的名称形态，对应 get_location"""
+        k = self._space_part("kind", "location", self.data["location"], options.get("kind"))
+        place = self._space_part("place", "place", self.data["place"])
+        postfix = self._space_part("postfix", "place_postfix", self.data["place_postfix"])
+        rare, uncommon = RARITY_VALUES["rare"], RARITY_VALUES["uncommon"]
+        return [
+            _Form("rare", "rare", (self._space_part("strange", "strange", self.data["strange"]), k), weight=rare),
+            _Form("uncommon", "uncommon", (self._space_part("prefix", "common", self._pools["common"]), k),
+                  weight=uncommon - rare),
+            _Form("common", "common", (place, k), weight=(1 - uncommon) * (1 - uncommon)),
+            _Form("common/postfix", "common", (place, postfix, k), weight=(1 - uncommon) * uncommon),
+        ]
+    
+    def _forms_zone(self, options: Dict) -> List[_Form]:
+        """地域名称的名称形态，对应 get_zone"""
+        if options.get("kind"):
+            k = ("kind", (options["kind"],))
+        else:
+            categories = [options["category"]] if options.get("category") else ZONE_CATEGORIES
+            words = [word for category in categories for word in self.data["zone"][category]]
+            k = self._space_part("kind", "zone:" + "+".join(categories), words)
+        short_kinds, long_kinds = self._split_by_length(k)
+        place = self._space_part("place", "place", self.data["place"])
+        single_place, multiple_place = self._split_by_length(place)
+        prefix = self._space_part("prefix", "place_prefix", self.data["place_prefix"])
+        link = ("link", (_LINK_WORD,))
+        rare, uncommon = RARITY_VALUES["rare"], RARITY_VALUES["uncommon"]
+        plain = (1 - uncommon) * (1 - rare)
+        single_fraction = len(single_place[1]) / len(place[1]) if place[1] else 0.0
+        long_fraction = len(long_kinds[1]) / len(k[1]) if k[1] else 0.0
+        return [
+            _Form("rare", "rare", (self._space_part("strange", "strange", self.data["strange"]), k), weight=rare),
+            _Form("uncommon", "uncommon", (self._space_part("prefix", "common", self._pools["common"]), k),
+                  weight=uncommon - rare),
+            _Form("common/prefix", "common", (prefix, place, k), weight=(1 - uncommon) * rare),
+            _Form("common/multiple", "common", (multiple_place, k), weight=plain * (1 - single_fraction)),
+            _Form("common/link", "common", (single_place, link, long_kinds),
+                  weight=plain * single_fraction * long_fraction),
+            _Form("common/single", "common", (single_place, short_kinds),
+                  weight=plain * single_fraction * (1 - long_fraction) * (1 - rare)),
+            _Form("common/single-link", "common", (single_place, link, short_kinds),
+                  weight=plain * single_fraction * (1 - long_fraction) * rare),
+        ]
+    
+    def _forms_continent(self, options: Dict) -> List[_Form]:
+        """大陆名称的名称形态，对应 get_continent"""
+        k = self._space_part("kind", "continent", self.data["continent"], options.get("kind"))
+        place = self._space_part("place", "place", self.data["place"])
+        prefix = self._space_part("prefix", "place_prefix", self.data["place_prefix"])
+        rare, uncommon = RARITY_VALUES["rare"], RARITY_VALUES["uncommon"]
+        return [
+            _Form("rare", "rare", (self._space_part("strange", "strange", self.data["strange"]), k), weight=rare),
+            _Form("uncommon", "uncommon", (self._space_part("prefix", "common", self._pools["common"]), k),
+                  weight=uncommon - rare),
+            _Form("common", "common", (prefix, place, k), weight=1 - uncommon),
+        ]
+    
+    # ---------- 约束抽样 ----------
+    
+    def _generate_constrained(self, kind: str, number: int, options: Dict) -> List:
+        """在满足长度和字符约束的名称中直接抽样
+        
+        按各形态的概率和其中满足约束的组合比例选择形态，再在该形态满足约束的组合中
+        均匀抽取一个，不需要先生成再过滤。同一词表内的重复词视为一个词。
+        
+        Args:
+            kind: 生成类型，取值见 GENERATOR_KINDS
+            number: 生成名称的数量
+            options: 包含 nameLength、maxLength、requiredChars、forbiddenChars 中至少一项的选项字典
+        
+        Returns:
+            与对应 get_* 方法相同的结果列表
+        """
+        cumulative, total, plans = self._constrained_plan(kind, options)
+        rng = self._rng
+        results = []
+        for _ in range(number):
+            form, groups, counts = plans[min(bisect.bisect_right(cumulative, rng.random() * total), len(plans) - 1)]
+            index = rng.randrange(counts[(0, 0, 0)])
+            length = mask = 0
+            words = []
+            for i, part_groups in enumerate(groups):
+                for group_length, group_mask, group_words in part_groups:
+                    rest = counts.get((i + 1, length + group_length, mask | group_mask), 0)
+                    if not rest:
+                        continue
+                    block = len(group_words) * rest
+                    if index < block:
+                        words.append(group_words[index // rest])
+                        index %= rest
+                        length += group_length
+                        mask |= group_mask
+                        break
+                    index -= block
+            name = "".join(words)
+            rarity = form.rarity
+            if form.rarity_weights:
+                value = rng.random() * sum(weight for _, weight in form.rarity_weights)
+                for rarity, weight in form.rarity_weights:
+                    value -= weight
+                    if value < 0:
+                        break
+            if rarity is None:
+                results.append(name)
+            else:
+                results.append(dict({"name": name, "rarity": rarity}, **form.extra))
+        return results
+    
+    def _constrained_plan(self, kind: str, options: Dict):
+        """获取缓存的约束抽样计划: (形态累积概率, 总概率, [(形态, 各部分分组词表, 计数表)])
+        
+        每个部分的词按 (长度, 包含的必需字符集合) 分组，计数表记录从第i个部分、
+        当前长度和已包含的必需字符集合出发能组合出的满足约束的名称数量。
+        """
+        key = ("constrained", kind, _options_key(options))
+        plan = self._forms.get(key)
+        if plan is not None:
+            return plan
+        
+        name_length = options.get("nameLength")
+        max_length = options.get("maxLength")
+        limit = name_length or max_length
+        if name_length and max_length:
+            limit = min(name_length, max_length)
+        required = tuple(dict.fromkeys("".join(options.get("requiredChars") or "")))
+        forbidden = set("".join(options.get("forbiddenChars") or ""))
+        full_mask = (1 << len(required)) - 1
+        base = {k: v for k, v in options.items() if k not in _CONSTRAINT_KEYS}
+        
+        plans = []
+        cumulative = []
+        total = 0.0
+        for form in self._get_forms(kind, base):
+            groups = []
+            for _, words in form.parts:
+                grouped = {}
+                for word in words:
+                    if forbidden.intersection(word):
+                        continue
+                    mask = 0
+                    for bit, char in enumerate(required):
+                        if char in word:
+                            mask |= 1 << bit
+                    grouped.setdefault((len(word), mask), []).append(word)
+                groups.append([(length, mask, tuple(ws)) for (length, mask), ws in grouped.items()])
+            
+            counts = {}
+            
+            def count(i: int, length: int, mask: int) -> int:
+                state = (i, length, mask)
+                if state in counts:
+                    return counts[state]
+                if i == len(groups):
+                    valid = mask == full_mask and (not name_length or length == name_length)
+                    result = int(valid)
+                else:
+                    result = 0
+                    for group_length, group_mask, group_words in groups[i]:
+                        if limit and length + group_length > limit:
+                            continue
+                        result += len(group_words) * count(i + 1, length + group_length, mask | group_mask)
+                counts[state] = result
+                return result
+            
+            valid = count(0, 0, 0)
+            if valid and form.weight > 0:
+                total += form.weight * valid / form.size
+                cumulative.append(total)
+                plans.append((form, groups, counts))
+        if not plans or total <= 0:
+            raise ValueError(f"没有满足约束条件的 {kind} 名称")
+        plan = (cumulative, total, plans)
+        self._forms[key] = plan
+        return plan
+    
+    # ---------- 批量生成实现 ----------
+    
+    def _bulk_pool(self, key: str, words) -> "np.ndarray":
+        """获取缓存的NumPy词池"""
+        pool = self._bulk_pools.get(key)
+        if pool is None:
+            pool = np.empty(len(words), dtype=object)
+            pool[:] = list(words)
+            self._bulk_pools[key] = pool
+        return pool
+    
+    def _bulk_lengths(self, key: str, words) -> "np.ndarray":
+        """获取缓存的词长数组"""
+        cache_key = key + "#len"
+        lengths = self._bulk_pools.get(cache_key)
+        if lengths is None:
+            lengths = np.fromiter((len(word) for word in words), dtype=np.int64, count=len(words))
+            self._bulk_pools[cache_key] = lengths
+        return lengths
+    
+    def _bulk_pick(self, rng, key: str, words, size: int) -> "np.ndarray":
+        """从词池中均匀抽取size个词"""
+        pool = self._bulk_pool(key, words)
+        return pool[rng.integers(0, len(pool), size)]
+    
+    def _bulk_pick_with_lengths(self, rng, key: str, words, size: int):
+        """从词池中均匀抽取size个词，同时返回其长度"""
+        pool = self._bulk_pool(key, words)
+        index = rng.integers(0, len(pool), size)
+        return pool[index], self._bulk_lengths(key, words)[index]
+    
+    @staticmethod
+    def _bulk_constant(value, size: int) -> "np.ndarray":
+        """构造全部为同一值的对象数组"""
+        array = np.empty(size, dtype=object)
+        array[:] = [value] * size
+        return array
+    
+    @staticmethod
+    def _bulk_rarity(rng, size: int, max_value: float = 1.0):
+        """批量获取随机稀有度，对应 _get_rarity
+        
+        Returns:
+            (稀有度对象数组, 随机值数组)
+        """
+        values = rng.random(size) * (max_value or 1.0)
+        index = np.searchsorted(np.array(_RARITY_THRESHOLDS), values, side="right")
+        rarities = np.array(_RARITY_BY_THRESHOLD, dtype=object)[index]
+        return rarities, values
+    
+    def _bulk_is_female(self, rng, options: Dict, size: int) -> "np.ndarray":
+        """批量决定性别，isFemale 存在时与逐个生成一样直接使用其真值"""
+        if "isFemale" in options:
+            return np.full(size, bool(options["isFemale"]))
+        return rng.integers(0, 2, size) == 0
+    
+    def _bulk_postfix(self, rng, size: int, postfix: str, groups: Dict[str, List[str]],
+                      rare_key: str, uncommon_key: str, pool_key: str) -> "np.ndarray":
+        """批量生成括号后缀，两次掷骰规则与逐个生成一致"""
+        if postfix:
+            return self._bulk_constant(_PARENTHESIS_LEFT + postfix + _PARENTHESIS_RIGHT, size)
+        post = self._bulk_constant("", size)
+        r1 = rng.random(size)
+        r2 = rng.random(size)
+        rare_mask = np.zeros(size, dtype=bool)
+        if rare_key in groups:
+            rare_mask = (r1 < RARITY_VALUES["rare"]) & (r2 < RARITY_VALUES["rare"])
+            count = int(rare_mask.sum())
+            if count:
+                words = self._bulk_pick(rng, pool_key + ":" + rare_key, groups[rare_key], count)
+                post[rare_mask] = _PARENTHESIS_LEFT + words + _PARENTHESIS_RIGHT
+        if uncommon_key in groups:
+            mask = ~rare_mask & (r1 < RARITY_VALUES["uncommon"]) & (r2 < RARITY_VALUES["uncommon"])
+            count = int(mask.sum())
+            if count:
+                words = self._bulk_pick(rng, pool_key + ":" + uncommon_key, groups[uncommon_key], count)
+                post[mask] = _PARENTHESIS_LEFT + words + _PARENTHESIS_RIGHT
+        return post
+    
+    @staticmethod
+    def _bulk_results(names: "np.ndarray", rarities: "np.ndarray", **extra: "np.ndarray") -> List[Dict]:
+        """把批量结果数组转换为与逐个生成相同的字典列表"""
+        if not extra:
+            return [{"name": name, "rarity": rarity}
+                    for name, rarity in zip(names.tolist(), rarities.tolist())]
+        keys = list(extra)
+        columns = [extra[key].tolist() for key in keys]
+        return [dict(zip(["name", "rarity"] + keys, row))
+                for row in zip(names.tolist(), rarities.tolist(), *columns)]
+    
+    def _bulk_name(self, rng, size: int, options: Dict) -> List[str]:
+        """批量生成人名，对应 get_name"""
+        if options.get("familyName"):
+            family = self._bulk_constant(options["familyName"], size)
+        else:
+            family = self._bulk_pick(rng, "family", self.data["family"], size)
+        
+        is_female = self._bulk_is_female(rng, options, size)
+        
+        def given_character():
+            return np.where(is_female,
+                            self._bulk_pick(rng, "female", self.data["female"], size),
+                            self._bulk_pick(rng, "male", self.data["male"], size))
+        
+        style = options.get("style")
+        if style:
+            style_code = np.full(size, {"single": 0, "double": 1}.get(style, 2))
+        else:
+            r = rng.random(size)
+            style_code = np.where(r < 0.33333333, 0, np.where(r < 0.66666666, 1, 2))
+        
+        if options.get("middleCharacter"):
+            first = self._bulk_constant(options["middleCharacter"], size)
+        else:
+            first = np.where(style_code == 2,
+                             self._bulk_pick(rng, "middle", self.data["middle"], size),
+                             given_character())
+        last = given_character()
+        names = family + np.where(style_code == 0, first, first + last)
+        return names.tolist()
+    
+    def _bulk_dao(self, rng, size: int, options: Dict) -> List[Dict]:
+        """批量生成道号，对应 get_dao"""
+        if options.get("firstCharacter"):
+            first = self._bulk_constant(options["firstCharacter"], size)
+        else:
+            first = self._bulk_pick(rng, "dao", self.data["dao"], size)
+        names = first + self._bulk_pick(rng, "dao", self.data["dao"], size)
+        is_female = self._bulk_is_female(rng, options, size)
+        
+        t = options.get("title", "")
+        if t:
+            rarities = np.where(
+                is_female,
+                self._dao_title_rarity(t, "dao_title_female"),
+                self._dao_title_rarity(t, "dao_title_male"),
+            ).astype(object)
+            return self._bulk_results(names + t, rarities)
+        
+        rarities, _ = self._bulk_rarity(rng, size)
+        titles = self._bulk_constant("", size)
+        for female, gender in ((True, "dao_title_female"), (False, "dao_title_male")):
+            title_group = self.data[gender]
+            for rarity in RARITY_LEVELS[1:]:
+                if not title_group.get(rarity):
+                    continue
+                mask = (is_female == female) & (rarities == rarity)
+                count = int(mask.sum())
+                if count:
+                    titles[mask] = self._bulk_pick(rng, gender + ":" + rarity, title_group[rarity], count)
+        return self._bulk_results(names + titles, rarities)
+    
+    def _bulk_skill_names(self, rng, size: int, length: Optional[int] = None, kind: Optional[str] = None,
+                          prefix: Optional[str] = None, numfix: Optional[str] = None):
+        """批量生成功法名称，对应 _get_skill_name
+        
+        Returns:
+            (名称对象数组, 稀有度对象数组)
+        """
+        if not length:
+            rarities, values = self._bulk_rarity(rng, size)
+            lengths = np.where(values < RARITY_VALUES["rare"], 3,
+                               np.where(values < RARITY_VALUES["uncommon"], 2, 1))
+        else:
+            rarity = "common"
+            if length > 2:
+                rarity = "rare"
+            elif length > 1:
+                rarity = "uncommon"
+            rarities = self._bulk_constant(rarity, size)
+            lengths = np.full(size, length)
+        
+        common = self._pools["skill_common"]
+        name = self._bulk_pick(rng, "skill_common", common, size)
+        for position in range(1, int(lengths.max())):
+            word = self._bulk_pick(rng, "skill_common", common, size)
+            name = name + np.where(lengths > position, word, "")
+        
+        if prefix:
+            pre = self._bulk_constant(prefix, size)
+        else:
+            pre = np.where(rng.random(size) < RARITY_VALUES["epic"],
+                           self._bulk_pick(rng, "skill_prefix", self.data["skill_prefix"], size), "")
+        
+        if numfix:
+            n = self._bulk_constant(numfix, size)
+        else:
+            n = np.where(rng.random(size) < RARITY_VALUES["epic"],
+                         self._bulk_pick(rng, "skill_numfix", self.data["skill_numfix"], size), "")
+        has_n = n != ""
+        
+        if kind:
+            k = self._bulk_constant(kind, size)
+            k_lengths = np.full(size, len(kind))
+        else:
+            k, k_lengths = self._bulk_pick_with_lengths(rng, "skill", self.data["skill"], size)
+        
+        begin = np.where(has_n, n + _NUMBER_BEGIN_SUPPLEMENT, "") + pre + name + k
+        end_long = pre + name + k + np.where(has_n, n + _NUMBER_END_SUPPLEMENT, "")
+        end_short = pre + name + n + k
+        names = np.where(rng.random(size) < 0.5, begin,
+                         np.where(k_lengths > 1, end_long, end_short))
+        return names, rarities
+    
+    def _bulk_skill(self, rng, size: int, options: Dict) -> List[Dict]:
+        """批量生成功法名称，对应 get_skill"""
+        names, rarities = self._bulk_skill_names(
+            rng, size,
+            options.get("length"),
+            options.get("kind"),
+            options.get("prefix"),
+            options.get("numfix")
+        )
+        return self._bulk_results(names, rarities)
+    
+    def _bulk_book(self, rng, size: int, options: Dict) -> List[Dict]:
+        """批量生成秘籍名称，对应 get_book"""
+        skillnames, rarities = self._bulk_skill_names(rng, size, options.get("length"), options.get("mainkind"))
+        
+        pre = options.get("prefix", "")
+        if pre:
+            pre = self._bulk_constant(pre, size)
+        else:
+            pre = self._bulk_constant("", size)
+            for rarity in _BOOK_PREFIX_RARITIES:
+                if rarity not in self.data["book_prefix"]:
+                    continue
+                mask = rarities == rarity
+                count = int(mask.sum())
+                if count:
+                    pre[mask] = self._bulk_pick(rng, "book_prefix:" + rarity,
+                                                self.data["book_prefix"][rarity], count)
+        
+        pk = options.get("postkind", "")
+        if pk:
+            pk = self._bulk_constant(pk, size)
+        else:
+            pk = np.where(pre != "", self._bulk_pick(rng, "book", self.data["book"], size), "")
+        
+        post = self._bulk_postfix(rng, size, options.get("postfix", ""), self.data["book_postfix"],
+                                  "rare", "uncommon", "book_postfix")
+        return self._bulk_results(_BOOK_LEFT + skillnames + pre + pk + post + _BOOK_RIGHT, rarities)
+    
+    def _bulk_creature(self, rng, size: int, options: Dict) -> List[Dict]:
+        """批量生成生灵名称，对应 get_creature"""
+        pre = self._bulk_pick(rng, "creature_common", self._pools["creature_common"], size)
+        c = self._bulk_pick(rng, "color", self.data["color"], size)
+        s = self._bulk_pick(rng, "creature_prefix", self.data["creature_prefix"], size)
+        
+        if options.get("category"):
+            categories = self._bulk_constant(options["category"], size)
+        else:
+            categories = self._bulk_pick(rng, "creature_category", CREATURE_CATEGORY, size)
+        k = self._bulk_constant("", size)
+        for category in set(categories.tolist()):
+            mask = categories == category
+            k[mask] = self._bulk_pick(rng, "creature:" + category, self.data["creature"][category], int(mask.sum()))
+        
+        if options.get("rarity"):
+            rarities = self._bulk_constant(options["rarity"], size)
+        else:
+            rarities, _ = self._bulk_rarity(rng, size, RARITY_VALUES["uncommon"])
+        
+        formulas = {
+            "mythic": lambda m: pre[m] + c[m] + s[m] + k[m],
+            "legendary": lambda m: pre[m] + s[m] + k[m],
+            "epic": lambda m: pre[m] + c[m] + k[m],
+            "rare": lambda m: pre[m] + k[m],
+            "uncommon": lambda m: c[m] + s[m] + k[m],
+            "common": lambda m: c[m] + k[m],
+        }
+        names = self._bulk_constant("", size)
+        for rarity in RARITY_LEVELS:
+            mask = rarities == rarity
+            count = int(mask.sum())
+            if not count:
+                continue
+            if rarity == "exotic":
+                names[mask] = self._bulk_pick(rng, "strange_creature", self.data["strange_creature"], count)
+            else:
+                names[mask] = formulas[rarity](mask)
+        return self._bulk_results(names, rarities, category=categories)
+    
+    def _bulk_tiered_kind(self, rng, rarities: "np.ndarray", kind: Optional[str], pool_key: str) -> "np.ndarray":
+        """按稀有度从累积词表中批量抽取类型词"""
+        size = len(rarities)
+        if kind:
+            return self._bulk_constant(kind, size)
+        tiers = self._pools[pool_key]
+        k = self._bulk_constant("", size)
+        for rarity in RARITY_LEVELS:
+            mask = rarities == rarity
+            count = int(mask.sum())
+            if count and tiers[rarity]:
+                k[mask] = self._bulk_pick(rng, pool_key + ":" + rarity, tiers[rarity], count)
+        return k
+    
+    def _bulk_material(self, rng, size: int, options: Dict) -> List[Dict]:
+        """批量生成材料名称，对应 get_material"""
+        pre = self._bulk_pick(rng, "common", self._pools["common"], size)
+        c = self._bulk_pick(rng, "color", self.data["color"], size)
+        s = self._bulk_pick(rng, "spirit", self.data["spirit"], size)
+        
+        if options.get("rarity"):
+            rarities = self._bulk_constant(options["rarity"], size)
+        else:
+            rarities, _ = self._bulk_rarity(rng, size, RARITY_VALUES["uncommon"])
+        k = self._bulk_tiered_kind(rng, rarities, options.get("kind"), "material_tiers")
+        
+        formulas = {
+            "exotic": lambda m: _AGE100 + pre[m] + c[m] + s[m] + k[m],
+            "mythic": lambda m: _AGE10 + pre[m] + c[m] + s[m] + k[m],
+            "legendary": lambda m: _AGE1 + pre[m] + c[m] + s[m] + k[m],
+            "epic": lambda m: pre[m] + c[m] + s[m] + k[m],
+            "rare": lambda m: pre[m] + s[m] + k[m],
+            "uncommon": lambda m: c[m] + s[m] + k[m],
+            "common": lambda m: c[m] + k[m],
+        }
+        names = self._bulk_constant("", size)
+        for rarity, formula in formulas.items():
+            mask = rarities == rarity
+            if mask.any():
+                names[mask] = formula(mask)
+        
+        post = self._bulk_postfix(rng, size, options.get("postfix", ""), self.data["material_postfix"],
+                                  "broken", "handmade", "material_postfix")
+        return self._bulk_results(names + post, rarities)
+    
+    def _bulk_talisman(self, rng, size: int, options: Dict) -> List[Dict]:
+        """批量生成法宝名称，对应 get_talisman"""
+        prefix = self._bulk_pick(rng, "common", self._pools["common"], size)
+        c = self._bulk_pick(rng, "color", self.data["color"], size)
+        m = self._bulk_pick(rng, "talisman_material", self.data["talisman_material"], size)
+        s = self._bulk_pick(rng, "spirit", self.data["spirit"], size)
+        
+        if options.get("rarity"):
+            rarities = self._bulk_constant(options["rarity"], size)
+        else:
+            rarities, _ = self._bulk_rarity(rng, size, RARITY_VALUES["uncommon"])
+        k = self._bulk_tiered_kind(rng, rarities, options.get("kind"), "talisman_tiers")
+        
+        formulas = {
+            "exotic": lambda x: prefix[x] + s[x] + k[x],
+            "mythic": lambda x: prefix[x] + s[x] + k[x],
+            "legendary": lambda x: prefix[x] + c[x] + m[x] + k[x],
+            "epic": lambda x: prefix[x] + m[x] + k[x],
+            "rare": lambda x: prefix[x] + k[x],
+            "uncommon": lambda x: c[x] + m[x] + k[x],
+            "common": lambda x: m[x] + k[x],
+        }
+        names = self._bulk_constant("", size)
+        for rarity, formula in formulas.items():
+            mask = rarities == rarity
+            if mask.any():
+                names[mask] = formula(mask)
+        
+        post = self._bulk_postfix(rng, size, options.get("postfix", ""), self.data["talisman_postfix"],
+                                  "broken", "handmade", "talisman_postfix")
+        return self._bulk_results(names + post, rarities)
+    
+    def _bulk_alchemy(self, rng, size: int, options: Dict) -> List[Dict]:
+        """批量生成丹药名称，对应 get_alchemy"""
+        pre = self._bulk_pick(rng, "alchemy_common", self._pools["alchemy_common"], size)
+        rarities, values = self._bulk_rarity(rng, size)
+        s = np.where(values < RARITY_VALUES["rare"],
+                     self._bulk_pick(rng, "spirit", self.data["spirit"], size), "")
+        if options.get("kind"):
+            k = self._bulk_constant(options["kind"], size)
+        else:
+            k = self._bulk_pick(rng, "alchemy", self.data["alchemy"], size)
+        return self._bulk_results(pre + s + k, rarities)
+    
+    def _bulk_clan(self, rng, size: int, options: Dict) -> List[str]:
+        """批量生成门派名称，对应 get_clan"""
+        names = self._bulk_pick(rng, "common", self._pools["common"], size)
+        if options.get("kind"):
+            k = self._bulk_constant(options["kind"], size)
+        else:
+            k = self._bulk_pick(rng, "clan", self.data["clan"], size)
+        return (names + k).tolist()
+    
+    def _bulk_place_rarity(self, rng, size: int):
+        """批量决定地名的稀有度分支
+        
+        Returns:
+            (稀有度对象数组, rare掩码, uncommon掩码, common掩码)
+        """
+        r = rng.random(size)
+        rare = r < RARITY_VALUES["rare"]
+        uncommon = ~rare & (r < RARITY_VALUES["uncommon"])
+        common = ~rare & ~uncommon
+        rarities = np.where(rare, "rare", np.where(uncommon, "uncommon", "common")).astype(object)
+        return rarities, rare, uncommon, common
+    
+    def _bulk_nation(self, rng, size: int, options: Dict) -> List[Dict]:
+        """批量生成国家名称，对应 get_nation"""
+        kind = options.get("kind")
+        rarities, rare, uncommon, common = self._bulk_place_rarity(rng, size)
+        
+        strange, strange_lengths = self._bulk_pick_with_lengths(rng, "strange", self.data["strange"], size)
+        common_words, common_lengths = self._bulk_pick_with_lengths(rng, "common", self._pools["common"], size)
+        prefix = np.where(rng.random(size) < RARITY_VALUES["rare"],
+                          self._bulk_pick(rng, "place_prefix", self.data["place_prefix"], size), "")
+        place = prefix + self._bulk_pick(rng, "place", self.data["place"], size)
+        
+        names = np.where(rare, strange, np.where(uncommon, common_words, place))
+        if kind:
+            k = self._bulk_constant(kind, size)
+        else:
+            lengths = np.where(rare, strange_lengths, common_lengths)
+            nation = self._bulk_pick(rng, "nation", self.data["nation"], size)
+            k = np.where(common | (lengths == 1), _COUNTRY, nation)
+        return self._bulk_results(names + k, rarities)
+    
+    def _bulk_location(self, rng, size: int, options: Dict) -> List[Dict]:
+        """批量生成据点名称，对应 get_location"""
+        kind = options.get("kind")
+        rarities, rare, uncommon, _ = self._bulk_place_rarity(rng, size)
+        
+        postfix = np.where(rng.random(size) < RARITY_VALUES["uncommon"],
+                           self._bulk_pick(rng, "place_postfix", self.data["place_postfix"], size), "")
+        place = self._bulk_pick(rng, "place", self.data["place"], size) + postfix
+        names = np.where(rare, self._bulk_pick(rng, "strange", self.data["strange"], size),
+                         np.where(uncommon, self._bulk_pick(rng, "common", self._pools["common"], size), place))
+        if kind:
+            k = self._bulk_constant(kind, size)
+        else:
+            k = self._bulk_pick(rng, "location", self.data["location"], size)
+        return self._bulk_results(names + k, rarities)
+    
+    def _bulk_zone(self, rng, size: int, options: Dict) -> List[Dict]:
+        """批量生成地域名称，对应 get_zone"""
+        if options.get("kind"):
+            k = self._bulk_constant(options["kind"], size)
+            k_lengths = np.full(size, len(options["kind"]))
+        else:
+            if options.get("category"):
+                categories = self._bulk_constant(options["category"], size)
+            else:
+                categories = self._bulk_pick(rng, "zone_category", ZONE_CATEGORIES, size)
+            k = self._bulk_constant("", size)
+            k_lengths = np.zeros(size, dtype=np.int64)
+            for category in set(categories.tolist()):
+                mask = categories == category
+                words, lengths = self._bulk_pick_with_lengths(
+                    rng, "zone:" + category, self.data["zone"][category], int(mask.sum()))
+                k[mask] = words
+                k_lengths[mask] = lengths
+        
+        rarities, rare, uncommon, _ = self._bulk_place_rarity(rng, size)
+        
+        has_prefix = rng.random(size) < RARITY_VALUES["rare"]
+        prefix = np.where(has_prefix, self._bulk_pick(rng, "place_prefix", self.data["place_prefix"], size), "")
+        place, place_lengths = self._bulk_pick_with_lengths(rng, "place", self.data["place"], size)
+        single = ~has_prefix & (place_lengths == 1)
+        link = single & ((k_lengths > 1) | (rng.random(size) < RARITY_VALUES["rare"]))
+        place = prefix + place + np.where(link, _LINK_WORD, "")
+        
+        names = np.where(rare, self._bulk_pick(rng, "strange", self.data["strange"], size),
+                         np.where(uncommon, self._bulk_pick(rng, "common", self._pools["common"], size), place))
+        return self._bulk_results(names + k, rarities)
+    
+    def _bulk_continent(self, rng, size: int, options: Dict) -> List[Dict]:
+        """批量生成大陆名称，对应 get_continent"""
+        kind = options.get("kind")
+        rarities, rare, uncommon, _ = self._bulk_place_rarity(rng, size)
+        
+        place = (self._bulk_pick(rng, "place_prefix", self.data["place_prefix"], size)
+                 + self._bulk_pick(rng, "place", self.data["place"], size))
+        names = np.where(rare, self._bulk_pick(rng, "strange", self.data["strange"], size),
+                         np.where(uncommon, self._bulk_pick(rng, "common", self._pools["common"], size), place))
+        if kind:
+            k = self._bulk_constant(kind, size)
+        else:
+            k = self._bulk_pick(rng, "continent", self.data["continent"], size)
+        return self._bulk_results(names + k, rarities)
+
+
+class PrefetchingGenerator:
+    def __init__(self, generator: XiuXianNameGenerator, capacity: int = 256,
+                 low_water: Optional[int] = None):
+        """初始化预取生成器
+        
+        为每种 (类型, 选项) 组合维护一个预先生成的结果队列，由后台线程在队列低于
+        低水位时补足，单个名称的请求只需从队列中取出一个结果。
+        
+        Args:
+            generator: 实际生成名称的生成器实例
+            capacity: 每个队列补足到的结果数量
+            low_water: 队列中剩余结果少于此数量时触发补足，默认为capacity的一半
+        """
+        self.generator = generator
+        self.capacity = capacity
+        self.low_water = capacity // 2 if low_water is None else low_water
+        # (类型, 选项键) -> (选项, 结果队列)
+        self._buffers: Dict[Tuple[str, str], Tuple[Union[Dict, str, None], deque]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+    
+    def __getattr__(self, name: str):
+        """get_* 方法从队列取结果，其余属性直接访问被包装的生成器"""
+        if name.startswith("get_") and name[4:] in GENERATOR_KINDS:
+            return functools.partial(self.generate, name[4:])
+        if name == "generator":
+            raise AttributeError(name)
+        return getattr(self.generator, name)
+    
+    def __enter__(self) -> "PrefetchingGenerator":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def warm(self, kind: str, options: Union[Dict, str, None] = None):
+        """登记一种 (类型, 选项) 组合并在后台预先生成结果
+        
+        Args:
+            kind: 生成类型，取值见 GENERATOR_KINDS
+            options: 选项参数，与 generate 相同
+        """
+        self._buffer(kind, options)
+        self._wake.set()
+    
+    def generate(self, kind: str, number: int = 1, options: Union[Dict, str, None] = None) -> List:
+        """按类型生成名称，优先从预取队列中取出
+        
+        队列中结果不足时不足的部分同步生成，并唤醒后台线程补足队列。
+        
+        Args:
+            kind: 生成类型，取值见 GENERATOR_KINDS
+            number: 生成名称的数量
+            options: 选项参数，与 XiuXianNameGenerator.generate 相同
+        
+        Returns:
+            生成结果列表
+        """
+        buffer = self._buffer(kind, options)
+        results = []
+        try:
+            while len(results) < number:
+                results.append(buffer.popleft())
+        except IndexError:
+            results.extend(self.generator.generate(kind, number - len(results), options))
+        if len(buffer) < self.low_water:
+            self._wake.set()
+        return results
+    
+    def close(self):
+        """停止后台补足线程"""
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def _buffer(self, kind: str, options: Union[Dict, str, None]) -> deque:
+        """获取 (类型, 选项) 对应的结果队列，首次使用时创建并启动后台线程"""
+        if kind not in GENERATOR_KINDS:
+            raise ValueError(f"未知的生成类型: {kind}")
+        key = (kind, _options_key(options))
+        entry = self._buffers.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._buffers.get(key)
+                if entry is None:
+                    entry = (copy.deepcopy(options), deque())
+                    self._buffers[key] = entry
+                if self._thread is None and not self._closed:
+                    self._thread = threading.Thread(target=self._refill_loop, name="xiuxian-prefetch", daemon=True)
+                    self._thread.start()
+        return entry[1]
+    
+    def _refill_loop(self):
+        """后台线程: 被唤醒后把低于低水位的队列补足到capacity"""
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._closed:
+                return
+            for key, (options, buffer) in list(self._buffers.items()):
+                if len(buffer) < self.low_water:
+                    try:
+                        buffer.extend(self.generator.generate(key[0], self.capacity - len(buffer), options))
+                    except Exception:
+                        # 选项无效等错误已在同步生成时抛给调用方，这里移除该队列，不影响其他队列的补足
+                        with self._lock:
+                            self._buffers.pop(key, None)
+
+
+# 并行工作进程中预加载的生成器
+_PARALLEL_GENERATOR: Optional[XiuXianNameGenerator] = None
+
+
+def _init_parallel_worker(cls, data_dir: str, lazy: bool, bundle: Optional[str],
+                          blocklist: Optional[Tuple[str, ...]] = None):
+    """并行工作进程初始化，加载一次数据供之后的所有分片使用"""
+    global _PARALLEL_GENERATOR
+    _PARALLEL_GENERATOR = cls(data_dir, lazy=lazy, bundle=bundle, blocklist=blocklist)
+
+
+def _generate_chunk(generator: XiuXianNameGenerator, kind: str, number: int,
+                    options: Union[Dict, str, None], bulk: bool) -> List:
+    """生成一个分片的结果"""
+    if bulk:
+        return generator.generate_bulk(kind, number, options)
+    return generator.generate(kind, number, options)
+
+
+def _parallel_chunk(kind: str, number: int, options: Union[Dict, str, None], seed: int, bulk: bool) -> Tuple[List, float]:
+    """在工作进程中生成一个分片，返回结果和生成耗时（秒）"""
+    started = time.perf_counter()
+    results = _generate_chunk(_PARALLEL_GENERATOR._with_seed(seed), kind, number, options, bulk)
+    return results, time.perf_counter() - started
+
+
+def _export_records(chunk: List) -> List[Dict]:
+    """把生成结果统一为字典记录，只有名称的结果放在name列"""
+    records = []
+    for item in chunk:
+        if isinstance(item, dict):
+            records.append(item)
+        elif isinstance(item, str):
+            records.append({"name": item})
+        else:
+            records.append({field: value for field, value in item._asdict().items() if value is not None})
+    return records
+
+
+def _write_parquet(chunks: Iterable[List[Dict]], output) -> int:
+    """把记录块逐块写入Parquet文件，每块对应一个行组"""
+    try:
+        # pyarrow 为可选依赖且导入较慢，仅在导出 parquet 时导入
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("导出 parquet 格式需要安装 pyarrow")
+    
+    writer = None
+    written = 0
+    try:
+        for records in chunks:
+            if writer is None:
+                columns = list(records[0])
+                schema = pyarrow.schema([(column, pyarrow.string()) for column in columns])
+                writer = pyarrow.parquet.ParquetWriter(output, schema)
+            table = pyarrow.table({column: [record.get(column) for record in records] for column in columns},
+                                  schema=schema)
+            writer.write_table(table)
+            written += len(records)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(
+        prog="python -m xiuxian_names_generator",
+        description="修仙名称生成器",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    bundle_parser = subparsers.add_parser("bundle", help="把数据目录编译为单个二进制数据包")
+    bundle_parser.add_argument("data_dir", help="数据文件目录路径")
+    bundle_parser.add_argument("output", help="输出的数据包路径")
+    
+    pinyin_parser = subparsers.add_parser("pinyin", help="为数据目录中的所有汉字生成拼音表（需要 pypinyin）")
+    pinyin_parser.add_argument("data_dir", help="数据文件目录路径")
+    pinyin_parser.add_argument("-o", "--output", help="输出路径，默认为数据目录下的 shared/pinyin.json")
+    
+    generate_parser = subparsers.add_parser("generate", help="生成名称并导出为 JSONL、CSV 或 Parquet")
+    generate_parser.add_argument("kind", choices=GENERATOR_KINDS, help="生成类型")
+    generate_parser.add_argument("-n", "--number", type=int, default=1, help="生成名称的数量")
+    generate_parser.add_argument("--options", help="JSON格式的选项，或门派、据点等的类型字符串")
+    generate_parser.add_argument("--seed", type=int, help="随机种子")
+    generate_parser.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl", help="输出格式")
+    generate_parser.add_argument("-o", "--output", default="-", help="输出文件路径，默认为标准输出")
+    generate_parser.add_argument("--data-dir", default="data", help="数据文件目录路径")
+    generate_parser.add_argument("--bundle", help="数据包路径")
+    generate_parser.add_argument("--chunk-size", type=int, default=10000, help="每次生成并写入的数量")
+    generate_parser.add_argument("--bulk", action="store_true", help="使用 generate_bulk 生成")
+    generate_parser.add_argument("--unique", action="store_true", help="启用唯一性模式")
+    
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        options = args.options
+        if options:
+            try:
+                options = json.loads(options)
+            except ValueError:
+                pass
+        generator = XiuXianNameGenerator(args.data_dir, bundle=args.bundle, seed=args.seed, unique=args.unique)
+        if args.output == "-":
+            sys.stdout.flush()
+            try:
+                written = generator.export(args.kind, args.number, sys.stdout.buffer, options,
+                                           args.format, args.chunk_size, args.bulk)
+                sys.stdout.flush()
+            except BrokenPipeError:
+                # 下游（如 head）提前关闭管道时静默退出
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+                sys.exit(1)
+        else:
+            with open(args.output, "wb", buffering=1 << 20) as output:
+                written = generator.export(args.kind, args.number, output, options,
+                                           args.format, args.chunk_size, args.bulk)
+        print(f"已生成 {written} 条记录", file=sys.stderr)
+    elif args.command == "bundle":
+        stats = compile_bundle(args.data_dir, args.output)
+        print(f"已生成 {args.output}: {stats['strings']} 个字符串, "
+              f"{stats['words']} 个词, {stats['size']} 字节", file=sys.stderr)
+    elif args.command == "pinyin":
+        stats = compile_pinyin(args.data_dir, args.output)
+        print(f"已生成拼音表: {stats['chars']} 个汉字, {stats['syllables']} 个读音", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""修仙名称生成服务
+
+基于 asyncio 的长驻服务，只依赖标准库。客户端通过 TCP 或 Unix 套接字按行发送 JSON 请求:
+
+    {"id": 1, "method": "get_name", "number": 1, "options": {"isFemale": true}}
+
+服务按行返回 JSON 响应（同一连接上的多个请求可能乱序返回，以 id 对应）:
+
+    {"id": 1, "result": ["林清月"]}
+    {"id": 2, "error": "未知的方法: get_foo"}
+
+同一事件循环周期内到达的 number=1 请求按 (类型, 选项) 合并为一次批量生成；
+其他数量的请求由 spawn 派生的子生成器分块生成，每块之后让出事件循环，
+单个请求最多等待一块的生成时间，不必等待整个批量请求完成。
+"""
+import json
+import asyncio
+import argparse
+import itertools
+import sys
+from typing import Dict, List, Optional, Union, Tuple
+
+from xiuxian_names_generator import GENERATOR_KINDS, XiuXianNameGenerator, _options_key
+
+
+# 批量请求每块生成的结果数量和大批量响应每块编码的结果数量，每块之后让出事件循环，
+# 合并的单个请求最多等待一块的处理时间（通常在0.1毫秒以内）
+_CHUNK_SIZE = 8
+_ENCODE_CHUNK = 128
+
+
+def _encode(response: Dict) -> bytes:
+    """把响应编码为一行JSON"""
+    return json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+async def _encode_chunked(response: Dict) -> bytes:
+    """分块编码大批量结果，每块之后让出事件循环"""
+    result = response["result"]
+    head = json.dumps({"id": response["id"]}, ensure_ascii=False)[:-1]
+    parts = []
+    for start in range(0, len(result), _ENCODE_CHUNK):
+        parts.append(json.dumps(result[start:start + _ENCODE_CHUNK], ensure_ascii=False)[1:-1])
+        await asyncio.sleep(0)
+    return f'{head}, "result": [{", ".join(parts)}]}}\n'.encode("utf-8")
+
+
+class NameServer:
+    def __init__(self, generator: XiuXianNameGenerator, max_number: int = 100000):
+        """初始化名称生成服务
+
+        Args:
+            generator: 用于生成名称的生成器实例
+            max_number: 单个请求允许的最大生成数量，避免单个响应过大
+        """
+        self.generator = generator
+        self.max_number = max_number
+        # (类型, 选项键) -> (选项, 等待结果的Future列表)
+        self._pending: Dict[Tuple[str, str], Tuple[Union[Dict, str, None], List[asyncio.Future]]] = {}
+        self._flush_scheduled = False
+        # 批量请求的序号，用作派生子生成器的分片键
+        self._bulk_ids = itertools.count()
+
+    async def generate(self, kind: str, number: int = 1, options: Union[Dict, str, None] = None) -> List:
+        """生成名称，number为1的请求在下一个事件循环周期合并生成，其他请求由子生成器分块生成
+
+        Args:
+            kind: 生成类型，取值见 GENERATOR_KINDS
+            number: 生成名称的数量
+            options: 选项参数，与 XiuXianNameGenerator.generate 相同
+
+        Returns:
+            生成结果列表
+        """
+        if kind not in GENERATOR_KINDS:
+            raise ValueError(f"未知的生成类型: {kind}")
+        if not 0 <= number <= self.max_number:
+            raise ValueError(f"number 必须在 0 到 {self.max_number} 之间")
+        loop = asyncio.get_running_loop()
+        if number != 1:
+            # 子生成器使用独立的随机流，结果不受与之交错执行的单个请求影响
+            child = self.generator.spawn("server", next(self._bulk_ids))
+            results = []
+            try:
+                while len(results) < number:
+                    results.extend(child.generate(kind, min(_CHUNK_SIZE, number - len(results)), options))
+                    await asyncio.sleep(0)
+            except BaseException:
+                # 名称不足或请求被取消时撤销已记录的名称，与一次生成的效果相同
+                child._release(kind, results)
+                raise
+            return results
+
+        future = loop.create_future()
+        key = (kind, _options_key(options))
+        entry = self._pending.get(key)
+        if entry is None:
+            self._pending[key] = (options, [future])
+        else:
+            entry[1].append(future)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+        return [await future]
+
+    def _flush(self):
+        """为本周期内积累的单个请求按 (类型, 选项) 各执行一次批量生成"""
+        pending, self._pending = self._pending, {}
+        self._flush_scheduled = False
+        for (kind, _), (options, futures) in pending.items():
+            try:
+                results = self.generator.generate(kind, len(futures), options)
+            except Exception as error:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            for future, result in zip(futures, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def handle_request(self, request: Dict) -> Dict:
+        """处理一个已解析的请求，返回响应字典"""
+        response = {"id": request.get("id")}
+        try:
+            method = request.get("method", "")
+            kind = method[4:] if method.startswith("get_") else ""
+            if kind not in GENERATOR_KINDS:
+                raise ValueError(f"未知的方法: {method}")
+            number = request.get("number", 1)
+            if not isinstance(number, int):
+                raise ValueError("number 必须是整数")
+            response["result"] = await self.generate(kind, number, request.get("options"))
+        except Exception as error:
+            response["error"] = str(error)
+        return response
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter):
+        """处理一行请求并写回响应"""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("请求必须是JSON对象")
+        except ValueError as error:
+            response = {"id": None, "error": f"无效的请求: {error}"}
+        else:
+            response = await self.handle_request(request)
+        if len(response.get("result", ())) > _ENCODE_CHUNK:
+            payload = await _encode_chunked(response)
+        else:
+            payload = _encode(response)
+        if not writer.is_closing():
+            writer.write(payload)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """处理一个客户端连接，同一连接上的请求并发处理以便参与合并"""
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # 单行超过 StreamReader 的长度上限，无法确定后续请求从哪里开始，回复错误后关闭连接
+                    writer.write(_encode({"id": None, "error": "无效的请求: 单行请求过长"}))
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                if writer.transport.get_write_buffer_size() > 1 << 20:
+                    await writer.drain()
+            if tasks:
+                await asyncio.gather(*tasks)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """开始监听
+
+        Args:
+            host: 监听地址
+            port: 监听端口
+            path: Unix 套接字路径，指定时忽略host和port
+
+        Returns:
+            asyncio 服务对象
+        """
+        if path:
+            return await asyncio.start_unix_server(self.handle_connection, path=path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+
+async def serve(generator: XiuXianNameGenerator, host: str = "127.0.0.1", port: int = 8765,
+                path: Optional[str] = None):
+    """启动服务并一直运行"""
+    server = await NameServer(generator).start(host, port, path)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(
+        prog="python -m xiuxian_server",
+        description="修仙名称生成服务",
+    )
+    parser.add_argument("--data-dir", default="data", help="数据文件目录路径")
+    parser.add_argument("--bundle", help="数据包路径")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口")
+    parser.add_argument("--unix", help="Unix 套接字路径，指定时忽略 --host 和 --port")
+    parser.add_argument("--seed", type=int, help="随机种子")
+    parser.add_argument("--unique", action="store_true", help="启用唯一性模式")
+
+    args = parser.parse_args(argv)
+    generator = XiuXianNameGenerator(args.data_dir, bundle=args.bundle, seed=args.seed, unique=args.unique)
+    address = args.unix or f"{args.host}:{args.port}"
+    print(f"正在监听 {address}", file=sys.stderr)
+    try:
+        asyncio.run(serve(generator, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()